@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+# Uso:
+#   python -m benchmarks ejecutar --salida base.json [--rapido] [--caso ronda]
+#   python -m benchmarks comparar base.json nuevo.json [--umbral 10]
+#   python -m benchmarks graficar base.json --salida escalamiento.png
+
+import argparse
+import sys
+from typing import Optional
+
+from benchmarks.casos import REJILLA, REJILLA_RAPIDA
+from benchmarks.suite import (ejecutar_suite, guardar, cargar, comparar,
+                              formatear_comparacion, graficar_escalamiento)
+
+
+def _crear_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks",
+                                     description="Microbenchmarks de la simulación.")
+    subparsers = parser.add_subparsers(dest="comando", required=True)
+
+    ejecutar = subparsers.add_parser("ejecutar", help="mide todos los casos y guarda un JSON")
+    ejecutar.add_argument("--salida", default="benchmarks.json", help="archivo JSON de resultados")
+    ejecutar.add_argument("--repeticiones", type=int, default=5)
+    ejecutar.add_argument("--rapido", action="store_true", help="rejilla reducida (para probar rápido)")
+    ejecutar.add_argument("--caso", default=None, help="solo los casos cuyo nombre contiene este texto")
+    ejecutar.add_argument("--grafico", default=None, help="además guarda el gráfico de escalamiento (PNG)")
+
+    comparar_cmd = subparsers.add_parser("comparar", help="compara dos JSON y marca las regresiones")
+    comparar_cmd.add_argument("base")
+    comparar_cmd.add_argument("nuevo")
+    comparar_cmd.add_argument("--umbral", type=float, default=10.0,
+                              help="%% de aumento del tiempo que cuenta como regresión (por defecto 10)")
+
+    graficar = subparsers.add_parser("graficar", help="rondas/s contra población (requiere matplotlib)")
+    graficar.add_argument("resultados")
+    graficar.add_argument("--salida", default="escalamiento.png")
+
+    return parser
+
+
+def _mostrar_progreso(resultado: dict) -> None:
+    parametros = " ".join(f"{k}={v}" for k, v in resultado["parametros"].items())
+    print(f"{resultado['caso']:<24} {parametros:<58} {resultado['ops_por_segundo']:>12.1f} ops/s",
+          file=sys.stderr)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = _crear_parser().parse_args(argv)
+
+    if args.comando == "ejecutar":
+        rejilla = REJILLA_RAPIDA if args.rapido else REJILLA
+        resultados = ejecutar_suite(rejilla, args.repeticiones, args.caso, _mostrar_progreso)
+        guardar(resultados, args.salida)
+        if args.grafico:
+            graficar_escalamiento(resultados, args.grafico)
+        return 0
+
+    if args.comando == "comparar":
+        filas = comparar(cargar(args.base), cargar(args.nuevo), args.umbral)
+        print(formatear_comparacion(filas))
+        regresiones = sum(1 for fila in filas if fila["regresion"])
+        print(f"\n{regresiones} regresión(es) por encima de {args.umbral:.1f}%")
+        return 1 if regresiones > 0 else 0
+
+    graficar_escalamiento(cargar(args.resultados), args.salida)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import random
+import time
+from itertools import product
+from typing import Any, Callable, NamedTuple
+
+from core.simulador import Simulador
+from core.motor_numpy import np
+from models.arbol_contagio import ArbolContagio
+from models.matriz import Matriz
+from models.matriz_dispersa import MatrizDispersa
+from models.persona import Persona
+
+
+# Cada caso arma su estado fuera del cronómetro (preparar) y mide solo la
+# operación (medir), que devuelve (segundos, operaciones).
+class Caso(NamedTuple):
+    nombre: str
+    dimensiones: tuple[str, ...]
+    preparar: Callable[[dict[str, Any], int], Any]
+    medir: Callable[[Any], tuple[float, int]]
+
+
+# Rejilla de parámetros. personas = densidad * tamano², así que cada caso
+# recorre población y densidad a la vez.
+REJILLA: dict[str, tuple] = {
+    "tamano": (20, 50, 100),
+    "densidad": (0.05, 0.2, 0.5),
+    "usar_defensa_multiple": (False, True),
+    "motor": ("clasico", "numpy") if np is not None else ("clasico",),
+    "tipo_matriz": ("densa", "dispersa"),
+    "procesos": (1, 2, 4, 8),
+}
+
+REJILLA_RAPIDA: dict[str, tuple] = {
+    "tamano": (20, 50),
+    "densidad": (0.05, 0.5),
+    "usar_defensa_multiple": (False, True),
+    "motor": ("clasico",),
+    "tipo_matriz": ("densa",),
+    "procesos": (1, 2),
+}
+
+RONDAS_MEDIDAS = 20
+RONDAS_PREVIAS = 5
+
+
+def cantidad_personas(parametros: dict[str, Any]) -> int:
+    return max(1, round(parametros["densidad"] * parametros["tamano"] ** 2))
+
+
+# ------------------- SIMULADOR -------------------
+def _preparar_simulador(parametros: dict[str, Any], semilla: int) -> Simulador:
+    sim = Simulador(parametros["tamano"], cantidad_personas(parametros), semilla_aleatoria=semilla,
+                    usar_defensa_multiple=parametros["usar_defensa_multiple"],
+                    motor=parametros.get("motor", "clasico"), procesos=parametros.get("procesos"))
+    sim.inicializar()
+    sim.ejecutar_rondas(RONDAS_PREVIAS)
+    return sim
+
+
+def _medir_ejecutar_ronda(sim: Simulador) -> tuple[float, int]:
+    inicio = time.perf_counter()
+    for _ in range(RONDAS_MEDIDAS):
+        sim.ejecutar_ronda()
+    return time.perf_counter() - inicio, RONDAS_MEDIDAS
+
+
+def _medir_verificar_contagios(sim: Simulador) -> tuple[float, int]:
+    # el movimiento entre llamadas queda fuera del cronómetro
+    segundos = 0.0
+    for _ in range(RONDAS_MEDIDAS):
+        sim._mover_todas_personas()
+        inicio = time.perf_counter()
+        sim._verificar_contagios()
+        segundos = segundos + time.perf_counter() - inicio
+    return segundos, RONDAS_MEDIDAS
+
+
+# ------------------- TESELAS -------------------
+def _preparar_teselas(parametros: dict[str, Any], semilla: int) -> Simulador:
+    # las rondas previas arrancan los procesos fuera del cronómetro
+    return _preparar_simulador(dict(parametros, motor="teselas"), semilla)
+
+
+def _medir_ronda_teselas(sim: Simulador) -> tuple[float, int]:
+    try:
+        return _medir_ejecutar_ronda(sim)
+    finally:
+        sim.liberar_motor()
+
+
+# ------------------- MATRIZ -------------------
+def _preparar_matriz(parametros: dict[str, Any], semilla: int) -> tuple[Matriz, list[tuple[Persona, int, int]]]:
+    rng = random.Random(semilla)
+    tamano = parametros["tamano"]
+    matriz = MatrizDispersa(tamano) if parametros["tipo_matriz"] == "dispersa" else Matriz(tamano)
+
+    personas = []
+    for i in range(cantidad_personas(parametros)):
+        persona = Persona(f"p{i}", rng.randrange(tamano), rng.randrange(tamano))
+        if i % 3 == 0:
+            persona.infectada = True
+        matriz.agregar_persona(persona)
+        personas.append(persona)
+
+    # un paso aleatorio por persona, calculado antes de medir (rebota en los bordes)
+    movimientos = []
+    for persona in personas:
+        movimientos.append((persona, persona.x + rng.randint(-1, 1), persona.y + rng.randint(-1, 1)))
+    return matriz, movimientos
+
+
+def _medir_mover_persona(estado: tuple[Matriz, list[tuple[Persona, int, int]]]) -> tuple[float, int]:
+    matriz, movimientos = estado
+    inicio = time.perf_counter()
+    for persona, nueva_x, nueva_y in movimientos:
+        matriz.mover_persona(persona, nueva_x, nueva_y)
+    return time.perf_counter() - inicio, len(movimientos)
+
+
+def _medir_visualizar_matriz(estado: tuple[Matriz, list[tuple[Persona, int, int]]]) -> tuple[float, int]:
+    matriz, _ = estado
+    inicio = time.perf_counter()
+    matriz.visualizar()
+    return time.perf_counter() - inicio, 1
+
+
+# ------------------- ÁRBOL -------------------
+def _preparar_arbol(parametros: dict[str, Any], semilla: int) -> tuple[ArbolContagio, list[Persona]]:
+    # árbol recursivo aleatorio: cada infectado nuevo cuelga de uno anterior
+    rng = random.Random(semilla)
+    arbol = ArbolContagio()
+    personas = [Persona(f"p{i}", 0, 0) for i in range(cantidad_personas(parametros))]
+
+    personas[0].infectada = True
+    arbol.establecer_paciente_cero(personas[0])
+    for i in range(1, len(personas)):
+        personas[i].infectar(personas[rng.randrange(i)])
+        arbol.agregar_contagio(personas[i].infectador, personas[i])
+
+    a_curar = personas[1:]
+    rng.shuffle(a_curar)
+    return arbol, a_curar[:max(1, len(a_curar) // 4)]
+
+
+def _medir_curar_persona(estado: tuple[ArbolContagio, list[Persona]]) -> tuple[float, int]:
+    arbol, a_curar = estado
+    inicio = time.perf_counter()
+    for persona in a_curar:
+        arbol.curar_persona(persona)
+    return time.perf_counter() - inicio, len(a_curar)
+
+
+def _medir_get_profundidad(estado: tuple[ArbolContagio, list[Persona]]) -> tuple[float, int]:
+    arbol, _ = estado
+    llamadas = 10000
+    inicio = time.perf_counter()
+    for _ in range(llamadas):
+        arbol.get_profundidad()
+    return time.perf_counter() - inicio, llamadas
+
+
+def _medir_visualizar_arbol(estado: tuple[ArbolContagio, list[Persona]]) -> tuple[float, int]:
+    arbol, _ = estado
+    inicio = time.perf_counter()
+    arbol.visualizar()
+    return time.perf_counter() - inicio, 1
+
+
+CASOS: tuple[Caso, ...] = (
+    Caso("ejecutar_ronda", ("tamano", "densidad", "usar_defensa_multiple", "motor"),
+         _preparar_simulador, _medir_ejecutar_ronda),
+    Caso("verificar_contagios", ("tamano", "densidad", "usar_defensa_multiple"),
+         _preparar_simulador, _medir_verificar_contagios),
+    Caso("matriz.mover_persona", ("tamano", "densidad", "tipo_matriz"),
+         _preparar_matriz, _medir_mover_persona),
+    Caso("matriz.visualizar", ("tamano", "densidad", "tipo_matriz"),
+         _preparar_matriz, _medir_visualizar_matriz),
+    Caso("arbol.curar_persona", ("tamano", "densidad"), _preparar_arbol, _medir_curar_persona),
+    Caso("arbol.get_profundidad", ("tamano", "densidad"), _preparar_arbol, _medir_get_profundidad),
+    Caso("arbol.visualizar", ("tamano", "densidad"), _preparar_arbol, _medir_visualizar_arbol),
+)
+if np is not None:
+    CASOS = CASOS + (
+        Caso("teselas.ejecutar_ronda", ("tamano", "densidad", "usar_defensa_multiple", "procesos"),
+             _preparar_teselas, _medir_ronda_teselas),
+    )
+
+
+def combinaciones(caso: Caso, rejilla: dict[str, tuple]) -> list[dict[str, Any]]:
+    valores = [rejilla[dimension] for dimension in caso.dimensiones]
+    return [dict(zip(caso.dimensiones, combinacion)) for combinacion in product(*valores)]
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import gc
+import json
+import platform
+import statistics
+import sys
+from datetime import datetime
+from typing import Any, Callable, Optional
+
+from benchmarks.casos import CASOS, Caso, cantidad_personas, combinaciones
+
+
+def medir_caso(caso: Caso, parametros: dict[str, Any], repeticiones: int) -> dict[str, Any]:
+    """
+    Prepara y mide el caso `repeticiones` veces (una semilla distinta por
+    repetición) con el recolector de basura pausado durante la medición.
+    """
+    tiempos = []
+    for repeticion in range(repeticiones):
+        estado = caso.preparar(parametros, repeticion)
+
+        recolector_activo = gc.isenabled()
+        gc.collect()
+        gc.disable()
+        try:
+            segundos, operaciones = caso.medir(estado)
+        finally:
+            if recolector_activo:
+                gc.enable()
+
+        tiempos.append(segundos / operaciones)
+
+    mediana = statistics.median(tiempos)
+    return {
+        "caso": caso.nombre,
+        "parametros": dict(parametros, personas=cantidad_personas(parametros)),
+        "segundos_por_op": mediana,
+        "minimo": min(tiempos),
+        "maximo": max(tiempos),
+        "ops_por_segundo": 1.0 / mediana if mediana > 0 else 0.0,
+        "repeticiones": repeticiones,
+    }
+
+
+def ejecutar_suite(rejilla: dict[str, tuple], repeticiones: int = 5, filtro: Optional[str] = None,
+                   progreso: Optional[Callable[[dict[str, Any]], None]] = None) -> dict[str, Any]:
+    resultados = []
+    for caso in CASOS:
+        if filtro is not None and filtro not in caso.nombre:
+            continue
+        for parametros in combinaciones(caso, rejilla):
+            resultado = medir_caso(caso, parametros, repeticiones)
+            resultados.append(resultado)
+            if progreso is not None:
+                progreso(resultado)
+
+    return {
+        "meta": {
+            "fecha": datetime.now().isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "plataforma": platform.platform(),
+            "repeticiones": repeticiones,
+        },
+        "resultados": resultados,
+    }
+
+
+def guardar(resultados: dict[str, Any], ruta: str) -> None:
+    with open(ruta, "w", encoding="utf-8") as f:
+        json.dump(resultados, f, indent=2)
+        f.write("\n")
+
+
+def cargar(ruta: str) -> dict[str, Any]:
+    with open(ruta, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _clave(resultado: dict[str, Any]) -> tuple:
+    return (resultado["caso"], tuple(sorted(resultado["parametros"].items())))
+
+
+def comparar(base: dict[str, Any], nuevo: dict[str, Any], umbral: float = 10.0) -> list[dict[str, Any]]:
+    """
+    Empareja los resultados por caso y parámetros y calcula el cambio de
+    tiempo por operación en %. Se compara el mínimo de las repeticiones, que
+    es lo menos sensible al ruido de la máquina. Es regresión si el tiempo
+    sube más que `umbral` %.
+    """
+    por_clave = {_clave(resultado): resultado for resultado in base["resultados"]}
+
+    filas = []
+    for resultado in nuevo["resultados"]:
+        anterior = por_clave.get(_clave(resultado))
+        if anterior is None or anterior["minimo"] <= 0:
+            continue
+        cambio = 100.0 * (resultado["minimo"] / anterior["minimo"] - 1.0)
+        filas.append({
+            "caso": resultado["caso"],
+            "parametros": resultado["parametros"],
+            "base": anterior["minimo"],
+            "nuevo": resultado["minimo"],
+            "cambio": cambio,
+            "regresion": cambio > umbral,
+        })
+    return filas
+
+
+def formatear_comparacion(filas: list[dict[str, Any]]) -> str:
+    lineas = [f"{'caso':<24} {'parámetros':<58} {'base':>10} {'nuevo':>10} {'cambio':>8}"]
+    for fila in filas:
+        parametros = " ".join(f"{k}={v}" for k, v in fila["parametros"].items())
+        marca = "  REGRESIÓN" if fila["regresion"] else ""
+        lineas.append(f"{fila['caso']:<24} {parametros:<58} {_tiempo(fila['base']):>10} "
+                      f"{_tiempo(fila['nuevo']):>10} {fila['cambio']:>+7.1f}%{marca}")
+    return "\n".join(lineas)
+
+
+def _tiempo(segundos: float) -> str:
+    if segundos >= 1:
+        return f"{segundos:.2f} s"
+    if segundos >= 1e-3:
+        return f"{segundos * 1e3:.2f} ms"
+    return f"{segundos * 1e6:.2f} µs"
+
+
+def graficar_escalamiento(resultados: dict[str, Any], ruta: str) -> None:
+    """Rondas/s de ejecutar_ronda contra la población, una curva por configuración."""
+    try:
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+    except ImportError:
+        raise ImportError("Los gráficos requieren instalar matplotlib (pip install matplotlib).")
+
+    curvas: dict[str, list[tuple[int, float]]] = {}
+    for resultado in resultados["resultados"]:
+        if resultado["caso"] != "ejecutar_ronda":
+            continue
+        parametros = resultado["parametros"]
+        etiqueta = (f"tamaño {parametros['tamano']}, {parametros['motor']}"
+                    + (", defensa múltiple" if parametros["usar_defensa_multiple"] else ""))
+        curvas.setdefault(etiqueta, []).append((parametros["personas"], resultado["ops_por_segundo"]))
+
+    figura, eje = plt.subplots(figsize=(8, 5))
+    for etiqueta, puntos in sorted(curvas.items()):
+        puntos.sort()
+        eje.plot([p for p, _ in puntos], [r for _, r in puntos], marker="o", label=etiqueta)
+    eje.set_xscale("log")
+    eje.set_yscale("log")
+    eje.set_xlabel("personas")
+    eje.set_ylabel("rondas por segundo")
+    eje.set_title("Escalamiento de ejecutar_ronda")
+    eje.grid(True, which="both", alpha=0.3)
+    eje.legend(fontsize="small")
+    figura.tight_layout()
+    figura.savefig(ruta, dpi=120)
+    plt.close(figura)
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import random
+from typing import Optional, Any, Sequence, Union
+
+try:
+    import numpy as np
+except ImportError:  # numpy es opcional
+    np = None
+
+
+class FuenteAleatoria:
+    """
+    Generador propio de una simulación, basado en random.Random. Con la misma
+    semilla produce exactamente la misma secuencia que random.seed(semilla),
+    pero sin tocar el módulo global, así que varias simulaciones pueden
+    avanzar en el mismo proceso sin interferir entre sí.
+
+    flujo identifica un flujo hijo (ver hijas); () es el flujo raíz.
+    """
+
+    tipo = "random"
+
+    def __init__(self, semilla: Optional[int] = None, flujo: tuple[int, ...] = ()) -> None:
+        self.semilla: Optional[int] = semilla
+        self.flujo: tuple[int, ...] = flujo
+
+        if len(flujo) == 0:
+            self.rng = random.Random(semilla)
+        elif semilla is None:
+            self.rng = random.Random()
+        else:
+            # las semillas de texto se derivan con sha512: no dependen de PYTHONHASHSEED
+            self.rng = random.Random(f"{semilla}/" + "/".join(str(i) for i in flujo))
+
+        self._generador_numpy: Any = None
+
+    def randint(self, a: int, b: int) -> int:
+        return self.rng.randint(a, b)
+
+    def choice(self, secuencia: Sequence[Any]) -> Any:
+        return self.rng.choice(secuencia)
+
+    def generador_numpy(self) -> Any:
+        # Generador de NumPy para el motor vectorizado. Se deriva de la semilla
+        # y el flujo, no de self.rng: crearlo no cambia lo que sale de randint y
+        # choice, así que la población inicial es la misma con cualquier motor.
+        if self._generador_numpy is None:
+            if np is None:
+                raise ImportError("Se necesita numpy (pip install numpy).")
+            if self.semilla is None:
+                self._generador_numpy = np.random.default_rng()
+            else:
+                # abs: random.Random también ignora el signo de la semilla
+                secuencia = np.random.SeedSequence(abs(self.semilla), spawn_key=self.flujo)
+                self._generador_numpy = np.random.default_rng(secuencia)
+        return self._generador_numpy
+
+    def get_estado(self) -> dict[str, Any]:
+        version, estado_interno, gauss = self.rng.getstate()
+        estado_numpy = None
+        if self._generador_numpy is not None:
+            estado_numpy = self._generador_numpy.bit_generator.state
+        return {"random": [version, list(estado_interno), gauss], "numpy": estado_numpy}
+
+    def set_estado(self, estado: dict[str, Any]) -> None:
+        version, estado_interno, gauss = estado["random"]
+        self.rng.setstate((version, tuple(estado_interno), gauss))
+        if estado["numpy"] is not None:
+            self.generador_numpy().bit_generator.state = estado["numpy"]
+
+    def hijas(self, cantidad: int) -> list[FuenteAleatoria]:
+        """Flujos independientes y reproducibles, uno por corrida de un ensamble."""
+        return [FuenteAleatoria(self.semilla, self.flujo + (i,)) for i in range(cantidad)]
+
+    def __repr__(self) -> str:
+        return f"FuenteAleatoria(semilla={self.semilla}, flujo={self.flujo})"
+
+
+class FuenteAleatoriaNumpy:
+    """
+    Misma interfaz que FuenteAleatoria, pero sobre un numpy.random.Generator.
+    Los flujos hijos usan spawn_key de SeedSequence, que garantiza independencia.
+    """
+
+    tipo = "numpy"
+
+    def __init__(self, semilla: Optional[int] = None, flujo: tuple[int, ...] = ()) -> None:
+        if np is None:
+            raise ImportError("El generador 'numpy' requiere instalar numpy (pip install numpy).")
+
+        self.semilla: Optional[int] = semilla
+        self.flujo: tuple[int, ...] = flujo
+        self.secuencia_semilla = np.random.SeedSequence(semilla, spawn_key=flujo)
+        self.generador = np.random.Generator(np.random.PCG64(self.secuencia_semilla))
+
+    def randint(self, a: int, b: int) -> int:
+        return int(self.generador.integers(a, b + 1))
+
+    def choice(self, secuencia: Sequence[Any]) -> Any:
+        return secuencia[int(self.generador.integers(len(secuencia)))]
+
+    def generador_numpy(self) -> Any:
+        return self.generador
+
+    def get_estado(self) -> dict[str, Any]:
+        return {"numpy": self.generador.bit_generator.state}
+
+    def set_estado(self, estado: dict[str, Any]) -> None:
+        self.generador.bit_generator.state = estado["numpy"]
+
+    def hijas(self, cantidad: int) -> list[FuenteAleatoriaNumpy]:
+        # equivale a SeedSequence.spawn, pero sin depender de cuántas veces se llame
+        entropia = self.secuencia_semilla.entropy
+        return [FuenteAleatoriaNumpy(entropia, self.flujo + (i,)) for i in range(cantidad)]
+
+    def __repr__(self) -> str:
+        return f"FuenteAleatoriaNumpy(semilla={self.semilla}, flujo={self.flujo})"
+
+
+Fuente = Union[FuenteAleatoria, FuenteAleatoriaNumpy]
+
+
+def crear_fuente(semilla: Optional[int] = None, tipo: str = "random") -> Fuente:
+    if tipo == "random":
+        return FuenteAleatoria(semilla)
+    if tipo == "numpy":
+        return FuenteAleatoriaNumpy(semilla)
+    raise ValueError(f"Generador desconocido: {tipo!r} (usa 'random' o 'numpy')")
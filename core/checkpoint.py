@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import gc
+import json
+import struct
+import sys
+import zlib
+from array import array
+from itertools import compress
+from typing import Any, BinaryIO
+
+from core.simulador import Simulador
+from models.persona import Persona
+
+
+# Formato del archivo:
+#   MAGIA (8 bytes) | banderas (1 byte) | carga (comprimida con zlib si BANDERA_ZLIB)
+# La carga es una sucesión de bloques, cada uno precedido por su largo (uint64):
+#   0 encabezado JSON (configuración, contadores, estado del generador)
+#   1 ids de las personas, en UTF-8 separados por "\n"
+#   2 x  3 y  4 defensa  5 índice del infectador (-1 = ninguno)   -> int32
+#   6 infectada                                                   -> int8
+#   7 personas del árbol en preorden  8 posición del padre (-1 = raíz)
+#   9 orden de inserción de ArbolContagio.nodos                   -> int32
+#  10 personas en el orden de Matriz.get_todas_personas            -> int32
+#     (fila por fila y, dentro de cada celda, en orden de llegada)
+MAGIA = b"REVCKPT1"
+BANDERA_ZLIB = 1
+_LARGO = struct.Struct("<Q")
+
+
+def save_checkpoint(simulador: Simulador, ruta: str, comprimir: bool = False) -> None:
+    """
+    Guarda el estado completo del simulador: población, ronda, contador de
+    personas, estado del generador aleatorio y el árbol de contagio como
+    arreglo de padres (sin serializar los objetos NodoArbol).
+    """
+    personas = simulador.get_personas()
+    indice_de = {persona.id: i for i, persona in enumerate(personas)}
+
+    ids = "\n".join(persona.id for persona in personas).encode("utf-8")
+    xs = array("i", (persona.x for persona in personas))
+    ys = array("i", (persona.y for persona in personas))
+    defensas = array("i", (persona.defensa for persona in personas))
+    infectadores = array("i", (indice_de[persona.infectador.id] if persona.infectador is not None else -1
+                               for persona in personas))
+    infectadas = array("b", (persona.infectada for persona in personas))
+
+    preorden, padres, orden_insercion = simulador.get_arbol().exportar_estructura()
+    nodos_personas = array("i", (indice_de[nodo.get_persona().id] for nodo in preorden))
+    nodos_padres = array("i", padres)
+    nodos_orden = array("i", orden_insercion)
+    orden_matriz = array("i", (indice_de[persona.id] for persona in simulador.get_matriz().get_todas_personas()))
+
+    encabezado = {
+        "tamano_matriz": simulador.tamano_matriz,
+        "cantidad_personas_inicial": simulador.cantidad_personas_inicial,
+        "defensa_inicial": simulador.defensa_inicial,
+        "semilla_aleatoria": simulador.semilla_aleatoria,
+        "usar_defensa_multiple": simulador.usar_defensa_multiple,
+        "motor": simulador.motor,
+        "tipo_matriz": simulador.tipo_matriz,
+        "procesos": simulador.procesos,
+        "generador": simulador.fuente.tipo,
+        "estado_generador": simulador.fuente.get_estado(),
+        "ronda_actual": simulador.ronda_actual,
+        "contador_personas": simulador.contador_personas,
+        "infectadas_inicio_ronda": simulador.infectadas_inicio_ronda,
+        "contagios_ultima_ronda": simulador.contagios_ultima_ronda,
+        "esta_inicializada": simulador.esta_inicializada,
+        "cantidad_personas": len(personas),
+    }
+
+    bloques = [json.dumps(encabezado).encode("utf-8"), ids]
+    for arreglo in (xs, ys, defensas, infectadores, infectadas, nodos_personas, nodos_padres, nodos_orden,
+                    orden_matriz):
+        bloques.append(_a_bytes(arreglo))
+
+    partes = []
+    for bloque in bloques:
+        partes.append(_LARGO.pack(len(bloque)))
+        partes.append(bloque)
+    carga = b"".join(partes)
+
+    banderas = 0
+    if comprimir:
+        carga = zlib.compress(carga, 6)
+        banderas = banderas | BANDERA_ZLIB
+
+    with open(ruta, "wb") as f:
+        f.write(MAGIA)
+        f.write(bytes([banderas]))
+        f.write(carga)
+
+
+def load_checkpoint(ruta: str) -> Simulador:
+    """Reconstruye un Simulador idéntico al que se guardó con save_checkpoint."""
+    with open(ruta, "rb") as f:
+        bloques = _leer_bloques(f)
+
+    encabezado: dict[str, Any] = json.loads(bloques[0].decode("utf-8"))
+    cantidad = encabezado["cantidad_personas"]
+
+    ids = bloques[1].decode("utf-8").split("\n") if cantidad > 0 else []
+    xs = _desde_bytes("i", bloques[2]).tolist()
+    ys = _desde_bytes("i", bloques[3]).tolist()
+    defensas = _desde_bytes("i", bloques[4]).tolist()
+    infectadores = _desde_bytes("i", bloques[5]).tolist()
+    infectadas = _desde_bytes("b", bloques[6]).tolist()
+    nodos_personas = _desde_bytes("i", bloques[7]).tolist()
+    nodos_padres = _desde_bytes("i", bloques[8]).tolist()
+    nodos_orden = _desde_bytes("i", bloques[9]).tolist()
+    orden_matriz = _desde_bytes("i", bloques[10]).tolist()
+
+    # Con millones de objetos nuevos el recolector de ciclos recorre el montón
+    # una y otra vez; se pausa mientras se arman la matriz, la población y el árbol.
+    recolector_activo = gc.isenabled()
+    gc.disable()
+    try:
+        simulador = Simulador(
+            tamano_matriz=encabezado["tamano_matriz"],
+            cantidad_personas=encabezado["cantidad_personas_inicial"],
+            defensa_inicial=encabezado["defensa_inicial"],
+            semilla_aleatoria=encabezado["semilla_aleatoria"],
+            usar_defensa_multiple=encabezado["usar_defensa_multiple"],
+            motor=encabezado["motor"],
+            tipo_matriz=encabezado["tipo_matriz"],
+            generador=encabezado["generador"],
+            procesos=encabezado.get("procesos"),
+        )
+        simulador.fuente.set_estado(encabezado["estado_generador"])
+
+        personas = _crear_personas(simulador, ids, xs, ys, defensas, infectadas, infectadores, orden_matriz)
+        simulador.get_arbol().importar_estructura([personas[i] for i in nodos_personas],
+                                                  nodos_padres, nodos_orden)
+    finally:
+        if recolector_activo:
+            gc.enable()
+
+    simulador.lista_personas = personas
+    simulador.cantidad_infectadas = sum(infectadas)
+    simulador.version_poblacion = simulador.version_poblacion + 1
+    simulador.ronda_actual = encabezado["ronda_actual"]
+    simulador.contador_personas = encabezado["contador_personas"]
+    simulador.infectadas_inicio_ronda = encabezado.get("infectadas_inicio_ronda", 0)
+    simulador.contagios_ultima_ronda = encabezado.get("contagios_ultima_ronda", 0)
+    simulador.esta_inicializada = encabezado["esta_inicializada"]
+
+    return simulador
+
+
+def _crear_personas(simulador: Simulador, ids: list[str], xs: list[int], ys: list[int],
+                    defensas: list[int], infectadas: list[int], infectadores: list[int],
+                    orden_matriz: list[int]) -> list[Persona]:
+    # map(Persona, ...) ya es lo más rápido: saltear __init__ armando el
+    # __dict__ a mano resultó más lento y rompe el diccionario compartido.
+    personas = list(map(Persona, ids, xs, ys, defensas))
+
+    al_cambiar_estado = simulador._al_cambiar_estado
+    for persona in personas:
+        persona.al_cambiar_estado = al_cambiar_estado
+    # el orden dentro de cada celda importa: curar_persona cura a la primera infectada
+    simulador.matriz.agregar_personas_en_lote([personas[i] for i in orden_matriz])
+
+    # solo las infectadas tienen infectador; el resto queda como lo deja Persona()
+    for i in compress(range(len(personas)), infectadas):
+        persona = personas[i]
+        persona.infectada = True
+        if infectadores[i] >= 0:
+            persona.infectador = personas[infectadores[i]]
+
+    return personas
+
+
+def _leer_bloques(f: BinaryIO) -> list[bytes]:
+    magia = f.read(len(MAGIA))
+    if magia != MAGIA:
+        raise ValueError("El archivo no es un checkpoint de la simulación.")
+
+    banderas = f.read(1)[0]
+    carga = f.read()
+    if banderas & BANDERA_ZLIB:
+        carga = zlib.decompress(carga)
+
+    bloques = []
+    vista = memoryview(carga)
+    posicion = 0
+    while posicion < len(carga):
+        (largo,) = _LARGO.unpack_from(carga, posicion)
+        posicion = posicion + _LARGO.size
+        bloques.append(vista[posicion:posicion + largo].tobytes())
+        posicion = posicion + largo
+
+    return bloques
+
+
+# Los arreglos se guardan siempre en little-endian
+def _a_bytes(arreglo: array) -> bytes:
+    if sys.byteorder == "big":
+        arreglo = array(arreglo.typecode, arreglo)
+        arreglo.byteswap()
+    return arreglo.tobytes()
+
+
+def _desde_bytes(tipo: str, datos: bytes) -> array:
+    arreglo = array(tipo)
+    arreglo.frombytes(datos)
+    if sys.byteorder == "big":
+        arreglo.byteswap()
+    return arreglo
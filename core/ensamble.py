@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import copy
+import math
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Any, Sequence, Union
+
+from core.simulador import Simulador
+from core.lote import simulacion_terminada
+from core.aleatorio import Fuente
+
+
+SERIES = ("sanas", "infectadas", "profundidad_arbol")
+
+
+def ejecutar_corrida(parametros: dict[str, Any], semilla: Union[int, Fuente],
+                     max_rondas: int) -> dict[str, list[int]]:
+    """
+    Ejecuta una simulación completa con la semilla (o el flujo aleatorio hijo)
+    dado y devuelve sus series por ronda (incluida la ronda 0). Si la
+    simulación termina antes de max_rondas, la última ronda se repite: ambos
+    finales (todas o ninguna infectada) son estados que ya no cambian.
+    Un flujo dado se copia: el del llamador no avanza (en serie, igual que
+    al mandarlo a otro proceso).
+    """
+    if isinstance(semilla, int):
+        sim = Simulador(semilla_aleatoria=semilla, **parametros)
+    else:
+        sim = Simulador(fuente=copy.deepcopy(semilla), **parametros)
+    sim.inicializar()
+
+    resumenes = [sim.resumen_ronda()]
+    resumenes.extend(sim.iter_rondas(max_rondas, stop_when=simulacion_terminada))
+    resumenes.extend([resumenes[-1]] * (max_rondas + 1 - len(resumenes)))
+    sim.liberar_motor()
+
+    return {nombre: [getattr(resumen, nombre) for resumen in resumenes] for nombre in SERIES}
+
+
+def _ejecutar_bloque(parametros: dict[str, Any], semillas: Sequence[Union[int, Fuente]],
+                     max_rondas: int) -> list[dict[str, list[int]]]:
+    resultados = []
+    for semilla in semillas:
+        resultados.append(ejecutar_corrida(parametros, semilla, max_rondas))
+    return resultados
+
+
+def ejecutar_ensamble(parametros: dict[str, Any], semillas: Sequence[Union[int, Fuente]], max_rondas: int,
+                      trabajadores: int = 1, tamano_bloque: Optional[int] = None,
+                      percentiles: Sequence[float] = (5, 50, 95)) -> dict[str, Any]:
+    """
+    Reparte corridas independientes (una por semilla) entre procesos y agrega
+    sus curvas. Las semillas se asignan en bloques contiguos y los resultados
+    se recogen en el orden de las semillas, así que el agregado es el mismo
+    con cualquier cantidad de trabajadores.
+
+    semillas: enteros o flujos hijos (p. ej. crear_fuente(7).hijas(100)).
+
+    parametros: argumentos de Simulador salvo la semilla (tamano_matriz,
+    cantidad_personas, defensa_inicial, usar_defensa_multiple, motor, ...).
+    """
+    semillas = list(semillas)
+    if len(semillas) == 0:
+        raise ValueError("El ensamble necesita al menos una semilla.")
+
+    if tamano_bloque is None:
+        # unos cuatro bloques por trabajador para repartir bien la carga
+        tamano_bloque = max(1, math.ceil(len(semillas) / (max(1, trabajadores) * 4)))
+
+    bloques = [semillas[i:i + tamano_bloque] for i in range(0, len(semillas), tamano_bloque)]
+
+    corridas: list[dict[str, list[int]]] = []
+    if trabajadores <= 1:
+        for bloque in bloques:
+            corridas.extend(_ejecutar_bloque(parametros, bloque, max_rondas))
+    else:
+        with ProcessPoolExecutor(max_workers=trabajadores) as ejecutor:
+            futuros = [ejecutor.submit(_ejecutar_bloque, parametros, bloque, max_rondas)
+                       for bloque in bloques]
+            for futuro in futuros:
+                corridas.extend(futuro.result())
+
+    return agregar_corridas(corridas, semillas, percentiles)
+
+
+def agregar_corridas(corridas: list[dict[str, list[int]]], semillas: Sequence[Union[int, Fuente]],
+                     percentiles: Sequence[float] = (5, 50, 95)) -> dict[str, Any]:
+    cantidad_rondas = len(corridas[0]["infectadas"])
+
+    por_ronda: dict[str, dict[str, list[float]]] = {}
+    for nombre in SERIES:
+        resumen_serie: dict[str, list[float]] = {"media": []}
+        for p in percentiles:
+            resumen_serie[f"p{p:g}"] = []
+
+        for ronda in range(cantidad_rondas):
+            valores = sorted(corrida[nombre][ronda] for corrida in corridas)
+            resumen_serie["media"].append(sum(valores) / len(valores))
+            for p in percentiles:
+                resumen_serie[f"p{p:g}"].append(percentil(valores, p))
+
+        por_ronda[nombre] = resumen_serie
+
+    tamanos_finales = [corrida["infectadas"][-1] for corrida in corridas]
+    distribucion: dict[int, int] = {}
+    for tamano in tamanos_finales:
+        distribucion[tamano] = distribucion.get(tamano, 0) + 1
+
+    ordenados = sorted(tamanos_finales)
+    tamano_final: dict[str, Any] = {
+        "media": sum(ordenados) / len(ordenados),
+        "minimo": ordenados[0],
+        "maximo": ordenados[-1],
+        "distribucion": dict(sorted(distribucion.items())),
+    }
+    for p in percentiles:
+        tamano_final[f"p{p:g}"] = percentil(ordenados, p)
+
+    return {
+        "corridas": len(corridas),
+        "semillas": [s if isinstance(s, int) else repr(s) for s in semillas],
+        "rondas": cantidad_rondas - 1,
+        "por_ronda": por_ronda,
+        "tamano_final": tamano_final,
+    }
+
+
+def percentil(valores_ordenados: Sequence[float], p: float) -> float:
+    # interpolación lineal entre los dos rangos más cercanos
+    if len(valores_ordenados) == 1:
+        return float(valores_ordenados[0])
+
+    posicion = (len(valores_ordenados) - 1) * p / 100.0
+    abajo = math.floor(posicion)
+    arriba = min(abajo + 1, len(valores_ordenados) - 1)
+    fraccion = posicion - abajo
+
+    return valores_ordenados[abajo] + (valores_ordenados[arriba] - valores_ordenados[abajo]) * fraccion
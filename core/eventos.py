@@ -0,0 +1,307 @@
+from __future__ import annotations
+
+import json
+import struct
+from array import array
+from typing import Any
+
+# Este módulo no importa el motor de simulación: lo usan tanto el Simulador
+# (para escribir) como el reproductor de la interfaz (para leer).
+
+MAGIA = b"REVEVT1\n"
+
+# Tipos de registro
+RONDA = 1             # fin de ronda: ronda, total, infectadas, profundidad del árbol
+MOVER = 2             # persona, x, y
+DEFENSA = 3           # persona, defensa nueva (golpe de un infectado)
+INFECCION = 4         # persona, infectador (ella misma si es paciente cero)
+CURA = 5              # persona (vuelve a defensa 3)
+AGREGAR = 6           # persona, x, y, defensa, id
+AUMENTO_DEFENSA = 7   # todas las personas sanas suben 1 de defensa
+
+_FORMATOS = {
+    RONDA: struct.Struct("<BIIII"),
+    MOVER: struct.Struct("<BIii"),
+    DEFENSA: struct.Struct("<BIi"),
+    INFECCION: struct.Struct("<BII"),
+    CURA: struct.Struct("<BI"),
+    AGREGAR: struct.Struct("<BIiiiH"),
+    AUMENTO_DEFENSA: struct.Struct("<B"),
+}
+
+# Memoria máxima de las fotos clave del lector (ver LectorEventos._guardar_clave)
+MEMORIA_CLAVES = 64 * 1024 * 1024
+_BYTES_POR_PERSONA_EN_CLAVE = 13   # x, y, defensa en int32 + infectada en un byte
+
+# Registros de ancho fijo para empaquetar lotes desde arreglos de NumPy
+DTYPE_MOVER = [("tipo", "u1"), ("persona", "<u4"), ("x", "<i4"), ("y", "<i4")]
+DTYPE_DEFENSA = [("tipo", "u1"), ("persona", "<u4"), ("defensa", "<i4")]
+
+
+class RegistroEventos:
+    """
+    Escritor del flujo binario de eventos (solo se agrega al final). Las
+    personas se identifican por su posición en la lista del simulador.
+    """
+
+    def __init__(self, ruta: str, tamano_matriz: int) -> None:
+        self.ruta: str = ruta
+        self.archivo = open(ruta, "wb", buffering=1 << 16)
+        self.indice_de: dict[str, int] = {}
+
+        encabezado = json.dumps({"tamano_matriz": tamano_matriz}).encode("utf-8")
+        self.archivo.write(MAGIA)
+        self.archivo.write(struct.pack("<I", len(encabezado)))
+        self.archivo.write(encabezado)
+
+    def agregar(self, persona_id: str, x: int, y: int, defensa: int) -> None:
+        indice = len(self.indice_de)
+        self.indice_de[persona_id] = indice
+        id_bytes = persona_id.encode("utf-8")
+        self.archivo.write(_FORMATOS[AGREGAR].pack(AGREGAR, indice, x, y, defensa, len(id_bytes)))
+        self.archivo.write(id_bytes)
+
+    def mover(self, indice: int, x: int, y: int) -> None:
+        self.archivo.write(_FORMATOS[MOVER].pack(MOVER, indice, x, y))
+
+    def mover_lote(self, lote: Any) -> None:
+        # lote: arreglo estructurado de NumPy con DTYPE_MOVER
+        self.archivo.write(lote.tobytes())
+
+    def defensa(self, persona_id: str, defensa: int) -> None:
+        self.archivo.write(_FORMATOS[DEFENSA].pack(DEFENSA, self.indice_de[persona_id], defensa))
+
+    def defensa_lote(self, lote: Any) -> None:
+        # lote: arreglo estructurado de NumPy con DTYPE_DEFENSA
+        self.archivo.write(lote.tobytes())
+
+    def infeccion(self, persona_id: str, infectador_id: str) -> None:
+        self.archivo.write(_FORMATOS[INFECCION].pack(INFECCION, self.indice_de[persona_id],
+                                                     self.indice_de[infectador_id]))
+
+    def cura(self, persona_id: str) -> None:
+        self.archivo.write(_FORMATOS[CURA].pack(CURA, self.indice_de[persona_id]))
+
+    def aumento_defensa(self) -> None:
+        self.archivo.write(_FORMATOS[AUMENTO_DEFENSA].pack(AUMENTO_DEFENSA))
+
+    def ronda(self, estadisticas: dict[str, Any]) -> None:
+        self.archivo.write(_FORMATOS[RONDA].pack(RONDA, estadisticas["ronda"], estadisticas["total_personas"],
+                                                 estadisticas["infectadas"], estadisticas["profundidad_arbol"]))
+
+    def cerrar(self) -> None:
+        if not self.archivo.closed:
+            self.archivo.close()
+
+
+class LectorEventos:
+    """
+    Reproduce un registro de eventos sin el motor: mantiene solo el estado
+    visible (posición, defensa e infección de cada persona) aplicando los
+    eventos en orden. Guarda fotos del estado cada `intervalo_clave` rondas
+    mientras avanza, para poder saltar hacia atrás sin empezar de cero. Las
+    fotos ocupan a lo sumo memoria_claves bytes: al pasarse, el intervalo se
+    duplica y se descartan las que quedan fuera de él.
+    """
+
+    def __init__(self, ruta: str, intervalo_clave: int = 50, memoria_claves: int = MEMORIA_CLAVES) -> None:
+        with open(ruta, "rb") as f:
+            datos = f.read()
+
+        if not datos.startswith(MAGIA):
+            raise ValueError("El archivo no es un registro de eventos de la simulación.")
+
+        (largo,) = struct.unpack_from("<I", datos, len(MAGIA))
+        inicio = len(MAGIA) + 4
+        encabezado = json.loads(datos[inicio:inicio + largo].decode("utf-8"))
+
+        self.datos: bytes = datos
+        self.tamano_matriz: int = encabezado["tamano_matriz"]
+        self.intervalo_clave: int = max(1, intervalo_clave)
+        self.memoria_claves: int = memoria_claves
+        self._inicio_eventos: int = inicio + largo
+
+        # fin_de_ronda[k] = byte justo después del k-ésimo registro RONDA
+        self.rondas: list[int] = []
+        self.fin_de_ronda: list[int] = []
+        self._indexar()
+
+        self.ids: list[str] = []
+        self.x: list[int] = []
+        self.y: list[int] = []
+        self.defensa: list[int] = []
+        self.infectada: list[bool] = []
+        self.estadisticas: dict[str, int] = {}
+        self.posicion_ronda: int = -1   # índice en self.rondas del último RONDA aplicado
+        self._puntero: int = self._inicio_eventos
+        self._claves: dict[int, tuple] = {}
+        self._memoria_en_claves: int = 0
+
+        if len(self.rondas) > 0:
+            self.ir_a_posicion(0)
+
+    # ------------------- NAVEGACIÓN -------------------
+    def cantidad_rondas(self) -> int:
+        return len(self.rondas)
+
+    def ronda_actual(self) -> int:
+        return self.estadisticas.get("ronda", 0)
+
+    def avanzar(self, pasos: int = 1) -> bool:
+        """Avanza `pasos` rondas; devuelve False si ya no quedan."""
+        destino = min(self.posicion_ronda + pasos, len(self.rondas) - 1)
+        if destino <= self.posicion_ronda:
+            return False
+        self.ir_a_posicion(destino)
+        return True
+
+    def ir_a_ronda(self, ronda: int) -> None:
+        # última posición cuya ronda es <= la pedida
+        posicion = 0
+        for i, r in enumerate(self.rondas):
+            if r <= ronda:
+                posicion = i
+            else:
+                break
+        self.ir_a_posicion(posicion)
+
+    def ir_a_posicion(self, posicion: int) -> None:
+        posicion = max(0, min(posicion, len(self.rondas) - 1))
+
+        if posicion < self.posicion_ronda or self.posicion_ronda < 0:
+            self._restaurar_clave(posicion)
+
+        while self.posicion_ronda < posicion:
+            self._aplicar_hasta(self.fin_de_ronda[self.posicion_ronda + 1])
+            self.posicion_ronda = self.posicion_ronda + 1
+            if self.posicion_ronda % self.intervalo_clave == 0:
+                self._guardar_clave()
+
+    # ------------------- VISTAS -------------------
+    def personas_snapshot(self) -> list[dict[str, Any]]:
+        # el formato que espera BoardWidget.update_people
+        datos = []
+        for i, persona_id in enumerate(self.ids):
+            datos.append({"id": persona_id, "x": self.x[i], "y": self.y[i],
+                          "infected": self.infectada[i], "defensa": self.defensa[i]})
+        return datos
+
+    def get_estadisticas(self) -> dict[str, int]:
+        return dict(self.estadisticas)
+
+    # ------------------- INTERNOS -------------------
+    def _indexar(self) -> None:
+        datos = self.datos
+        posicion = self._inicio_eventos
+        formato_ronda = _FORMATOS[RONDA]
+
+        while posicion < len(datos):
+            tipo = datos[posicion]
+            if tipo == RONDA:
+                self.rondas.append(formato_ronda.unpack_from(datos, posicion)[1])
+                self.fin_de_ronda.append(posicion + formato_ronda.size)
+            posicion = posicion + self._largo_registro(tipo, posicion)
+
+    def _largo_registro(self, tipo: int, posicion: int) -> int:
+        formato = _FORMATOS.get(tipo)
+        if formato is None:
+            raise ValueError(f"Registro desconocido ({tipo}) en el byte {posicion}.")
+        if tipo == AGREGAR:
+            largo_id = formato.unpack_from(self.datos, posicion)[5]
+            return formato.size + largo_id
+        return formato.size
+
+    def _aplicar_hasta(self, fin: int) -> None:
+        datos = self.datos
+        posicion = self._puntero
+        desempacar_mover = _FORMATOS[MOVER].unpack_from
+        desempacar_defensa = _FORMATOS[DEFENSA].unpack_from
+        x, y, defensa, infectada = self.x, self.y, self.defensa, self.infectada
+
+        while posicion < fin:
+            tipo = datos[posicion]
+
+            if tipo == MOVER:
+                _, i, nueva_x, nueva_y = desempacar_mover(datos, posicion)
+                x[i] = nueva_x
+                y[i] = nueva_y
+            elif tipo == DEFENSA:
+                _, i, nueva_defensa = desempacar_defensa(datos, posicion)
+                defensa[i] = nueva_defensa
+            elif tipo == INFECCION:
+                _, i, _ = _FORMATOS[INFECCION].unpack_from(datos, posicion)
+                infectada[i] = True
+                defensa[i] = 0
+            elif tipo == CURA:
+                _, i = _FORMATOS[CURA].unpack_from(datos, posicion)
+                infectada[i] = False
+                defensa[i] = 3
+            elif tipo == AUMENTO_DEFENSA:
+                for i in range(len(defensa)):
+                    if not infectada[i]:
+                        defensa[i] = defensa[i] + 1
+            elif tipo == AGREGAR:
+                _, i, nueva_x, nueva_y, nueva_defensa, largo_id = _FORMATOS[AGREGAR].unpack_from(datos, posicion)
+                inicio_id = posicion + _FORMATOS[AGREGAR].size
+                self.ids.append(datos[inicio_id:inicio_id + largo_id].decode("utf-8"))
+                x.append(nueva_x)
+                y.append(nueva_y)
+                defensa.append(nueva_defensa)
+                infectada.append(False)
+            elif tipo == RONDA:
+                _, ronda, total, infectadas, profundidad = _FORMATOS[RONDA].unpack_from(datos, posicion)
+                self.estadisticas = {
+                    'ronda': ronda,
+                    'total_personas': total,
+                    'sanas': total - infectadas,
+                    'infectadas': infectadas,
+                    'profundidad_arbol': profundidad,
+                }
+
+            posicion = posicion + self._largo_registro(tipo, posicion)
+
+        self._puntero = posicion
+
+    def _guardar_clave(self) -> None:
+        # Las columnas se copian a arreglos compactos. Los ids no se copian:
+        # solo se agregan al final, así que alcanza con saber cuántos había.
+        if self.posicion_ronda in self._claves:
+            return
+        cantidad = len(self.ids)
+        self._claves[self.posicion_ronda] = (
+            self._puntero, cantidad, array("i", self.x), array("i", self.y),
+            array("i", self.defensa), bytes(self.infectada), dict(self.estadisticas),
+        )
+        self._memoria_en_claves = self._memoria_en_claves + cantidad * _BYTES_POR_PERSONA_EN_CLAVE
+
+        while self._memoria_en_claves > self.memoria_claves and len(self._claves) > 1:
+            self._espaciar_claves()
+
+    def _espaciar_claves(self) -> None:
+        # Duplica el intervalo y suelta las fotos que ya no caen en él. Un salto
+        # hacia atrás vuelve a aplicar a lo sumo intervalo_clave rondas.
+        self.intervalo_clave = self.intervalo_clave * 2
+        for posicion in list(self._claves):
+            if posicion % self.intervalo_clave != 0:
+                cantidad = self._claves.pop(posicion)[1]
+                self._memoria_en_claves = self._memoria_en_claves - cantidad * _BYTES_POR_PERSONA_EN_CLAVE
+
+    def _restaurar_clave(self, posicion: int) -> None:
+        candidatas = [p for p in self._claves if p <= posicion]
+
+        if len(candidatas) == 0:
+            self.ids, self.x, self.y, self.defensa, self.infectada = [], [], [], [], []
+            self.estadisticas = {}
+            self._puntero = self._inicio_eventos
+            self.posicion_ronda = -1
+            return
+
+        clave = max(candidatas)
+        puntero, cantidad, xs, ys, defensas, infectadas, estadisticas = self._claves[clave]
+        self._puntero = puntero
+        # solo se restaura hacia atrás: los ids actuales empiezan con los de la foto
+        del self.ids[cantidad:]
+        self.x, self.y, self.defensa = xs.tolist(), ys.tolist(), defensas.tolist()
+        self.infectada = [valor == 1 for valor in infectadas]
+        self.estadisticas = dict(estadisticas)
+        self.posicion_ronda = clave
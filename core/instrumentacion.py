@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import time
+from typing import Any, Callable
+
+
+FASES = ("movimiento", "contagios", "aumento_defensa", "estadisticas")
+CONTADORES = ("celdas_revisadas", "celdas_mixtas", "infecciones")
+
+
+class Instrumentacion:
+    """
+    Tiempos y contadores por fase de ejecutar_ronda. El Simulador solo la
+    usa si está activada (ver Simulador.activar_instrumentacion); si no,
+    ejecutar_ronda sigue el camino de siempre sin medir nada.
+
+    celdas_revisadas: celdas ocupadas que se agruparon para buscar contagios.
+    celdas_mixtas: celdas con al menos una persona sana y una infectada.
+    """
+
+    def __init__(self) -> None:
+        self.reiniciar()
+
+    def reiniciar(self) -> None:
+        self.rondas: int = 0
+        self.segundos: dict[str, float] = dict.fromkeys(FASES, 0.0)
+        self.llamadas: dict[str, int] = dict.fromkeys(FASES, 0)
+        self.totales: dict[str, int] = dict.fromkeys(CONTADORES, 0)
+        self.ronda: dict[str, Any] = self._ronda_vacia(0)
+
+    def iniciar_ronda(self, ronda: int) -> None:
+        self.rondas = self.rondas + 1
+        self.ronda = self._ronda_vacia(ronda)
+
+    def medir(self, fase: str, funcion: Callable[[], Any]) -> Any:
+        inicio = time.perf_counter()
+        resultado = funcion()
+        self.registrar(fase, time.perf_counter() - inicio)
+        return resultado
+
+    def registrar(self, fase: str, segundos: float) -> None:
+        self.segundos[fase] = self.segundos[fase] + segundos
+        self.llamadas[fase] = self.llamadas[fase] + 1
+        self.ronda[fase] = self.ronda[fase] + segundos
+
+    def contar_celdas(self, revisadas: int, mixtas: int) -> None:
+        self._contar("celdas_revisadas", revisadas)
+        self._contar("celdas_mixtas", mixtas)
+
+    def contar_infecciones(self, cantidad: int) -> None:
+        self._contar("infecciones", cantidad)
+
+    def ultima_ronda(self) -> dict[str, Any]:
+        # copia: fases en segundos y contadores de la última ronda ejecutada
+        return dict(self.ronda)
+
+    def resumen(self) -> dict[str, Any]:
+        fases = {}
+        for fase in FASES:
+            llamadas = self.llamadas[fase]
+            fases[fase] = {
+                "segundos": self.segundos[fase],
+                "llamadas": llamadas,
+                "promedio_ms": 1000.0 * self.segundos[fase] / llamadas if llamadas > 0 else 0.0,
+            }
+        return {
+            "rondas": self.rondas,
+            "fases": fases,
+            "totales": dict(self.totales),
+            "ultima_ronda": self.ultima_ronda(),
+        }
+
+    def formatear(self) -> str:
+        total = sum(self.segundos.values())
+        lineas = [f"Instrumentación ({self.rondas} rondas)"]
+        for fase in FASES:
+            segundos = self.segundos[fase]
+            llamadas = self.llamadas[fase]
+            promedio = 1000.0 * segundos / llamadas if llamadas > 0 else 0.0
+            porcentaje = 100.0 * segundos / total if total > 0 else 0.0
+            lineas.append(f"  {fase:<16} {segundos:9.4f} s  {llamadas:7d} llamadas  "
+                          f"{promedio:8.3f} ms/llamada  {porcentaje:5.1f}%")
+        lineas.append("  " + "  ".join(f"{nombre}={self.totales[nombre]}" for nombre in CONTADORES))
+        return "\n".join(lineas)
+
+    def _contar(self, nombre: str, cantidad: int) -> None:
+        self.totales[nombre] = self.totales[nombre] + cantidad
+        self.ronda[nombre] = self.ronda[nombre] + cantidad
+
+    def _ronda_vacia(self, ronda: int) -> dict[str, Any]:
+        datos: dict[str, Any] = {"ronda": ronda}
+        datos.update(dict.fromkeys(FASES, 0.0))
+        datos.update(dict.fromkeys(CONTADORES, 0))
+        return datos
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import json
+import time
+from typing import Optional, Any, TextIO
+
+from core.simulador import Simulador
+
+
+COLUMNAS_ESTADISTICAS = ("ronda", "total_personas", "sanas", "infectadas", "profundidad_arbol", "r_efectivo")
+
+
+def motivo_de_fin(simulador: Simulador) -> Optional[str]:
+    if simulador.todas_infectadas():
+        return "todas_infectadas"
+    if simulador.get_cantidad_infectadas() == 0:
+        return "sin_infectadas"
+    return None
+
+
+def simulacion_terminada(simulador: Simulador) -> bool:
+    return motivo_de_fin(simulador) is not None
+
+
+def ejecutar_lote(simulador: Simulador, max_rondas: Optional[int] = None,
+                  salida: Optional[TextIO] = None, formato: str = "csv", cada: int = 1) -> dict[str, Any]:
+    """
+    Ejecuta la simulación sin interfaz hasta llegar a max_rondas o hasta que
+    todas (o ninguna) de las personas estén infectadas. Si se pasa una salida,
+    escribe las estadísticas de la ronda inicial, de cada `cada` rondas y de
+    la última, en CSV o JSON por línea. Sin salida solo se calculan las
+    estadísticas finales. Devuelve un resumen con el motivo de fin y las rondas/s.
+    """
+    if formato not in ("csv", "jsonl"):
+        raise ValueError(f"Formato desconocido: {formato!r} (usa 'csv' o 'jsonl')")
+    if cada < 1:
+        raise ValueError(f"cada debe ser >= 1 (se recibió {cada})")
+
+    if not simulador.esta_inicializada:
+        simulador.inicializar()
+
+    if salida is not None and formato == "csv":
+        salida.write(",".join(COLUMNAS_ESTADISTICAS) + "\n")
+
+    estadisticas = simulador.get_estadisticas()
+    if salida is not None:
+        _escribir_estadisticas(salida, estadisticas, formato)
+
+    # sin salida no hace falta ningún resumen intermedio: iter_rondas entrega igual el último
+    stride = cada if salida is not None else 1 << 62
+    ronda_inicial = simulador.get_ronda_actual()
+    inicio = time.perf_counter()
+
+    for resumen in simulador.iter_rondas(max_rondas, stride=stride, stop_when=simulacion_terminada):
+        estadisticas = resumen._asdict()
+        if salida is not None:
+            _escribir_estadisticas(salida, estadisticas, formato)
+
+    segundos = time.perf_counter() - inicio
+    rondas_ejecutadas = simulador.get_ronda_actual() - ronda_inicial
+    motivo = motivo_de_fin(simulador) or "max_rondas"
+
+    if salida is not None:
+        salida.flush()
+
+    return {
+        'rondas': rondas_ejecutadas,
+        'segundos': segundos,
+        'rondas_por_segundo': rondas_ejecutadas / segundos if segundos > 0 else 0.0,
+        'motivo_fin': motivo,
+        'estadisticas_finales': estadisticas,
+    }
+
+
+def _escribir_estadisticas(salida: TextIO, estadisticas: dict[str, Any], formato: str) -> None:
+    if formato == "csv":
+        valores = [str(estadisticas.get(columna, "")) for columna in COLUMNAS_ESTADISTICAS]
+        salida.write(",".join(valores) + "\n")
+    else:
+        salida.write(json.dumps(estadisticas) + "\n")
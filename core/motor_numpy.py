@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Optional
+
+try:
+    import numpy as np
+except ImportError:  # numpy es opcional: solo lo necesita este motor
+    np = None
+
+from core.eventos import MOVER, DEFENSA, DTYPE_MOVER, DTYPE_DEFENSA
+from core.instrumentacion import Instrumentacion
+
+if TYPE_CHECKING:
+    from core.simulador import Simulador
+
+
+DIRECCIONES = (
+    (-1, -1), (-1, 0), (-1, 1),
+    (0, -1), (0, 1),
+    (1, -1), (1, 0), (1, 1)
+)
+
+
+class MotorNumpy:
+    """
+    Motor vectorizado de rondas. Mantiene posiciones, defensa e infección en
+    arreglos de NumPy y resuelve movimiento y contagio con operaciones sobre
+    arreglos. Los objetos Persona y la Matriz se actualizan de forma perezosa
+    (solo cuando alguien los consulta a través del Simulador).
+    """
+
+    def __init__(self, simulador: Simulador) -> None:
+        if np is None:
+            raise ImportError("El motor 'numpy' requiere instalar numpy (pip install numpy).")
+
+        self.simulador: Simulador = simulador
+        self.rng = simulador.fuente.generador_numpy()
+        self.direcciones = np.array(DIRECCIONES, dtype=np.int64)
+
+        self.x = np.zeros(0, dtype=np.int64)
+        self.y = np.zeros(0, dtype=np.int64)
+        self.defensa = np.zeros(0, dtype=np.int64)
+        self.infectada = np.zeros(0, dtype=bool)
+
+        # arreglos_validos: los arreglos reflejan a las personas
+        # personas_pendientes: las personas aún no reciben lo calculado en los arreglos
+        self.arreglos_validos: bool = False
+        self.personas_pendientes: bool = False
+
+    # ------------------- SINCRONIZACIÓN -------------------
+    def cargar(self) -> None:
+        personas = self.simulador.lista_personas
+        cantidad = len(personas)
+
+        self.x = np.fromiter((p.x for p in personas), dtype=np.int64, count=cantidad)
+        self.y = np.fromiter((p.y for p in personas), dtype=np.int64, count=cantidad)
+        self.defensa = np.fromiter((p.defensa for p in personas), dtype=np.int64, count=cantidad)
+        self.infectada = np.fromiter((p.infectada for p in personas), dtype=bool, count=cantidad)
+
+        self.arreglos_validos = True
+        self.personas_pendientes = False
+
+    def volcar(self) -> None:
+        if not self.personas_pendientes:
+            return
+
+        personas = self.simulador.lista_personas
+        matriz = self.simulador.matriz
+
+        lista_x = self.x.tolist()
+        lista_y = self.y.tolist()
+        lista_defensa = self.defensa.tolist()
+
+        for i, persona in enumerate(personas):
+            persona.defensa = lista_defensa[i]
+            if persona.x != lista_x[i] or persona.y != lista_y[i]:
+                matriz.mover_persona(persona, lista_x[i], lista_y[i])
+
+        self.personas_pendientes = False
+
+    def invalidar(self) -> None:
+        self.arreglos_validos = False
+
+    # ------------------- RONDA -------------------
+    def ejecutar_ronda(self, ronda: int, medicion: Optional[Instrumentacion] = None) -> None:
+        if not self.arreglos_validos:
+            self.cargar()
+
+        if medicion is None:
+            self._mover()
+            self._verificar_contagios()
+            if ronda % 3 == 0:
+                self._aumentar_defensa()
+        else:
+            medicion.medir("movimiento", self._mover)
+            medicion.medir("contagios", self._verificar_contagios)
+            if ronda % 3 == 0:
+                medicion.medir("aumento_defensa", self._aumentar_defensa)
+
+        self.personas_pendientes = True
+
+    def _aumentar_defensa(self) -> None:
+        self.defensa[~self.infectada] += 1
+        if self.simulador.registro_eventos is not None:
+            self.simulador.registro_eventos.aumento_defensa()
+
+    def _mover(self) -> None:
+        cantidad = self.x.shape[0]
+        limite = self.simulador.tamano_matriz - 1
+
+        indices = self.rng.integers(0, len(DIRECCIONES), size=cantidad)
+        pasos = self.direcciones[indices]
+
+        registro = self.simulador.registro_eventos
+        if registro is not None:
+            x_anterior = self.x.copy()
+            y_anterior = self.y.copy()
+
+        # mismo rebote que Matriz.ajustar_coordenadas_rebote: se pega al borde
+        np.clip(self.x + pasos[:, 0], 0, limite, out=self.x)
+        np.clip(self.y + pasos[:, 1], 0, limite, out=self.y)
+
+        if registro is not None:
+            movidas = np.flatnonzero((self.x != x_anterior) | (self.y != y_anterior))
+            lote = np.empty(movidas.size, dtype=DTYPE_MOVER)
+            lote["tipo"] = MOVER
+            lote["persona"] = movidas
+            lote["x"] = self.x[movidas]
+            lote["y"] = self.y[movidas]
+            registro.mover_lote(lote)
+
+    def _verificar_contagios(self) -> None:
+        cantidad = self.x.shape[0]
+        azar = self.rng.random(cantidad)
+
+        if cantidad < 2 or not self.infectada.any() or self.infectada.all():
+            return
+
+        id_celda = self.x * self.simulador.tamano_matriz + self.y
+        _, grupo = np.unique(id_celda, return_inverse=True)
+        grupo = grupo.reshape(-1)
+
+        infectadas_por_celda = np.bincount(grupo, weights=self.infectada).astype(np.int64)
+
+        if self.simulador.instrumentacion is not None:
+            personas_por_celda = np.bincount(grupo)
+            mixtas = np.count_nonzero((infectadas_por_celda > 0) & (personas_por_celda > infectadas_por_celda))
+            self.simulador.instrumentacion.contar_celdas(personas_por_celda.size, int(mixtas))
+
+        sanas_expuestas = ~self.infectada & (infectadas_por_celda[grupo] > 0)
+        if not sanas_expuestas.any():
+            return
+
+        if self.simulador.usar_defensa_multiple:
+            dano = infectadas_por_celda[grupo]
+        else:
+            dano = np.ones(cantidad, dtype=np.int64)
+
+        nueva_defensa = np.maximum(self.defensa - dano, 0)
+        self.defensa = np.where(sanas_expuestas, nueva_defensa, self.defensa)
+
+        registro = self.simulador.registro_eventos
+        if registro is not None:
+            golpeadas = np.flatnonzero(sanas_expuestas)
+            lote = np.empty(golpeadas.size, dtype=DTYPE_DEFENSA)
+            lote["tipo"] = DEFENSA
+            lote["persona"] = golpeadas
+            lote["defensa"] = self.defensa[golpeadas]
+            registro.defensa_lote(lote)
+
+        nuevas_infectadas = np.flatnonzero(sanas_expuestas & (self.defensa == 0))
+        if nuevas_infectadas.size == 0:
+            return
+
+        # infectadas agrupadas por celda, en orden de lista, para elegir al infectador
+        indices_infectadas = np.flatnonzero(self.infectada)
+        orden = np.argsort(grupo[indices_infectadas], kind="stable")
+        infectadas_ordenadas = indices_infectadas[orden]
+        inicio_por_celda = np.cumsum(infectadas_por_celda) - infectadas_por_celda
+
+        grupos_nuevas = grupo[nuevas_infectadas]
+        eleccion = (azar[nuevas_infectadas] * infectadas_por_celda[grupos_nuevas]).astype(np.int64)
+        infectadores = infectadas_ordenadas[inicio_por_celda[grupos_nuevas] + eleccion]
+
+        self.infectada[nuevas_infectadas] = True
+
+        personas = self.simulador.lista_personas
+        arbol = self.simulador.arbol
+        for i, j in zip(nuevas_infectadas.tolist(), infectadores.tolist()):
+            persona_sana = personas[i]
+            infectador_elegido = personas[j]
+            persona_sana.infectar(infectador_elegido)
+            arbol.agregar_contagio(infectador_elegido, persona_sana)
@@ -0,0 +1,421 @@
+from __future__ import annotations
+
+import math
+import multiprocessing
+import os
+import weakref
+from multiprocessing import shared_memory
+from typing import TYPE_CHECKING, Any, Optional
+
+from core.motor_numpy import MotorNumpy, DIRECCIONES, np
+from core.eventos import MOVER, DEFENSA, DTYPE_MOVER, DTYPE_DEFENSA
+
+if TYPE_CHECKING:
+    from core.simulador import Simulador
+
+
+# Columnas de la memoria compartida, en este orden: (nombre, dtype). Las de
+# 8 bytes van primero para que todas queden alineadas.
+COLUMNAS = (
+    ("x", "int64"),
+    ("y", "int64"),
+    ("defensa", "int64"),
+    ("direccion", "int64"),   # índice en DIRECCIONES sorteado para la ronda
+    ("azar", "float64"),      # número de la ronda para elegir infectador
+    ("infectada", "bool"),
+)
+
+
+def dividir_teselas(procesos: int) -> tuple[int, int]:
+    """Filas y columnas de teselas (una por proceso), lo más cuadradas posible."""
+    filas = math.isqrt(procesos)
+    while procesos % filas != 0:
+        filas = filas - 1
+    return filas, procesos // filas
+
+
+def tesela_de(x: Any, y: Any, tamano: int, filas: int, columnas: int) -> Any:
+    # número de tesela de cada celda (x, y); sirve con enteros o con arreglos
+    return (x * filas // tamano) * columnas + (y * columnas // tamano)
+
+
+def _vistas(buffer: Any, capacidad: int) -> dict[str, Any]:
+    vistas = {}
+    desplazamiento = 0
+    for nombre, tipo in COLUMNAS:
+        dtype = np.dtype(tipo)
+        vistas[nombre] = np.ndarray((capacidad,), dtype=dtype, buffer=buffer, offset=desplazamiento)
+        desplazamiento = desplazamiento + capacidad * dtype.itemsize
+    return vistas
+
+
+def _bytes_por_persona() -> int:
+    return sum(np.dtype(tipo).itemsize for _, tipo in COLUMNAS)
+
+
+class MotorTeselas(MotorNumpy):
+    """
+    Motor vectorizado repartido en procesos. La matriz se divide en teselas
+    rectangulares, una por proceso; el estado de las personas vive en
+    arreglos de multiprocessing.shared_memory y cada proceso mueve a las
+    personas de su tesela y resuelve los contagios de sus celdas.
+
+    Al final del movimiento cada proceso devuelve las personas que cruzaron
+    a otra tesela (solo sus índices: el estado ya está en la memoria
+    compartida) y el proceso principal se las pasa a su nueva tesela antes
+    de los contagios. Como una celda pertenece a una sola tesela, los
+    contagios no necesitan nada de las vecinas.
+
+    Los sorteos (dirección y azar de cada persona) los hace el proceso
+    principal con el mismo generador y en el mismo orden que MotorNumpy, y
+    los contagios se aplican al árbol en el mismo orden, así que con la misma
+    semilla los resultados son idénticos a los del motor numpy.
+    """
+
+    def __init__(self, simulador: Simulador, procesos: Optional[int] = None) -> None:
+        super().__init__(simulador)
+
+        if procesos is None:
+            procesos = os.cpu_count() or 1
+        # cada tesela necesita al menos una fila y una columna de la matriz
+        self.procesos: int = max(1, min(procesos, simulador.tamano_matriz))
+        self.filas, self.columnas = dividir_teselas(self.procesos)
+
+        self.direccion = np.zeros(0, dtype=np.int64)
+        self.azar = np.zeros(0, dtype=np.float64)
+
+        # memoria compartida y procesos; el finalizador los libera aunque nadie llame a cerrar
+        self._recursos: dict[str, Any] = {"memoria": None, "procesos": [], "conexiones": []}
+        self._capacidad: int = 0
+        self._entrantes: Optional[list[Any]] = None
+        self._finalizador = weakref.finalize(self, _liberar, self._recursos)
+
+    # ------------------- SINCRONIZACIÓN -------------------
+    def cargar(self) -> None:
+        personas = self.simulador.lista_personas
+        cantidad = len(personas)
+
+        vistas = self._reservar(cantidad)
+        self.x = vistas["x"][:cantidad]
+        self.y = vistas["y"][:cantidad]
+        self.defensa = vistas["defensa"][:cantidad]
+        self.direccion = vistas["direccion"][:cantidad]
+        self.azar = vistas["azar"][:cantidad]
+        self.infectada = vistas["infectada"][:cantidad]
+
+        self.x[:] = np.fromiter((p.x for p in personas), dtype=np.int64, count=cantidad)
+        self.y[:] = np.fromiter((p.y for p in personas), dtype=np.int64, count=cantidad)
+        self.defensa[:] = np.fromiter((p.defensa for p in personas), dtype=np.int64, count=cantidad)
+        self.infectada[:] = np.fromiter((p.infectada for p in personas), dtype=bool, count=cantidad)
+
+        if not self._finalizador.alive:
+            # se había cerrado: vuelve a arrancar con memoria y procesos nuevos
+            self._finalizador = weakref.finalize(self, _liberar, self._recursos)
+        self._iniciar_procesos()
+        # cada proceso vuelve a buscar qué personas están en su tesela
+        self._a_todos(("cargar", self._recursos["memoria"].name, self._capacidad,
+                       cantidad, self.simulador.tamano_matriz))
+        self._entrantes = None
+
+        self.arreglos_validos = True
+        self.personas_pendientes = False
+
+    def cerrar(self) -> None:
+        """Termina los procesos y libera la memoria compartida."""
+        self.arreglos_validos = False
+        self._soltar_vistas()
+        self._finalizador()
+
+    def _reservar(self, cantidad: int) -> dict[str, Any]:
+        # la memoria crece al doble cuando no alcanza (p. ej. tras agregar personas)
+        memoria = self._recursos["memoria"]
+        if memoria is not None and cantidad <= self._capacidad:
+            return _vistas(memoria.buf, self._capacidad)
+
+        capacidad = max(1, cantidad, 2 * self._capacidad)
+        nueva = shared_memory.SharedMemory(create=True, size=capacidad * _bytes_por_persona())
+        self._soltar_vistas()
+        if memoria is not None:
+            # los procesos siguen con la anterior hasta el próximo "cargar": solo se
+            # borra el nombre, el segmento desaparece cuando todos lo cierran
+            memoria.close()
+            memoria.unlink()
+        self._recursos["memoria"] = nueva
+        self._capacidad = capacidad
+        return _vistas(nueva.buf, capacidad)
+
+    def _soltar_vistas(self) -> None:
+        # la memoria compartida no se puede cerrar mientras haya arreglos sobre ella
+        self.x = np.zeros(0, dtype=np.int64)
+        self.y = np.zeros(0, dtype=np.int64)
+        self.defensa = np.zeros(0, dtype=np.int64)
+        self.direccion = np.zeros(0, dtype=np.int64)
+        self.azar = np.zeros(0, dtype=np.float64)
+        self.infectada = np.zeros(0, dtype=bool)
+
+    def _iniciar_procesos(self) -> None:
+        if self._recursos["procesos"]:
+            return
+        # spawn: el proceso principal puede tener hilos (p. ej. la interfaz)
+        contexto = multiprocessing.get_context("spawn")
+        for tesela in range(self.procesos):
+            conexion, extremo_hijo = contexto.Pipe()
+            proceso = contexto.Process(target=_trabajar, args=(extremo_hijo, tesela, self.filas, self.columnas),
+                                       name=f"tesela-{tesela}", daemon=True)
+            proceso.start()
+            extremo_hijo.close()
+            self._recursos["procesos"].append(proceso)
+            self._recursos["conexiones"].append(conexion)
+
+    def _a_todos(self, mensaje: tuple) -> list[Any]:
+        return self._a_cada([mensaje] * self.procesos)
+
+    def _a_cada(self, mensajes: list[tuple]) -> list[Any]:
+        # primero se envía a todos para que trabajen a la vez, después se espera
+        conexiones = self._recursos["conexiones"]
+        for conexion, mensaje in zip(conexiones, mensajes):
+            conexion.send(mensaje)
+        respuestas = []
+        for conexion in conexiones:
+            respuesta = conexion.recv()
+            if isinstance(respuesta, BaseException):
+                raise respuesta
+            respuestas.append(respuesta)
+        return respuestas
+
+    # ------------------- RONDA -------------------
+    def _mover(self) -> None:
+        cantidad = self.x.shape[0]
+        # mismo sorteo que MotorNumpy._mover
+        self.direccion[:] = self.rng.integers(0, len(DIRECCIONES), size=cantidad)
+
+        registro = self.simulador.registro_eventos
+        if registro is not None:
+            x_anterior = self.x.copy()
+            y_anterior = self.y.copy()
+
+        respuestas = self._a_todos(("mover",))
+
+        # quienes cambiaron de tesela, agrupados por la tesela a la que llegan
+        salientes = np.concatenate([s for s, _ in respuestas])
+        destinos = np.concatenate([d for _, d in respuestas])
+        orden = np.argsort(destinos, kind="stable")
+        cortes = np.searchsorted(destinos[orden], np.arange(1, self.procesos))
+        self._entrantes = np.split(salientes[orden], cortes)
+
+        if registro is not None:
+            movidas = np.flatnonzero((self.x != x_anterior) | (self.y != y_anterior))
+            lote = np.empty(movidas.size, dtype=DTYPE_MOVER)
+            lote["tipo"] = MOVER
+            lote["persona"] = movidas
+            lote["x"] = self.x[movidas]
+            lote["y"] = self.y[movidas]
+            registro.mover_lote(lote)
+
+    def _verificar_contagios(self) -> None:
+        cantidad = self.x.shape[0]
+        self.azar[:] = self.rng.random(cantidad)
+
+        entrantes = self._entrantes
+        if entrantes is None:
+            entrantes = [np.zeros(0, dtype=np.int64)] * self.procesos
+        self._entrantes = None
+
+        # mismos casos sin contagios posibles que MotorNumpy (ahí no se cuentan celdas)
+        contagiar = not (cantidad < 2 or not self.infectada.any() or self.infectada.all())
+        multiple = self.simulador.usar_defensa_multiple
+        registro = self.simulador.registro_eventos
+        respuestas = self._a_cada([("contagiar", entrantes[t], contagiar, multiple, registro is not None)
+                                   for t in range(self.procesos)])
+        if not contagiar:
+            return
+
+        if self.simulador.instrumentacion is not None:
+            self.simulador.instrumentacion.contar_celdas(sum(r[2] for r in respuestas),
+                                                         sum(r[3] for r in respuestas))
+
+        if registro is not None:
+            golpeadas = np.sort(np.concatenate([r[4] for r in respuestas]))
+            if golpeadas.size > 0:
+                lote = np.empty(golpeadas.size, dtype=DTYPE_DEFENSA)
+                lote["tipo"] = DEFENSA
+                lote["persona"] = golpeadas
+                lote["defensa"] = self.defensa[golpeadas]
+                registro.defensa_lote(lote)
+
+        nuevas_infectadas = np.concatenate([r[0] for r in respuestas])
+        if nuevas_infectadas.size == 0:
+            return
+        infectadores = np.concatenate([r[1] for r in respuestas])
+        # en orden de lista, como MotorNumpy, para que el árbol quede igual
+        orden = np.argsort(nuevas_infectadas, kind="stable")
+
+        personas = self.simulador.lista_personas
+        arbol = self.simulador.arbol
+        for i, j in zip(nuevas_infectadas[orden].tolist(), infectadores[orden].tolist()):
+            persona_sana = personas[i]
+            infectador_elegido = personas[j]
+            persona_sana.infectar(infectador_elegido)
+            arbol.agregar_contagio(infectador_elegido, persona_sana)
+
+    def _aumentar_defensa(self) -> None:
+        self._a_todos(("defensa",))
+        if self.simulador.registro_eventos is not None:
+            self.simulador.registro_eventos.aumento_defensa()
+
+
+def _liberar(recursos: dict[str, Any]) -> None:
+    for conexion in recursos["conexiones"]:
+        try:
+            conexion.send(("fin",))
+        except (OSError, EOFError):
+            pass
+    for proceso in recursos["procesos"]:
+        proceso.join(timeout=5)
+        if proceso.is_alive():
+            proceso.terminate()
+    for conexion in recursos["conexiones"]:
+        conexion.close()
+    recursos["procesos"] = []
+    recursos["conexiones"] = []
+
+    memoria = recursos["memoria"]
+    if memoria is not None:
+        try:
+            memoria.close()
+        except BufferError:
+            # quedan arreglos sobre ella (p. ej. al salir del intérprete): basta con borrar el nombre
+            pass
+        memoria.unlink()
+        recursos["memoria"] = None
+
+
+# ------------------- PROCESO DE UNA TESELA -------------------
+def _trabajar(conexion: Any, tesela: int, filas: int, columnas: int) -> None:
+    estado: dict[str, Any] = {"memoria": None, "vistas": None, "miembros": None, "tamano": 0}
+    direcciones = np.array(DIRECCIONES, dtype=np.int64)
+    try:
+        while True:
+            mensaje = conexion.recv()
+            orden = mensaje[0]
+            if orden == "fin":
+                break
+            try:
+                if orden == "cargar":
+                    respuesta = _cargar_tesela(estado, tesela, filas, columnas, *mensaje[1:])
+                elif orden == "mover":
+                    respuesta = _mover_tesela(estado, tesela, filas, columnas, direcciones)
+                elif orden == "contagiar":
+                    respuesta = _contagiar_tesela(estado, *mensaje[1:])
+                elif orden == "defensa":
+                    respuesta = _aumentar_defensa_tesela(estado)
+                else:
+                    respuesta = ValueError(f"Orden desconocida: {orden!r}")
+            except Exception as error:  # se devuelve para que lo lance el proceso principal
+                respuesta = error
+            conexion.send(respuesta)
+    finally:
+        estado["vistas"] = None
+        estado["miembros"] = None
+        if estado["memoria"] is not None:
+            estado["memoria"].close()
+        conexion.close()
+
+
+def _cargar_tesela(estado: dict[str, Any], tesela: int, filas: int, columnas: int,
+                   nombre: str, capacidad: int, cantidad: int, tamano: int) -> None:
+    memoria = estado["memoria"]
+    if memoria is None or memoria.name != nombre:
+        estado["vistas"] = None
+        if memoria is not None:
+            memoria.close()
+        # con spawn los procesos comparten el rastreador de recursos del principal,
+        # que es quien crea y borra la memoria
+        memoria = shared_memory.SharedMemory(name=nombre)
+        estado["memoria"] = memoria
+
+    vistas = {clave: vista[:cantidad] for clave, vista in _vistas(memoria.buf, capacidad).items()}
+    estado["vistas"] = vistas
+    estado["tamano"] = tamano
+    estado["miembros"] = np.flatnonzero(tesela_de(vistas["x"], vistas["y"], tamano, filas, columnas) == tesela)
+    return None
+
+
+def _mover_tesela(estado: dict[str, Any], tesela: int, filas: int, columnas: int,
+                  direcciones: Any) -> tuple[Any, Any]:
+    vistas = estado["vistas"]
+    miembros = estado["miembros"]
+    limite = estado["tamano"] - 1
+    x, y = vistas["x"], vistas["y"]
+
+    pasos = direcciones[vistas["direccion"][miembros]]
+    # mismo rebote que Matriz.ajustar_coordenadas_rebote: se pega al borde
+    nuevas_x = np.clip(x[miembros] + pasos[:, 0], 0, limite)
+    nuevas_y = np.clip(y[miembros] + pasos[:, 1], 0, limite)
+    x[miembros] = nuevas_x
+    y[miembros] = nuevas_y
+
+    destino = tesela_de(nuevas_x, nuevas_y, estado["tamano"], filas, columnas)
+    sale = destino != tesela
+    estado["miembros"] = miembros[~sale]
+    return miembros[sale], destino[sale]
+
+
+def _contagiar_tesela(estado: dict[str, Any], entrantes: Any, contagiar: bool,
+                      multiple: bool, registrar: bool) -> Optional[tuple]:
+    # los que se quedaron ya están en orden; ordenar con los que llegaron es casi lineal
+    miembros = np.sort(np.concatenate((estado["miembros"], entrantes)), kind="stable")
+    estado["miembros"] = miembros
+    if not contagiar:
+        return None
+
+    vistas = estado["vistas"]
+    vacio = np.zeros(0, dtype=np.int64)
+    # mismas cuentas que MotorNumpy._verificar_contagios, sobre las celdas de la tesela
+    infectada = vistas["infectada"][miembros]
+    id_celda = vistas["x"][miembros] * estado["tamano"] + vistas["y"][miembros]
+    _, grupo = np.unique(id_celda, return_inverse=True)
+    grupo = grupo.reshape(-1)
+
+    infectadas_por_celda = np.bincount(grupo, weights=infectada).astype(np.int64)
+    personas_por_celda = np.bincount(grupo)
+    celdas = int(personas_por_celda.size)
+    mixtas = int(np.count_nonzero((infectadas_por_celda > 0) & (personas_por_celda > infectadas_por_celda)))
+
+    sanas_expuestas = ~infectada & (infectadas_por_celda[grupo] > 0)
+    if not sanas_expuestas.any():
+        return vacio, vacio, celdas, mixtas, vacio
+
+    if multiple:
+        dano = infectadas_por_celda[grupo]
+    else:
+        dano = 1
+    defensa = vistas["defensa"][miembros]
+    defensa = np.where(sanas_expuestas, np.maximum(defensa - dano, 0), defensa)
+    vistas["defensa"][miembros] = defensa
+    golpeadas = miembros[sanas_expuestas] if registrar else vacio
+
+    nuevas = np.flatnonzero(sanas_expuestas & (defensa == 0))
+    if nuevas.size == 0:
+        return vacio, vacio, celdas, mixtas, golpeadas
+
+    # miembros está ordenado: las infectadas de cada celda quedan en orden de lista
+    indices_infectadas = np.flatnonzero(infectada)
+    orden = np.argsort(grupo[indices_infectadas], kind="stable")
+    infectadas_ordenadas = indices_infectadas[orden]
+    inicio_por_celda = np.cumsum(infectadas_por_celda) - infectadas_por_celda
+
+    grupos_nuevas = grupo[nuevas]
+    eleccion = (vistas["azar"][miembros[nuevas]] * infectadas_por_celda[grupos_nuevas]).astype(np.int64)
+    infectadores = infectadas_ordenadas[inicio_por_celda[grupos_nuevas] + eleccion]
+
+    vistas["infectada"][miembros[nuevas]] = True
+    return miembros[nuevas], miembros[infectadores], celdas, mixtas, golpeadas
+
+
+def _aumentar_defensa_tesela(estado: dict[str, Any]) -> None:
+    vistas = estado["vistas"]
+    miembros = estado["miembros"]
+    sanas = miembros[~vistas["infectada"][miembros]]
+    vistas["defensa"][sanas] += 1
+    return None
@@ -1,40 +1,99 @@
 from __future__ import annotations  
 
-import random
-from typing import Optional, Any
+from typing import Optional, Any, Callable, Iterator, NamedTuple
 
 from models.persona import Persona
 from models.nodo_arbol import NodoArbol
 from models.matriz import Matriz
+from models.matriz_dispersa import MatrizDispersa
 from models.arbol_contagio import ArbolContagio
+from core.motor_numpy import MotorNumpy, np
+from core.motor_teselas import MotorTeselas
+from core.aleatorio import Fuente, crear_fuente
+from core.eventos import RegistroEventos
+from core.trayectorias import GrabadorTrayectorias
+from core.instrumentacion import Instrumentacion
+
+
+class ResumenRonda(NamedTuple):
+    # mismas claves que get_estadisticas (ver _asdict), sin armar un dict por ronda
+    ronda: int
+    total_personas: int
+    sanas: int
+    infectadas: int
+    profundidad_arbol: int
+    r_efectivo: float
+
 
-    
 class Simulador:
 
     def __init__(self, tamano_matriz: int, cantidad_personas: int,
                  defensa_inicial: int = 3, semilla_aleatoria: Optional[int] = None,
-                 usar_defensa_multiple: bool = False) -> None:
+                 usar_defensa_multiple: bool = False, motor: str = "clasico",
+                 tipo_matriz: str = "densa", generador: str = "random",
+                 fuente: Optional[Fuente] = None, procesos: Optional[int] = None) -> None:
+
+        if motor not in ("clasico", "numpy", "teselas"):
+            raise ValueError(f"Motor desconocido: {motor!r} (usa 'clasico', 'numpy' o 'teselas')")
+        if tipo_matriz not in ("densa", "dispersa"):
+            raise ValueError(f"Tipo de matriz desconocido: {tipo_matriz!r} (usa 'densa' o 'dispersa')")
 
         self.tamano_matriz: int = tamano_matriz
         self.cantidad_personas_inicial: int = cantidad_personas
         self.defensa_inicial: int = defensa_inicial
         self.semilla_aleatoria: Optional[int] = semilla_aleatoria
         self.usar_defensa_multiple: bool = usar_defensa_multiple
-
-        if self.semilla_aleatoria is not None:
-            random.seed(self.semilla_aleatoria)
-
-        self.matriz: Matriz = Matriz(tamano_matriz)
+        self.motor: str = motor
+        self.tipo_matriz: str = tipo_matriz
+        self.procesos: Optional[int] = procesos
+
+        # Cada simulador tiene su propio generador (nunca el módulo global random).
+        # Se puede inyectar uno ya creado, p. ej. un flujo hijo de un ensamble.
+        if fuente is None:
+            fuente = crear_fuente(semilla_aleatoria, generador)
+        self.fuente: Fuente = fuente
+
+        if tipo_matriz == "dispersa":
+            self.matriz: Matriz = MatrizDispersa(tamano_matriz)
+        else:
+            self.matriz = Matriz(tamano_matriz)
         self.arbol: ArbolContagio = ArbolContagio()
         self.lista_personas: list[Persona] = []
         self.ronda_actual: int = 0
         self.contador_personas: int = 0
         self.esta_inicializada: bool = False
 
-    def inicializar(self) -> None:
-        if self.semilla_aleatoria is not None:
-            random.seed(self.semilla_aleatoria)
+        # Contadores en vivo (los actualiza Persona.al_cambiar_estado) y vistas
+        # cacheadas que se reconstruyen solo cuando cambia version_poblacion.
+        self.cantidad_infectadas: int = 0
+        self.version_poblacion: int = 0
+        self._vista_sanas: list[Persona] = []
+        self._version_vista_sanas: int = -1
+        self._vista_infectadas: list[Persona] = []
+        self._version_vista_infectadas: int = -1
+        # Posiciones en lista_personas que cambiaron fuera de las rondas desde
+        # el último tomar_cambios; None = no se sabe, hay que mirarlas todas
+        self._cambios: Optional[set[int]] = None
+        self._posicion_de: dict[str, int] = {}
+        # Infectadas al empezar la última ronda y contagios durante ella (para r_efectivo)
+        self.infectadas_inicio_ronda: int = 0
+        self.contagios_ultima_ronda: int = 0
+
+        # Registro binario de eventos (opcional, ver grabar_eventos)
+        self.registro_eventos: Optional[RegistroEventos] = None
+        # Trayectorias en un numpy.memmap (opcional, ver grabar_trayectorias)
+        self.grabador_trayectorias: Optional[GrabadorTrayectorias] = None
+        # Tiempos y contadores por fase (opcional, ver activar_instrumentacion)
+        self.instrumentacion: Optional[Instrumentacion] = None
+
+        self.motor_numpy: Optional[MotorNumpy] = None
+        if motor == "numpy":
+            self.motor_numpy = MotorNumpy(self)
+        elif motor == "teselas":
+            # mismo motor vectorizado, repartido en `procesos` procesos (por defecto uno por núcleo)
+            self.motor_numpy = MotorTeselas(self, procesos)
 
+    def inicializar(self) -> None:
         self._generar_personas_aleatorias()
         self._seleccionar_paciente_cero()
         self.esta_inicializada = True
@@ -43,24 +102,188 @@ class Simulador:
         if not self.esta_inicializada:
             return {}
 
-        self.ronda_actual = self.ronda_actual + 1
-
-        self._mover_todas_personas()
-        self._verificar_contagios()
+        self._avanzar_ronda()
 
-        if self.ronda_actual % 3 == 0:
-            self._aplicar_aumento_defensa()
+        medicion = self.instrumentacion
+        if medicion is None:
+            estadisticas = self.get_estadisticas()
+        else:
+            estadisticas = medicion.medir("estadisticas", self.get_estadisticas)
+            # get_estadisticas ya copió la ronda; solo falta el tiempo de su propia fase
+            estadisticas['instrumentacion']['estadisticas'] = medicion.ronda['estadisticas']
+        self._cerrar_ronda(estadisticas)
 
-        estadisticas = self.get_estadisticas()
         return estadisticas
 
+    def ejecutar_rondas(self, cantidad: int) -> None:
+        """
+        Avanza `cantidad` rondas sin armar estadísticas. Solo se hace trabajo
+        extra por ronda si hay una grabación activa (eventos o trayectorias).
+        """
+        if not self.esta_inicializada:
+            return
+        for _ in range(cantidad):
+            self._avanzar_ronda()
+            self._cerrar_ronda()
+
+    def iter_rondas(self, max_rondas: Optional[int] = None, stride: int = 1,
+                    stop_when: Optional[Callable[[Simulador], bool]] = None) -> Iterator[ResumenRonda]:
+        """
+        Ejecuta rondas a demanda y entrega un ResumenRonda cada `stride`
+        rondas. Termina al llegar a max_rondas (None = sin límite) o cuando
+        stop_when(simulador) es verdadero, que se evalúa antes de empezar y
+        después de cada ronda; la última ronda ejecutada siempre se entrega.
+        """
+        if stride < 1:
+            raise ValueError(f"stride debe ser >= 1 (se recibió {stride})")
+        if not self.esta_inicializada or (stop_when is not None and stop_when(self)):
+            return
+
+        ejecutadas = 0
+        while max_rondas is None or ejecutadas < max_rondas:
+            self._avanzar_ronda()
+            self._cerrar_ronda()
+            ejecutadas = ejecutadas + 1
+
+            detener = stop_when is not None and stop_when(self)
+            if detener or ejecutadas % stride == 0 or ejecutadas == max_rondas:
+                if self.instrumentacion is None:
+                    yield self.resumen_ronda()
+                else:
+                    yield self.instrumentacion.medir("estadisticas", self.resumen_ronda)
+            if detener:
+                return
+
+    def _avanzar_ronda(self) -> None:
+        self.ronda_actual = self.ronda_actual + 1
+        infectadas_antes = self.cantidad_infectadas
+        # una ronda mueve a casi todas: no vale la pena anotar cuáles
+        self._cambios = None
+
+        if self.instrumentacion is not None:
+            self._avanzar_ronda_medida(self.instrumentacion)
+        elif self.motor_numpy is not None:
+            self.motor_numpy.ejecutar_ronda(self.ronda_actual)
+        else:
+            self._mover_todas_personas()
+            self._verificar_contagios()
+
+            if self.ronda_actual % 3 == 0:
+                self._aplicar_aumento_defensa()
+
+        # durante la ronda nadie se cura: la diferencia son los contagios nuevos
+        self.infectadas_inicio_ronda = infectadas_antes
+        self.contagios_ultima_ronda = self.cantidad_infectadas - infectadas_antes
+        if self.instrumentacion is not None:
+            self.instrumentacion.contar_infecciones(self.contagios_ultima_ronda)
+
+    def _avanzar_ronda_medida(self, medicion: Instrumentacion) -> None:
+        # mismas fases que _avanzar_ronda, cronometradas una por una
+        medicion.iniciar_ronda(self.ronda_actual)
+
+        if self.motor_numpy is not None:
+            self.motor_numpy.ejecutar_ronda(self.ronda_actual, medicion)
+        else:
+            medicion.medir("movimiento", self._mover_todas_personas)
+            medicion.medir("contagios", self._verificar_contagios)
+
+            if self.ronda_actual % 3 == 0:
+                medicion.medir("aumento_defensa", self._aplicar_aumento_defensa)
+
+    def _cerrar_ronda(self, estadisticas: Optional[dict[str, Any]] = None) -> None:
+        # las grabaciones necesitan cada ronda; sin ellas no se hace nada
+        if self.registro_eventos is not None:
+            self.registro_eventos.ronda(estadisticas if estadisticas is not None else self.get_estadisticas())
+        if self.grabador_trayectorias is not None:
+            self._grabar_trayectoria()
+
+    # ------------------- REGISTRO DE EVENTOS -------------------
+    def grabar_eventos(self, ruta: str) -> None:
+        """
+        Empieza a escribir en `ruta` un registro binario de la simulación:
+        primero el estado actual (personas e infecciones) y luego, ronda a
+        ronda, movimientos, golpes de defensa, contagios, curas y altas.
+        """
+        self.detener_grabacion()
+        registro = RegistroEventos(ruta, self.tamano_matriz)
+
+        personas = self.get_personas()
+        for persona in personas:
+            registro.agregar(persona.id, persona.x, persona.y, persona.defensa)
+        for persona in personas:
+            if persona.esta_infectada():
+                infectador = persona.infectador if persona.infectador is not None else persona
+                registro.infeccion(persona.id, infectador.id)
+
+        registro.ronda(self.get_estadisticas())
+        self.registro_eventos = registro
+
+    def detener_grabacion(self) -> None:
+        if self.registro_eventos is not None:
+            self.registro_eventos.cerrar()
+            self.registro_eventos = None
+
+    def liberar_motor(self) -> None:
+        """
+        Con el motor "teselas", termina sus procesos y libera la memoria
+        compartida (la siguiente ronda los vuelve a crear). Con los demás no
+        hace nada.
+        """
+        if isinstance(self.motor_numpy, MotorTeselas):
+            self.motor_numpy.volcar()
+            self.motor_numpy.cerrar()
+
+    # ------------------- INSTRUMENTACIÓN -------------------
+    def activar_instrumentacion(self) -> Instrumentacion:
+        """
+        Empieza a medir el tiempo de cada fase de la ronda (movimiento,
+        contagios, aumento de defensa, estadísticas) y a contar celdas
+        revisadas, celdas mixtas e infecciones. Mientras está activa,
+        ejecutar_ronda agrega la ronda medida bajo la clave 'instrumentacion'.
+        """
+        if self.instrumentacion is None:
+            self.instrumentacion = Instrumentacion()
+        return self.instrumentacion
+
+    def desactivar_instrumentacion(self) -> None:
+        self.instrumentacion = None
+
+    def get_instrumentacion(self) -> Optional[dict[str, Any]]:
+        return self.instrumentacion.resumen() if self.instrumentacion is not None else None
+
+    # ------------------- TRAYECTORIAS -------------------
+    def grabar_trayectorias(self, ruta: str, capacidad_rondas: int = 1024) -> None:
+        """
+        Empieza a guardar en `ruta` (numpy.memmap) la posición, defensa e
+        infección de cada persona al final de cada ronda, empezando por el
+        estado actual. Se lee con core.trayectorias.LectorTrayectorias.
+        """
+        self.detener_trayectorias()
+        self.grabador_trayectorias = GrabadorTrayectorias(ruta, len(self.lista_personas),
+                                                          self.ronda_actual, capacidad_rondas)
+        self._grabar_trayectoria()
+
+    def detener_trayectorias(self) -> None:
+        if self.grabador_trayectorias is not None:
+            self.grabador_trayectorias.cerrar()
+            self.grabador_trayectorias = None
+
+    def _grabar_trayectoria(self) -> None:
+        motor = self.motor_numpy
+        if motor is not None and motor.arreglos_validos:
+            # los arreglos del motor ya tienen el estado: no hace falta volcar
+            self.grabador_trayectorias.agregar_ronda(self.lista_personas, motor.x, motor.y,
+                                                     motor.defensa, motor.infectada)
+        else:
+            self.grabador_trayectorias.agregar_personas(self.lista_personas)
+
     def _generar_personas_aleatorias(self) -> None:
         posiciones_ocupadas = set()
 
         for i in range(self.cantidad_personas_inicial):
             while True:
-                x_aleatorio = random.randint(0, self.tamano_matriz - 1)
-                y_aleatorio = random.randint(0, self.tamano_matriz - 1)
+                x_aleatorio = self.fuente.randint(0, self.tamano_matriz - 1)
+                y_aleatorio = self.fuente.randint(0, self.tamano_matriz - 1)
 
                 posicion = (x_aleatorio, y_aleatorio)
 
@@ -73,15 +296,46 @@ class Simulador:
 
             persona_nueva = Persona(id_persona, x_aleatorio, y_aleatorio, self.defensa_inicial)
             self.matriz.agregar_persona(persona_nueva)
-            self.lista_personas.append(persona_nueva)
+            self._registrar_persona(persona_nueva)
+
+    def _registrar_persona(self, persona: Persona) -> None:
+        persona.al_cambiar_estado = self._al_cambiar_estado
+        self.lista_personas.append(persona)
+
+        if persona.esta_infectada():
+            self.cantidad_infectadas = self.cantidad_infectadas + 1
+
+        self.version_poblacion = self.version_poblacion + 1
+
+    def _al_cambiar_estado(self, persona: Persona, infectada: bool) -> None:
+        if infectada:
+            self.cantidad_infectadas = self.cantidad_infectadas + 1
+        else:
+            self.cantidad_infectadas = self.cantidad_infectadas - 1
+
+        self.version_poblacion = self.version_poblacion + 1
+        if self._cambios is not None and persona.id in self._posicion_de:
+            # las agregadas desde el último tomar_cambios no figuran: ya se informan como nuevas
+            self._cambios.add(self._posicion_de[persona.id])
+
+        # Todas las infecciones y curas (motor, árbol, menú o clics en la
+        # interfaz) pasan por aquí, así que se registran en un solo lugar.
+        if self.registro_eventos is not None:
+            if infectada:
+                infectador = persona.infectador if persona.infectador is not None else persona
+                self.registro_eventos.infeccion(persona.id, infectador.id)
+            else:
+                self.registro_eventos.cura(persona.id)
 
     def _seleccionar_paciente_cero(self) -> None:
-        paciente_cero = random.choice(self.lista_personas)
+        paciente_cero = self.fuente.choice(self.lista_personas)
         paciente_cero.infectar(paciente_cero)
         self.arbol.establecer_paciente_cero(paciente_cero)
 
     def _mover_todas_personas(self) -> None:
-        for persona in self.lista_personas:
+        registro = self.registro_eventos
+
+        for indice, persona in enumerate(self.lista_personas):
             dx, dy = self._obtener_direccion_aleatoria()
 
             x_actual, y_actual = persona.get_posicion()
@@ -90,6 +344,9 @@ class Simulador:
 
             self.matriz.mover_persona(persona, x_nueva, y_nueva)
 
+            if registro is not None and (persona.x != x_actual or persona.y != y_actual):
+                registro.mover(indice, persona.x, persona.y)
+
     def _obtener_direccion_aleatoria(self) -> tuple[int, int]:
         lista_direcciones = [
             (-1, -1), (-1, 0), (-1, 1),
@@ -97,19 +354,45 @@ class Simulador:
             (1, -1), (1, 0), (1, 1)
         ]
 
-        direccion_elegida = random.choice(lista_direcciones)
+        direccion_elegida = self.fuente.choice(lista_direcciones)
         return direccion_elegida
 
     def _verificar_contagios(self) -> None:
-        celdas_ocupadas = self.matriz.get_celdas_ocupadas()
+        # Agrupa a las personas por id lineal de celda en una sola pasada sobre
+        # la población, contando de una vez cuántas infectadas hay en cada celda.
+        tamano = self.tamano_matriz
+        personas_por_celda: dict[int, list[Persona]] = {}
+        infectadas_por_celda: dict[int, int] = {}
 
-        for x, y in celdas_ocupadas:
-            if self.matriz.hay_multiple_personas(x, y):
-                self._procesar_celda_con_cruces(x, y)
+        for persona in self.lista_personas:
+            id_celda = persona.x * tamano + persona.y
 
-    def _procesar_celda_con_cruces(self, x: int, y: int) -> None:
-        personas_en_celda = self.matriz.obtener_personas_en(x, y)
+            personas_celda = personas_por_celda.get(id_celda)
+            if personas_celda is None:
+                personas_por_celda[id_celda] = [persona]
+            else:
+                personas_celda.append(persona)
+
+            if persona.infectada:
+                infectadas_por_celda[id_celda] = infectadas_por_celda.get(id_celda, 0) + 1
+
+        celdas_mixtas = []
+        for id_celda, cantidad_infectadas in infectadas_por_celda.items():
+            if len(personas_por_celda[id_celda]) > cantidad_infectadas:
+                celdas_mixtas.append(id_celda)
 
+        # mismo orden (fila por fila) que el recorrido de la matriz
+        celdas_mixtas.sort()
+
+        for id_celda in celdas_mixtas:
+            self._procesar_celda_con_cruces(personas_por_celda[id_celda],
+                                            infectadas_por_celda[id_celda])
+
+        if self.instrumentacion is not None:
+            self.instrumentacion.contar_celdas(len(personas_por_celda), len(celdas_mixtas))
+
+    def _procesar_celda_con_cruces(self, personas_en_celda: list[Persona],
+                                   cantidad_infectadas: int) -> None:
         lista_sanas = []
         lista_infectadas = []
 
@@ -119,29 +402,40 @@ class Simulador:
             else:
                 lista_sanas.append(persona)
 
-        cantidad_sanas = len(lista_sanas)
-        cantidad_infectadas = len(lista_infectadas)
+        for persona_sana in lista_sanas:
 
-        if cantidad_sanas > 0 and cantidad_infectadas > 0:
-            for persona_sana in lista_sanas:
-
-                if self.usar_defensa_multiple:
-                    for i in range(cantidad_infectadas):
-                        persona_sana.reducir_defensa()
-                else:
+            if self.usar_defensa_multiple:
+                for i in range(cantidad_infectadas):
                     persona_sana.reducir_defensa()
+            else:
+                persona_sana.reducir_defensa()
 
-                if persona_sana.defensa == 0 and not persona_sana.esta_infectada():
-                    infectador_elegido = random.choice(lista_infectadas)
-                    persona_sana.infectar(infectador_elegido)
-                    self.arbol.agregar_contagio(infectador_elegido, persona_sana)
+            if self.registro_eventos is not None:
+                self.registro_eventos.defensa(persona_sana.id, persona_sana.defensa)
+
+            if persona_sana.defensa == 0 and not persona_sana.esta_infectada():
+                infectador_elegido = self.fuente.choice(lista_infectadas)
+                persona_sana.infectar(infectador_elegido)
+                self.arbol.agregar_contagio(infectador_elegido, persona_sana)
 
     def _aplicar_aumento_defensa(self) -> None:
         for persona in self.lista_personas:
             if not persona.esta_infectada():
                 persona.aumentar_defensa()
 
+        if self.registro_eventos is not None:
+            self.registro_eventos.aumento_defensa()
+
+    def _sincronizar_personas(self) -> None:
+        # Con el motor numpy, las personas y la matriz se actualizan solo cuando
+        # alguien los consulta. Quien los recibe puede modificarlos, así que los
+        # arreglos se recargan en la siguiente ronda.
+        if self.motor_numpy is not None:
+            self.motor_numpy.volcar()
+            self.motor_numpy.invalidar()
+
     def curar_persona(self, x: int, y: int) -> bool:
+        self._sincronizar_personas()
         personas_en_celda = self.matriz.obtener_personas_en(x, y)
 
         for persona in personas_en_celda:
@@ -152,24 +446,26 @@ class Simulador:
         return False
 
     def agregar_persona(self, x: int, y: int) -> bool:
+        self._sincronizar_personas()
         self.contador_personas = self.contador_personas + 1
         id_nuevo = f"p{self.contador_personas}"
 
         persona_nueva = Persona(id_nuevo, x, y, self.defensa_inicial)
         self.matriz.agregar_persona(persona_nueva)
-        self.lista_personas.append(persona_nueva)
+        self._registrar_persona(persona_nueva)
+
+        if self.registro_eventos is not None:
+            self.registro_eventos.agregar(persona_nueva.id, persona_nueva.x,
+                                          persona_nueva.y, persona_nueva.defensa)
 
         return True
 
     def todas_infectadas(self) -> bool:
-        for persona in self.lista_personas:
-            if not persona.esta_infectada():
-                return False
-        return True
+        return self.cantidad_infectadas == len(self.lista_personas)
 
     def get_estadisticas(self) -> dict[str, Any]:
         cantidad_total = len(self.lista_personas)
-        cantidad_infectadas = len(self.arbol.get_infectados())
+        cantidad_infectadas = self.cantidad_infectadas
         cantidad_sanas = cantidad_total - cantidad_infectadas
         profundidad_arbol = self.arbol.get_profundidad()
 
@@ -178,31 +474,114 @@ class Simulador:
             'total_personas': cantidad_total,
             'sanas': cantidad_sanas,
             'infectadas': cantidad_infectadas,
-            'profundidad_arbol': profundidad_arbol
+            'profundidad_arbol': profundidad_arbol,
+            'r_efectivo': self.get_r_efectivo()
         }
 
+        if self.instrumentacion is not None:
+            estadisticas['instrumentacion'] = self.instrumentacion.ultima_ronda()
+
         return estadisticas
 
+    def resumen_ronda(self) -> ResumenRonda:
+        cantidad_total = len(self.lista_personas)
+        return ResumenRonda(self.ronda_actual, cantidad_total, cantidad_total - self.cantidad_infectadas,
+                            self.cantidad_infectadas, self.arbol.get_profundidad(), self.get_r_efectivo())
+
+    def get_densidad_celdas(self) -> tuple[Any, Any]:
+        """
+        Personas sanas e infectadas por celda, como dos arreglos de numpy
+        tamano x tamano indexados [x, y]. Con el motor numpy se calcula desde
+        sus arreglos, sin volcar el estado a las personas.
+        """
+        if np is None:
+            raise ImportError("La densidad por celda requiere instalar numpy (pip install numpy).")
+
+        n = self.tamano_matriz
+        motor = self.motor_numpy
+        if motor is not None and motor.arreglos_validos:
+            celdas = motor.x * n + motor.y
+            infectada = motor.infectada
+        else:
+            personas = self.lista_personas
+            celdas = np.fromiter((p.x * n + p.y for p in personas), dtype=np.int64, count=len(personas))
+            infectada = np.fromiter((p.infectada for p in personas), dtype=bool, count=len(personas))
+
+        total = np.bincount(celdas, minlength=n * n)
+        infectadas = np.bincount(celdas[infectada], minlength=n * n)
+        return (total - infectadas).reshape(n, n), infectadas.reshape(n, n)
+
+    def get_r_efectivo(self) -> float:
+        # contagios de la última ronda por cada persona infectada al empezar la ronda
+        if self.infectadas_inicio_ronda == 0:
+            return 0.0
+        return self.contagios_ultima_ronda / self.infectadas_inicio_ronda
+
     def get_ronda_actual(self) -> int:
         return self.ronda_actual
 
     def get_matriz(self) -> Matriz:
+        self._sincronizar_personas()
         return self.matriz
 
     def get_arbol(self) -> ArbolContagio:
+        self._sincronizar_personas()
         return self.arbol
 
     def get_personas(self) -> list[Persona]:
+        self._sincronizar_personas()
         return self.lista_personas
 
+    def tomar_cambios(self) -> Optional[list[int]]:
+        """
+        Posiciones en lista_personas cuya posición, defensa o infección cambió
+        desde la llamada anterior (curas, clics en la interfaz), ordenadas. Las
+        agregadas no se cuentan: quedan al final de la lista. Devuelve None si
+        hay que compararlas todas: la primera vez y después de cada ronda.
+        """
+        if self.motor_numpy is not None:
+            # lo que quedó de la última ronda llega a las personas antes de
+            # empezar a anotar, así no pasa por un cambio sin informar
+            self.motor_numpy.volcar()
+        cambios = self._cambios
+        self._cambios = set()
+
+        # las personas nunca se quitan de la lista: solo faltan las agregadas
+        posicion_de = self._posicion_de
+        personas = self.lista_personas
+        for i in range(len(posicion_de), len(personas)):
+            posicion_de[personas[i].id] = i
+
+        return sorted(cambios) if cambios is not None else None
+
+    def get_cantidad_sanas(self) -> int:
+        return len(self.lista_personas) - self.cantidad_infectadas
+
+    def get_cantidad_infectadas(self) -> int:
+        return self.cantidad_infectadas
+
+    # Las vistas se comparten entre llamadas mientras no cambie la población:
+    # no deben modificarse.
     def get_personas_sanas(self) -> list[Persona]:
-        lista_sanas = []
-        for persona in self.lista_personas:
-            if not persona.esta_infectada():
-                lista_sanas.append(persona)
-        return lista_sanas
+        self._sincronizar_personas()
+
+        if self._version_vista_sanas != self.version_poblacion:
+            lista_sanas = []
+            for persona in self.lista_personas:
+                if not persona.esta_infectada():
+                    lista_sanas.append(persona)
+            self._vista_sanas = lista_sanas
+            self._version_vista_sanas = self.version_poblacion
+
+        return self._vista_sanas
 
     def get_personas_infectadas(self) -> list[Persona]:
-        return self.arbol.get_infectados()
+        self._sincronizar_personas()
+
+        if self._version_vista_infectadas != self.version_poblacion:
+            self._vista_infectadas = self.arbol.get_infectados()
+            self._version_vista_infectadas = self.version_poblacion
+
+        return self._vista_infectadas
 
 
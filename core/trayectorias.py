@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import os
+import struct
+from typing import Union, Any
+
+try:
+    import numpy as np
+except ImportError:  # numpy es opcional: solo lo necesitan las trayectorias
+    np = None
+
+
+# Archivo: encabezado de 64 bytes + matriz (rondas x personas) de registros
+# empaquetados, ronda por ronda. Las personas que aún no existían en una ronda
+# quedan con x = y = -1. Los ids van aparte, uno por línea, en <ruta>.ids.
+MAGIA = b"REVTRAY1"
+VERSION = 1
+_ENCABEZADO = struct.Struct("<8sIIQQQ")  # magia, versión, cap. personas, cap. rondas, rondas escritas, ronda inicial
+TAMANO_ENCABEZADO = 64
+# Posición de "rondas escritas" dentro del encabezado: se actualiza en cada
+# ronda a través de un memmap de un solo campo
+_OFFSET_RONDAS = struct.calcsize("<8sIIQ")
+
+CAMPOS = [("x", "<i4"), ("y", "<i4"), ("defensa", "<i4"), ("infectada", "u1")]
+
+
+def _requerir_numpy() -> None:
+    if np is None:
+        raise ImportError("Las trayectorias requieren instalar numpy (pip install numpy).")
+
+
+class GrabadorTrayectorias:
+    """
+    Agrega el estado de cada ronda (x, y, defensa, infectada de todas las
+    personas) a un numpy.memmap preasignado. Cuando se llena, duplica la
+    capacidad de rondas extendiendo el archivo; si aparecen más personas que
+    las previstas, rehace el archivo con el doble de columnas.
+    """
+
+    def __init__(self, ruta: str, capacidad_personas: int, ronda_inicial: int = 0,
+                 capacidad_rondas: int = 1024) -> None:
+        _requerir_numpy()
+        self.ruta: str = ruta
+        self.dtype = np.dtype(CAMPOS)
+        self.capacidad_personas: int = max(1, capacidad_personas)
+        self.capacidad_rondas: int = max(1, capacidad_rondas)
+        self.rondas_escritas: int = 0
+        self.ronda_inicial: int = ronda_inicial
+        self.ids: list[str] = []
+
+        with open(ruta, "wb") as f:
+            f.truncate(TAMANO_ENCABEZADO + self.capacidad_rondas * self.capacidad_personas * self.dtype.itemsize)
+        self._archivo_ids = open(ruta + ".ids", "w", encoding="utf-8")
+        self._escribir_encabezado()
+        self._abrir_mapa()
+
+    def agregar_ronda(self, personas: list[Any], x: Any, y: Any, defensa: Any, infectada: Any) -> None:
+        # personas solo se usa para anotar los ids de las que se agregaron
+        cantidad = len(x)
+
+        if cantidad > len(self.ids):
+            for persona in personas[len(self.ids):cantidad]:
+                self._archivo_ids.write(persona.id + "\n")
+                self.ids.append(persona.id)
+        if cantidad > self.capacidad_personas:
+            self._ampliar_personas(max(cantidad, 2 * self.capacidad_personas))
+        if self.rondas_escritas >= self.capacidad_rondas:
+            self._ampliar_rondas(2 * self.capacidad_rondas)
+
+        fila = self.mapa[self.rondas_escritas]
+        fila["x"][:cantidad] = x
+        fila["y"][:cantidad] = y
+        fila["defensa"][:cantidad] = defensa
+        fila["infectada"][:cantidad] = infectada
+        fila["x"][cantidad:] = -1
+        fila["y"][cantidad:] = -1
+
+        self.rondas_escritas = self.rondas_escritas + 1
+        # el encabezado completo solo cambia al ampliar; aquí basta la cuenta
+        self.contador[0] = self.rondas_escritas
+
+    def agregar_personas(self, personas: list[Any]) -> None:
+        # versión para el motor clásico: arma los arreglos desde los objetos
+        cantidad = len(personas)
+        self.agregar_ronda(
+            personas,
+            np.fromiter((p.x for p in personas), dtype=np.int32, count=cantidad),
+            np.fromiter((p.y for p in personas), dtype=np.int32, count=cantidad),
+            np.fromiter((p.defensa for p in personas), dtype=np.int32, count=cantidad),
+            np.fromiter((p.infectada for p in personas), dtype=bool, count=cantidad),
+        )
+
+    def cerrar(self) -> None:
+        if self.mapa is None:
+            return
+        self.mapa.flush()
+        self.mapa = None
+        self.contador = None
+        self._escribir_encabezado()
+        self._archivo_ids.close()
+
+    # ------------------- INTERNOS -------------------
+    def _abrir_mapa(self) -> None:
+        self.mapa = np.memmap(self.ruta, dtype=self.dtype, mode="r+", offset=TAMANO_ENCABEZADO,
+                              shape=(self.capacidad_rondas, self.capacidad_personas))
+        self.contador = np.memmap(self.ruta, dtype="<u8", mode="r+", offset=_OFFSET_RONDAS, shape=(1,))
+
+    def _escribir_encabezado(self) -> None:
+        with open(self.ruta, "r+b") as f:
+            f.write(_ENCABEZADO.pack(MAGIA, VERSION, self.capacidad_personas, self.capacidad_rondas,
+                                     self.rondas_escritas, self.ronda_inicial))
+        self._archivo_ids.flush()
+
+    def _ampliar_rondas(self, nueva_capacidad: int) -> None:
+        self.mapa.flush()
+        self.mapa = None
+        self.contador = None
+        with open(self.ruta, "r+b") as f:
+            f.truncate(TAMANO_ENCABEZADO + nueva_capacidad * self.capacidad_personas * self.dtype.itemsize)
+        self.capacidad_rondas = nueva_capacidad
+        self._escribir_encabezado()
+        self._abrir_mapa()
+
+    def _ampliar_personas(self, nueva_capacidad: int) -> None:
+        # cambia el ancho de cada fila: hay que copiar a un archivo nuevo
+        anterior = self.mapa
+        ruta_temporal = self.ruta + ".tmp"
+        with open(ruta_temporal, "wb") as f:
+            f.truncate(TAMANO_ENCABEZADO + self.capacidad_rondas * nueva_capacidad * self.dtype.itemsize)
+        nuevo = np.memmap(ruta_temporal, dtype=self.dtype, mode="r+", offset=TAMANO_ENCABEZADO,
+                          shape=(self.capacidad_rondas, nueva_capacidad))
+
+        escritas = self.rondas_escritas
+        nuevo[:escritas, :self.capacidad_personas] = anterior[:escritas]
+        nuevo["x"][:escritas, self.capacidad_personas:] = -1
+        nuevo["y"][:escritas, self.capacidad_personas:] = -1
+        nuevo.flush()
+
+        del nuevo
+        anterior.flush()
+        self.mapa = None
+        self.contador = None
+        del anterior
+        os.replace(ruta_temporal, self.ruta)
+
+        self.capacidad_personas = nueva_capacidad
+        self._escribir_encabezado()
+        self._abrir_mapa()
+
+
+class LectorTrayectorias:
+    """
+    Acceso de solo lectura a un archivo de trayectorias. Todo lo que devuelve
+    son vistas del memmap (sin copiar): solo se lee del disco lo que se usa.
+    """
+
+    def __init__(self, ruta: str) -> None:
+        _requerir_numpy()
+        with open(ruta, "rb") as f:
+            magia, version, capacidad_personas, _, rondas_escritas, ronda_inicial = \
+                _ENCABEZADO.unpack(f.read(_ENCABEZADO.size))
+
+        if magia != MAGIA:
+            raise ValueError("El archivo no es un archivo de trayectorias de la simulación.")
+        if version != VERSION:
+            raise ValueError(f"Versión de trayectorias no soportada: {version}")
+
+        self.ruta: str = ruta
+        self.ronda_inicial: int = ronda_inicial
+        self.datos = np.memmap(ruta, dtype=np.dtype(CAMPOS), mode="r", offset=TAMANO_ENCABEZADO,
+                               shape=(rondas_escritas, capacidad_personas))
+
+        ruta_ids = ruta + ".ids"
+        self.ids: list[str] = []
+        if os.path.exists(ruta_ids):
+            with open(ruta_ids, encoding="utf-8") as f:
+                self.ids = f.read().split()
+        self._indice_de: dict[str, int] = {persona_id: i for i, persona_id in enumerate(self.ids)}
+
+    def cantidad_rondas(self) -> int:
+        return self.datos.shape[0]
+
+    def cantidad_personas(self) -> int:
+        return len(self.ids)
+
+    def rondas(self, desde: int, hasta: int) -> Any:
+        """Filas de las rondas [desde, hasta) (números de ronda de la simulación)."""
+        return self.datos[desde - self.ronda_inicial:hasta - self.ronda_inicial, :len(self.ids)]
+
+    def persona(self, persona: Union[int, str]) -> Any:
+        """Trayectoria completa de una persona (por índice o por id), una fila por ronda."""
+        if isinstance(persona, str):
+            persona = self._indice_de[persona]
+        return self.datos[:, persona]
+
+    def campo(self, nombre: str) -> Any:
+        """Un campo ('x', 'y', 'defensa' o 'infectada') como matriz rondas x personas."""
+        return self.datos[nombre][:, :len(self.ids)]
@@ -0,0 +1,166 @@
+# main.py
+"""
+Punto de entrada del proyecto.
+
+  python main.py                 -> menú interactivo de consola
+  python main.py lote [opciones] -> simulación sin interfaz (servidores / estudios por lotes)
+  python main.py ensamble [opc.] -> muchas corridas (una por semilla) en paralelo y sus curvas promedio
+
+Ejemplo:
+  python main.py lote --tamano 200 --personas 5000 --semilla 7 --motor numpy --salida curva.csv
+  python main.py lote --tamano 4000 --personas 2000000 --motor teselas --procesos 8 --salida none
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from typing import Optional
+
+
+def _agregar_opciones_simulacion(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--tamano", type=int, required=True, help="tamaño N de la matriz NxN")
+    parser.add_argument("--personas", type=int, required=True, help="cantidad inicial de personas")
+    parser.add_argument("--defensa", type=int, default=3, help="defensa inicial (por defecto 3)")
+    parser.add_argument("--semilla", type=int, default=None, help="semilla aleatoria")
+    parser.add_argument("--defensa-multiple", action="store_true",
+                        help="cada infectada en la celda resta 1 de defensa")
+    parser.add_argument("--motor", choices=("clasico", "numpy", "teselas"), default="clasico")
+    parser.add_argument("--procesos", type=int, default=None,
+                        help="con --motor teselas: procesos (teselas) en que se reparte la matriz "
+                             "(por defecto, uno por núcleo)")
+    parser.add_argument("--tipo-matriz", choices=("densa", "dispersa"), default="densa")
+    parser.add_argument("--generador", choices=("random", "numpy"), default="random",
+                        help="generador aleatorio propio de cada simulación")
+
+
+def _crear_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Resident Evil UDEM - Simulación")
+    subparsers = parser.add_subparsers(dest="comando")
+
+    lote = subparsers.add_parser("lote", help="ejecuta una simulación sin interfaz")
+    _agregar_opciones_simulacion(lote)
+    lote.add_argument("--rondas", type=int, default=1000,
+                      help="máximo de rondas; 0 = sin límite (por defecto 1000)")
+    lote.add_argument("--salida", default="-",
+                      help="archivo para las estadísticas por ronda ('-' = stdout, 'none' = no escribir)")
+    lote.add_argument("--formato", choices=("csv", "jsonl"), default="csv")
+    lote.add_argument("--cada", type=int, default=1,
+                      help="escribe las estadísticas cada N rondas (siempre la inicial y la última)")
+    lote.add_argument("--eventos", default=None,
+                      help="graba un registro binario de eventos (reproducible con ui.app_kivy.replay)")
+    lote.add_argument("--trayectorias", default=None,
+                      help="guarda posición, defensa e infección de cada persona por ronda (numpy.memmap)")
+    lote.add_argument("--instrumentar", action="store_true",
+                      help="mide el tiempo de cada fase de la ronda y lo muestra al final (stderr)")
+
+    ensamble = subparsers.add_parser("ensamble", help="promedia muchas corridas con semillas distintas")
+    _agregar_opciones_simulacion(ensamble)
+    ensamble.add_argument("--corridas", type=int, default=100, help="cantidad de semillas (por defecto 100)")
+    ensamble.add_argument("--rondas", type=int, default=200, help="rondas por corrida (por defecto 200)")
+    ensamble.add_argument("--trabajadores", type=int, default=os.cpu_count() or 1,
+                          help="procesos en paralelo (por defecto, uno por núcleo)")
+    ensamble.add_argument("--bloque", type=int, default=None, help="semillas por tarea enviada a un proceso")
+    ensamble.add_argument("--flujos-hijos", action="store_true",
+                          help="deriva un flujo aleatorio hijo por corrida a partir de --semilla "
+                               "en vez de usar semillas consecutivas")
+    ensamble.add_argument("--salida", default="-", help="archivo JSON con el resumen ('-' = stdout)")
+
+    return parser
+
+
+def _parametros_simulacion(args: argparse.Namespace) -> dict:
+    return {
+        "tamano_matriz": args.tamano,
+        "cantidad_personas": args.personas,
+        "defensa_inicial": args.defensa,
+        "usar_defensa_multiple": args.defensa_multiple,
+        "motor": args.motor,
+        "tipo_matriz": args.tipo_matriz,
+        "generador": args.generador,
+        "procesos": args.procesos,
+    }
+
+
+def _comando_lote(args: argparse.Namespace) -> int:
+    from core.simulador import Simulador
+    from core.lote import ejecutar_lote
+
+    sim = Simulador(semilla_aleatoria=args.semilla, **_parametros_simulacion(args))
+    max_rondas: Optional[int] = args.rondas if args.rondas > 0 else None
+
+    if args.eventos or args.trayectorias:
+        sim.inicializar()
+    if args.eventos:
+        sim.grabar_eventos(args.eventos)
+    if args.instrumentar:
+        sim.activar_instrumentacion()
+    if args.trayectorias:
+        sim.grabar_trayectorias(args.trayectorias)
+
+    if args.salida == "none":
+        resumen = ejecutar_lote(sim, max_rondas, None, args.formato, args.cada)
+    elif args.salida == "-":
+        resumen = ejecutar_lote(sim, max_rondas, sys.stdout, args.formato, args.cada)
+    else:
+        with open(args.salida, "w", encoding="utf-8", buffering=1 << 16) as f:
+            resumen = ejecutar_lote(sim, max_rondas, f, args.formato, args.cada)
+    sim.detener_grabacion()
+    sim.detener_trayectorias()
+    sim.liberar_motor()
+
+    # el resumen va a stderr para no mezclarse con las estadísticas
+    print(f"rondas={resumen['rondas']} fin={resumen['motivo_fin']} "
+          f"segundos={resumen['segundos']:.3f} rondas/s={resumen['rondas_por_segundo']:.1f}",
+          file=sys.stderr)
+    if sim.instrumentacion is not None:
+        print(sim.instrumentacion.formatear(), file=sys.stderr)
+    return 0
+
+
+def _comando_ensamble(args: argparse.Namespace) -> int:
+    import time
+    from core.ensamble import ejecutar_ensamble
+    from core.aleatorio import crear_fuente
+
+    semilla_base = args.semilla if args.semilla is not None else 0
+    if args.flujos_hijos:
+        semillas = crear_fuente(semilla_base, args.generador).hijas(args.corridas)
+    else:
+        semillas = list(range(semilla_base, semilla_base + args.corridas))
+
+    inicio = time.perf_counter()
+    resumen = ejecutar_ensamble(_parametros_simulacion(args), semillas, args.rondas,
+                                trabajadores=args.trabajadores, tamano_bloque=args.bloque)
+    segundos = time.perf_counter() - inicio
+
+    texto = json.dumps(resumen, indent=2)
+    if args.salida == "-":
+        print(texto)
+    else:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            f.write(texto + "\n")
+
+    final = resumen["tamano_final"]
+    print(f"corridas={resumen['corridas']} trabajadores={args.trabajadores} segundos={segundos:.2f} "
+          f"tamano_final_medio={final['media']:.1f} (p5={final['p5']:.0f}, p95={final['p95']:.0f})",
+          file=sys.stderr)
+    return 0
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = _crear_parser().parse_args(argv)
+
+    if args.comando == "lote":
+        return _comando_lote(args)
+    if args.comando == "ensamble":
+        return _comando_ensamble(args)
+
+    from ui.menu import MenuPrincipal
+    MenuPrincipal().menu_principal()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import Optional, List
+from typing import Optional, List, Iterator, TextIO
 
 from .nodo_arbol import NodoArbol     
 from .persona import Persona          
@@ -10,6 +10,12 @@ class ArbolContagio:
     def __init__(self) -> None:
         self.raiz: Optional[NodoArbol] = None
         self.nodos: dict[str, NodoArbol] = {}
+        # conteo_por_nivel[k] = cantidad de nodos en el nivel k; la profundidad
+        # máxima es el último índice con nodos.
+        self.conteo_por_nivel: list[int] = []
+        # nodos_por_hijos[k] = nodos con exactamente k hijos (por id(nodo)), para
+        # la distribución de contagios directos y los principales contagiadores
+        self.nodos_por_hijos: list[dict[int, NodoArbol]] = []
 
     def establecer_paciente_cero(self, persona: Persona) -> None:
         nodo_nuevo = NodoArbol(persona)
@@ -17,6 +23,8 @@ class ArbolContagio:
         
         id_persona = persona.id
         self.nodos[id_persona] = nodo_nuevo
+        self._sumar_a_nivel(nodo_nuevo.nivel)
+        self._agregar_a_hijos(nodo_nuevo)
 
     def agregar_contagio(self, infectador: Persona, infectado: Persona) -> bool:
         id_infectador = infectador.id
@@ -27,7 +35,12 @@ class ArbolContagio:
         nodo_infectador = self.nodos[id_infectador]
         nodo_infectado = NodoArbol(infectado)
         
+        self._quitar_de_hijos(nodo_infectador)
         nodo_infectador.agregar_hijo(nodo_infectado)
+        self._agregar_a_hijos(nodo_infectador)
+        self._agregar_a_hijos(nodo_infectado)
+        self._sumar_a_subarboles(nodo_infectador, 1)
+        self._sumar_a_nivel(nodo_infectado.nivel)
         
         id_infectado = infectado.id
         self.nodos[id_infectado] = nodo_infectado
@@ -43,24 +56,37 @@ class ArbolContagio:
         nodo_a_curar = self.nodos[id_persona]
         nodo_padre = nodo_a_curar.get_padre()
         lista_hijos = nodo_a_curar.get_hijos()
+        self._quitar_de_hijos(nodo_a_curar)
         
         if nodo_padre is not None:
+            self._quitar_de_hijos(nodo_padre)
             for hijo in lista_hijos:
+                self._desplazar_subarbol(hijo, -1)
                 nodo_padre.agregar_hijo(hijo)
             
             nodo_padre.eliminar_hijo(nodo_a_curar)
+            self._agregar_a_hijos(nodo_padre)
+            # los hijos siguen debajo del padre: solo falta el nodo curado
+            self._sumar_a_subarboles(nodo_padre, -1)
         else:
             if len(lista_hijos) > 0:
+                # Solo sube el subárbol de la nueva raíz; los demás hijos
+                # quedan colgando de ella en el mismo nivel 1 de antes.
                 nueva_raiz = lista_hijos[0]
+                self._desplazar_subarbol(nueva_raiz, -1)
                 nueva_raiz.set_padre(None)
                 self.raiz = nueva_raiz
                 
+                self._quitar_de_hijos(nueva_raiz)
                 for i in range(1, len(lista_hijos)):
                     hijo = lista_hijos[i]
                     nueva_raiz.agregar_hijo(hijo)
+                self._agregar_a_hijos(nueva_raiz)
+                nueva_raiz.tamano_subarbol = nodo_a_curar.tamano_subarbol - 1
             else:
                 self.raiz = None
         
+        self._restar_a_nivel(nodo_a_curar.nivel)
         del self.nodos[id_persona]
         persona.curar()
         
@@ -90,60 +116,255 @@ class ArbolContagio:
         return cantidad
 
     def get_profundidad(self) -> int:
-        if len(self.nodos) == 0:
+        if len(self.conteo_por_nivel) == 0:
             return 0
         
-        profundidad_maxima = 0
+        return len(self.conteo_por_nivel) - 1
+
+    def get_conteo_por_nivel(self) -> list[int]:
+        return self.conteo_por_nivel.copy()
+
+    # ------------------- TRANSMISIÓN -------------------
+    # Todo sale de los agregados que se mantienen al agregar y curar, sin
+    # recorrer el árbol. "Contagios directos" de un nodo = sus hijos actuales
+    # (al curar a alguien, sus hijos pasan a contar para su infectador).
+    def get_tamano_subarbol(self, id_persona: str) -> int:
+        # 0 si la persona no está en el árbol
+        nodo = self.nodos.get(id_persona)
+        return nodo.tamano_subarbol if nodo is not None else 0
+
+    def get_contagios_directos(self, id_persona: str) -> int:
+        nodo = self.nodos.get(id_persona)
+        return len(nodo.hijos) if nodo is not None else 0
+
+    def get_distribucion_contagios(self) -> list[int]:
+        # distribucion[k] = cantidad de infectados que contagiaron a exactamente k personas
+        return [len(grupo) for grupo in self.nodos_por_hijos]
+
+    def get_promedio_contagios(self) -> float:
+        cantidad = len(self.nodos)
+        if cantidad == 0:
+            return 0.0
+        contagios = 0
+        for k, grupo in enumerate(self.nodos_por_hijos):
+            contagios = contagios + k * len(grupo)
+        return contagios / cantidad
+
+    def get_r_por_generacion(self) -> list[float]:
+        # r[g] = nodos en el nivel g+1 / nodos en el nivel g (hijos promedio de la generación g);
+        # la última generación todavía no contagió, así que no aparece
+        niveles = self.conteo_por_nivel
+        return [niveles[g + 1] / niveles[g] if niveles[g] > 0 else 0.0
+                for g in range(len(niveles) - 1)]
+
+    def get_principales_contagiadores(self, cantidad: int = 5) -> list[tuple[Persona, int]]:
+        """
+        Las `cantidad` personas con más contagios directos, de mayor a menor:
+        recorre los grupos desde el de más hijos, sin ordenar a todos los nodos.
+        """
+        principales: list[tuple[Persona, int]] = []
+        for k in range(len(self.nodos_por_hijos) - 1, 0, -1):
+            for nodo in self.nodos_por_hijos[k].values():
+                if len(principales) >= cantidad:
+                    return principales
+                principales.append((nodo.get_persona(), k))
+        return principales
+
+    # ------------------- EXPORTAR / IMPORTAR -------------------
+    def exportar_estructura(self) -> tuple[list[NodoArbol], list[int], list[int]]:
+        """
+        Devuelve el árbol como arreglos planos: los nodos en preorden (primero
+        la raíz), la posición del padre de cada uno dentro de esa lista (-1 si
+        no tiene) y el orden de inserción de self.nodos como posiciones.
+        """
+        raices = []
+        if self.raiz is not None:
+            raices.append(self.raiz)
+        for nodo in self.nodos.values():
+            if nodo.get_padre() is None and nodo is not self.raiz:
+                raices.append(nodo)
+
+        preorden: list[NodoArbol] = []
+        padres: list[int] = []
+        posicion_de: dict[int, int] = {}
+
+        for raiz in raices:
+            pendientes: list[tuple[NodoArbol, int]] = [(raiz, -1)]
+            while len(pendientes) > 0:
+                nodo, posicion_padre = pendientes.pop()
+                posicion_de[id(nodo)] = len(preorden)
+                preorden.append(nodo)
+                padres.append(posicion_padre)
+
+                posicion_actual = len(preorden) - 1
+                for hijo in reversed(nodo.get_hijos()):
+                    pendientes.append((hijo, posicion_actual))
+
+        orden_insercion = [posicion_de[id(nodo)] for nodo in self.nodos.values()]
+        return preorden, padres, orden_insercion
+
+    def importar_estructura(self, personas: list[Persona], padres: list[int],
+                            orden_insercion: list[int]) -> None:
+        """Reconstruye el árbol a partir de lo que devuelve exportar_estructura."""
+        self.raiz = None
+
+        # En preorden cada padre aparece antes que sus hijos, así que el nivel
+        # de un nodo nunca pasa en más de uno al mayor visto hasta ahí.
+        nodos_preorden = list(map(NodoArbol, personas))
+        conteo_por_nivel: list[int] = []
+
+        for nodo, posicion_padre in zip(nodos_preorden, padres):
+            if posicion_padre >= 0:
+                # los hijos ya vienen sin repetir: se enlazan sin la búsqueda de agregar_hijo
+                nodo_padre = nodos_preorden[posicion_padre]
+                nodo_padre.hijos.append(nodo)
+                nodo.padre = nodo_padre
+                nodo.nivel = nodo_padre.nivel + 1
+            elif self.raiz is None:
+                self.raiz = nodo
+
+            if nodo.nivel == len(conteo_por_nivel):
+                conteo_por_nivel.append(1)
+            else:
+                conteo_por_nivel[nodo.nivel] += 1
+
+        self.conteo_por_nivel = conteo_por_nivel
+
+        # al revés, cada hijo aparece antes que su padre: los tamaños de los
+        # subárboles se acumulan en una pasada
+        self.nodos_por_hijos = []
+        for i in range(len(nodos_preorden) - 1, -1, -1):
+            nodo = nodos_preorden[i]
+            self._agregar_a_hijos(nodo)
+            if padres[i] >= 0:
+                nodos_preorden[padres[i]].tamano_subarbol += nodo.tamano_subarbol
+
+        self.nodos = {personas[posicion].id: nodos_preorden[posicion] for posicion in orden_insercion}
+
+    # ------------------- NIVELES -------------------
+    def _sumar_a_nivel(self, nivel: int) -> None:
+        while len(self.conteo_por_nivel) <= nivel:
+            self.conteo_por_nivel.append(0)
         
-        for id_persona in self.nodos:
-            nodo = self.nodos[id_persona]
-            nivel_nodo = nodo.get_nivel()
-            
-            if nivel_nodo > profundidad_maxima:
-                profundidad_maxima = nivel_nodo
+        self.conteo_por_nivel[nivel] += 1
+
+    def _restar_a_nivel(self, nivel: int) -> None:
+        self.conteo_por_nivel[nivel] -= 1
         
-        return profundidad_maxima
+        while len(self.conteo_por_nivel) > 0 and self.conteo_por_nivel[-1] == 0:
+            self.conteo_por_nivel.pop()
 
-    def visualizar(self) -> str:
-        if self.raiz is None:
-            return "Árbol vacío (sin infectados)"
+    # ------------------- AGREGADOS -------------------
+    def _agregar_a_hijos(self, nodo: NodoArbol) -> None:
+        cantidad_hijos = len(nodo.hijos)
+        while len(self.nodos_por_hijos) <= cantidad_hijos:
+            self.nodos_por_hijos.append({})
         
-        texto = "\n╔═══════════════════════════════════════╗\n"
-        texto = texto + "║     ÁRBOL DE PROPAGACIÓN              ║\n"
-        texto = texto + "╚═══════════════════════════════════════╝\n\n"
+        self.nodos_por_hijos[cantidad_hijos][id(nodo)] = nodo
+
+    def _quitar_de_hijos(self, nodo: NodoArbol) -> None:
+        # se llama antes de cambiar los hijos del nodo
+        del self.nodos_por_hijos[len(nodo.hijos)][id(nodo)]
         
-        id_raiz = self.raiz.get_persona().id
-        texto = texto + f"{id_raiz} (Paciente Cero)\n"
+        while len(self.nodos_por_hijos) > 0 and len(self.nodos_por_hijos[-1]) == 0:
+            self.nodos_por_hijos.pop()
+
+    def _sumar_a_subarboles(self, nodo: Optional[NodoArbol], delta: int) -> None:
+        # el nodo y todos sus ancestros: O(profundidad)
+        while nodo is not None:
+            nodo.tamano_subarbol = nodo.tamano_subarbol + delta
+            nodo = nodo.padre
+
+    def _desplazar_subarbol(self, nodo: NodoArbol, delta: int) -> None:
+        pendientes = [nodo]
+        
+        while len(pendientes) > 0:
+            nodo_actual = pendientes.pop()
+            self._restar_a_nivel(nodo_actual.nivel)
+            nodo_actual.nivel = nodo_actual.nivel + delta
+            self._sumar_a_nivel(nodo_actual.nivel)
+            pendientes.extend(nodo_actual.get_hijos())
+
+    def visualizar(self, max_profundidad: Optional[int] = None, max_hijos: Optional[int] = None,
+                   desde: Optional[str] = None) -> str:
+        return "".join(self._lineas_visualizacion(max_profundidad, max_hijos, desde))
+
+    def escribir_visualizacion(self, salida: TextIO, max_profundidad: Optional[int] = None,
+                               max_hijos: Optional[int] = None, desde: Optional[str] = None) -> None:
+        # Igual que visualizar, pero escribe por tandas en un archivo (o stdout)
+        # sin armar todo el texto en memoria.
+        tanda: list[str] = []
+        for linea in self._lineas_visualizacion(max_profundidad, max_hijos, desde):
+            tanda.append(linea)
+            if len(tanda) >= 4096:
+                salida.write("".join(tanda))
+                tanda = []
+        salida.write("".join(tanda))
+
+    def _lineas_visualizacion(self, max_profundidad: Optional[int], max_hijos: Optional[int],
+                              desde: Optional[str]) -> Iterator[str]:
+        # Recorrido en preorden con una pila explícita (sin recursión). Los
+        # límites cortan con una línea "… +N más":
+        #   max_profundidad: niveles debajo del nodo inicial que se muestran
+        #   max_hijos: hijos que se muestran por nodo
+        #   desde: id de la persona cuyo subárbol se dibuja (por defecto la raíz)
+        if self.raiz is None:
+            yield "Árbol vacío (sin infectados)"
+            return
         
-        hijos_raiz = self.raiz.get_hijos()
-        cantidad_hijos = len(hijos_raiz)
+        if desde is None:
+            inicio = self.raiz
+        elif desde in self.nodos:
+            inicio = self.nodos[desde]
+        else:
+            yield f"La persona {desde} no está en el árbol"
+            return
         
-        for i in range(cantidad_hijos):
-            hijo = hijos_raiz[i]
-            es_ultimo = (i == cantidad_hijos - 1)
-            texto = texto + self._construir_string_recursivo(hijo, "", es_ultimo)
+        yield "\n╔═══════════════════════════════════════╗\n"
+        yield "║     ÁRBOL DE PROPAGACIÓN              ║\n"
+        yield "╚═══════════════════════════════════════╝\n\n"
         
-        return texto
-
-    def _construir_string_recursivo(self, nodo: NodoArbol, prefijo: str, es_ultimo: bool) -> str:
-        if es_ultimo:
-            marcador = "└── "
-            prefijo_hijos = prefijo + "    "
+        id_inicio = inicio.get_persona().id
+        if inicio is self.raiz:
+            yield f"{id_inicio} (Paciente Cero)\n"
         else:
-            marcador = "├── "
-            prefijo_hijos = prefijo + "│   "
+            yield f"{id_inicio} (subárbol, nivel {inicio.get_nivel()})\n"
         
-        id_persona = nodo.get_persona().id
-        texto = prefijo + marcador + id_persona + "\n"
+        # cada entrada: (nodo, prefijo, es_último, profundidad, ocultos);
+        # nodo None es la línea "… +N más" con N = ocultos
+        pila: list[tuple[Optional[NodoArbol], str, bool, int, int]] = []
+        self._apilar_hijos(pila, inicio, "", 1, max_profundidad, max_hijos)
         
+        while pila:
+            nodo, prefijo, es_ultimo, profundidad, ocultos = pila.pop()
+            marcador = "└── " if es_ultimo else "├── "
+            
+            if nodo is None:
+                yield prefijo + marcador + f"… +{ocultos} más\n"
+                continue
+            
+            yield prefijo + marcador + nodo.get_persona().id + "\n"
+            prefijo_hijos = prefijo + ("    " if es_ultimo else "│   ")
+            self._apilar_hijos(pila, nodo, prefijo_hijos, profundidad + 1, max_profundidad, max_hijos)
+
+    def _apilar_hijos(self, pila: list[tuple[Optional[NodoArbol], str, bool, int, int]], nodo: NodoArbol,
+                      prefijo: str, profundidad: int, max_profundidad: Optional[int],
+                      max_hijos: Optional[int]) -> None:
         hijos = nodo.get_hijos()
         cantidad_hijos = len(hijos)
+        if cantidad_hijos == 0:
+            return
         
-        for i in range(cantidad_hijos):
-            hijo = hijos[i]
-            es_ultimo_hijo = (i == cantidad_hijos - 1)
-            texto = texto + self._construir_string_recursivo(hijo, prefijo_hijos, es_ultimo_hijo)
+        if max_profundidad is not None and profundidad > max_profundidad:
+            pila.append((None, prefijo, True, profundidad, cantidad_hijos))
+            return
         
-        return texto
-
-
+        visibles = cantidad_hijos
+        if max_hijos is not None and cantidad_hijos > max_hijos:
+            visibles = max_hijos
+            pila.append((None, prefijo, True, profundidad, cantidad_hijos - visibles))
+        
+        # se apilan al revés para que salgan en orden
+        for i in range(visibles - 1, -1, -1):
+            es_ultimo = (i == cantidad_hijos - 1)
+            pila.append((hijos[i], prefijo, es_ultimo, profundidad, 0))
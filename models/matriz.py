@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import List, Tuple, Set
+from typing import Iterator, List, Tuple, Set
 
 from .persona import Persona  
        
@@ -40,6 +40,18 @@ class Matriz:
         
         return (x_ajustado, y_ajustado)
 
+    # ------------------- ALMACENAMIENTO -------------------
+    # Las subclases (p. ej. MatrizDispersa) cambian cómo se guardan las celdas
+    # sobrescribiendo solo estos tres métodos (y agregar_personas_en_lote).
+    def _celda(self, x: int, y: int) -> list[Persona]:
+        return self.celdas[x][y]
+
+    def _celda_para_agregar(self, x: int, y: int) -> list[Persona]:
+        return self.celdas[x][y]
+
+    def _liberar_celda_si_vacia(self, x: int, y: int) -> None:
+        pass
+
     def agregar_persona(self, persona: Persona) -> bool:
         x, y = persona.get_posicion()
         
@@ -47,16 +59,23 @@ class Matriz:
             x, y = self.ajustar_coordenadas_rebote(x, y)
             persona.set_posicion(x, y)
         
-        self.celdas[x][y].append(persona)
+        self._celda_para_agregar(x, y).append(persona)
         return True
 
+    def agregar_personas_en_lote(self, personas: list[Persona]) -> None:
+        # Para poblaciones ya validadas (p. ej. al cargar un checkpoint): no
+        # revisa límites ni pasa por _celda_para_agregar persona por persona.
+        celdas = self.celdas
+        for persona in personas:
+            celdas[persona.x][persona.y].append(persona)
+
     def remover_persona(self, persona: Persona) -> bool:
         x, y = persona.get_posicion()
         
         if not self.esta_dentro_limites(x, y):
             return False
         
-        celda_actual = self.celdas[x][y]
+        celda_actual = self._celda(x, y)
         persona_encontrada = False
         
         for persona_en_celda in celda_actual:
@@ -66,6 +85,7 @@ class Matriz:
         
         if persona_encontrada:
             celda_actual.remove(persona)
+            self._liberar_celda_si_vacia(x, y)
             return True
         
         return False
@@ -85,11 +105,14 @@ class Matriz:
         if not self.esta_dentro_limites(x, y):
             return []
         
-        personas_en_celda = self.celdas[x][y]
+        personas_en_celda = self._celda(x, y)
         copia_lista = personas_en_celda.copy()
         
         return copia_lista
 
+    # get_todas_personas y get_celdas_ocupadas recorren fila por fila (x y
+    # luego y) y, dentro de cada celda, en orden de llegada. Las subclases
+    # respetan el mismo orden; quien no lo necesita usa iterar_celdas_ocupadas.
     def get_todas_personas(self) -> list[Persona]:
         lista_todas = []
         
@@ -104,7 +127,7 @@ class Matriz:
         if not self.esta_dentro_limites(x, y):
             return False
         
-        cantidad_personas = len(self.celdas[x][y])
+        cantidad_personas = len(self._celda(x, y))
         
         if cantidad_personas >= 2:
             return True
@@ -121,37 +144,46 @@ class Matriz:
         
         return lista_celdas
 
+    def iterar_celdas_ocupadas(self) -> Iterator[tuple[int, int]]:
+        # sin orden garantizado
+        for fila in range(self.tamano):
+            for columna in range(self.tamano):
+                if len(self.celdas[fila][columna]) > 0:
+                    yield (fila, columna)
+
     def get_tamano(self) -> int:
         return self.tamano
 
     def visualizar(self) -> str:
-        texto = "\n"
+        # Se juntan los pedazos en una lista y se unen una sola vez al final
+        partes = ["\n", "    "]
         
-        encabezado = "    "
         for columna in range(self.tamano):
-            encabezado = encabezado + f"{columna:2d}  "
-        texto = texto + encabezado + "\n"
+            partes.append(f"{columna:2d}  ")
+        partes.append("\n")
         
         linea_separacion = "   " + ("─" * (self.tamano * 4)) + "\n"
-        texto = texto + linea_separacion
+        partes.append(linea_separacion)
         
         for fila in range(self.tamano):
-            linea_fila = f"{fila:2d} │ "
+            partes.append(f"{fila:2d} │ ")
             
             for columna in range(self.tamano):
-                personas_celda = self.celdas[fila][columna]
+                personas_celda = self._celda(fila, columna)
                 cantidad_personas = len(personas_celda)
                 
                 if cantidad_personas == 0:
-                    linea_fila = linea_fila + "  "
-                elif cantidad_personas == 1:
+                    partes.append("   ")
+                    continue
+                
+                if cantidad_personas == 1:
                     persona = personas_celda[0]
                     id_corto = persona.id[:2]
                     
                     if persona.esta_infectada():
-                        linea_fila = linea_fila + f"\033[91m{id_corto}\033[0m"
+                        partes.append(f"\033[91m{id_corto}\033[0m ")
                     else:
-                        linea_fila = linea_fila + f"\033[92m{id_corto}\033[0m"
+                        partes.append(f"\033[92m{id_corto}\033[0m ")
                 else:
                     infectadas = 0
                     for persona in personas_celda:
@@ -159,20 +191,17 @@ class Matriz:
                             infectadas = infectadas + 1
                     
                     if infectadas == cantidad_personas:
-                        linea_fila = linea_fila + f"\033[91m{cantidad_personas}I\033[0m"
+                        partes.append(f"\033[91m{cantidad_personas}I\033[0m ")
                     elif infectadas == 0:
-                        linea_fila = linea_fila + f"\033[92m{cantidad_personas}S\033[0m"
+                        partes.append(f"\033[92m{cantidad_personas}S\033[0m ")
                     else:
-                        linea_fila = linea_fila + f"\033[93m{cantidad_personas}M\033[0m"
-                
-                linea_fila = linea_fila + " "
+                        partes.append(f"\033[93m{cantidad_personas}M\033[0m ")
             
-            linea_fila = linea_fila + "│\n"
-            texto = texto + linea_fila
+            partes.append("│\n")
         
-        texto = texto + linea_separacion
-        texto = texto + "\n🟩 = Sana  🟥 = Infectada  🟨 = Mixta\n"
+        partes.append(linea_separacion)
+        partes.append("\n🟩 = Sana  🟥 = Infectada  🟨 = Mixta\n")
         
-        return texto
+        return "".join(partes)
 
 
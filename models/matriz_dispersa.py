@@ -0,0 +1,77 @@
+from __future__ import annotations
+from typing import Iterator
+
+from .matriz import Matriz
+from .persona import Persona
+
+
+class MatrizDispersa(Matriz):
+    """
+    Variante de Matriz que solo guarda las celdas ocupadas, en un diccionario
+    indexado por el id lineal de la celda (x * tamano + y). La memoria y el
+    recorrido de celdas crecen con la población y no con tamano².
+    """
+
+    def __init__(self, tamano: int) -> None:
+        self.tamano: int = tamano
+        self.celdas: dict[int, list[Persona]] = {}
+
+    def _celda(self, x: int, y: int) -> list[Persona]:
+        celda = self.celdas.get(x * self.tamano + y)
+        if celda is None:
+            return []
+        return celda
+
+    def _celda_para_agregar(self, x: int, y: int) -> list[Persona]:
+        id_celda = x * self.tamano + y
+        celda = self.celdas.get(id_celda)
+
+        if celda is None:
+            celda = []
+            self.celdas[id_celda] = celda
+
+        return celda
+
+    def _liberar_celda_si_vacia(self, x: int, y: int) -> None:
+        id_celda = x * self.tamano + y
+        celda = self.celdas.get(id_celda)
+
+        if celda is not None and len(celda) == 0:
+            del self.celdas[id_celda]
+
+    def agregar_personas_en_lote(self, personas: list[Persona]) -> None:
+        celdas = self.celdas
+        tamano = self.tamano
+        for persona in personas:
+            id_celda = persona.x * tamano + persona.y
+            celda = celdas.get(id_celda)
+            if celda is None:
+                celdas[id_celda] = [persona]
+            else:
+                celda.append(persona)
+
+    def get_todas_personas(self) -> list[Persona]:
+        # mismo orden (fila por fila) que la matriz densa
+        lista_todas = []
+
+        for id_celda in sorted(self.celdas):
+            lista_todas.extend(self.celdas[id_celda])
+
+        return lista_todas
+
+    def get_celdas_ocupadas(self) -> list[tuple[int, int]]:
+        # mismo orden (fila por fila) que la matriz densa
+        lista_celdas = []
+
+        for id_celda in sorted(self.celdas):
+            lista_celdas.append(divmod(id_celda, self.tamano))
+
+        return lista_celdas
+
+    def iterar_celdas_ocupadas(self) -> Iterator[tuple[int, int]]:
+        # en el orden del diccionario: sin ordenar las claves
+        for id_celda in self.celdas:
+            yield divmod(id_celda, self.tamano)
+
+    def contar_celdas_ocupadas(self) -> int:
+        return len(self.celdas)
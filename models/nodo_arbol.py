@@ -10,6 +10,9 @@ class NodoArbol:
         self.persona: Persona = persona
         self.padre: Optional['NodoArbol'] = None
         self.hijos: list['NodoArbol'] = []
+        self.nivel: int = 0
+        # nodos del subárbol contando este; lo mantiene ArbolContagio
+        self.tamano_subarbol: int = 1
 
     def agregar_hijo(self, nodo_hijo: 'NodoArbol') -> None:
         ya_existe = False
@@ -23,6 +26,7 @@ class NodoArbol:
         if not ya_existe and not es_el_mismo_nodo:
             self.hijos.append(nodo_hijo)
             nodo_hijo.padre = self
+            nodo_hijo.nivel = self.nivel + 1
 
     def eliminar_hijo(self, nodo_hijo: 'NodoArbol') -> bool:
         hijo_encontrado = False
@@ -55,14 +59,12 @@ class NodoArbol:
             return False
 
     def get_nivel(self) -> int:
-        nivel = 0
-        nodo_actual = self
-        
-        while nodo_actual.padre is not None:
-            nivel = nivel + 1
-            nodo_actual = nodo_actual.padre
-        
-        return nivel
+        # El nivel se guarda en el nodo; ArbolContagio lo mantiene al día
+        # cuando mueve subárboles completos.
+        return self.nivel
+
+    def get_tamano_subarbol(self) -> int:
+        return self.tamano_subarbol
 
     def get_persona(self) -> Persona:
         return self.persona
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Optional, Callable
 
 class Persona:
     
@@ -9,6 +9,8 @@ class Persona:
         self.infectada: bool = False
         self.defensa: int = defensa_inicial
         self.infectador: Optional['Persona'] = None
+        # Se llama con (persona, infectada) cada vez que cambia el estado de infección
+        self.al_cambiar_estado: Optional[Callable[['Persona', bool], None]] = None
 
     def get_posicion(self) -> tuple[int, int]:
         return (self.x, self.y)
@@ -21,10 +23,14 @@ class Persona:
         return self.infectada
 
     def infectar(self, infectador: 'Persona') -> None:
+        estaba_infectada = self.infectada
         self.infectada = True
         self.defensa = 0
         self.infectador = infectador
 
+        if not estaba_infectada and self.al_cambiar_estado is not None:
+            self.al_cambiar_estado(self, True)
+
     def reducir_defensa(self) -> None:
         if self.defensa > 0:
             self.defensa -= 1
@@ -33,10 +39,14 @@ class Persona:
         self.defensa += 1
 
     def curar(self) -> None:
+        estaba_infectada = self.infectada
         self.infectada = False
         self.defensa = 3
         self.infectador = None
 
+        if estaba_infectada and self.al_cambiar_estado is not None:
+            self.al_cambiar_estado(self, False)
+
     def __repr__(self) -> str:
         estado = "INFECTADA" if self.infectada else "SANA"
         return f"Persona({self.id}, pos=({self.x},{self.y}), def={self.defensa}, {estado})"
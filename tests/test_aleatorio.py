@@ -0,0 +1,87 @@
+# tests/test_aleatorio.py
+from __future__ import annotations
+
+import copy
+import random
+
+import pytest
+
+from core.aleatorio import FuenteAleatoria, crear_fuente
+from core.ensamble import ejecutar_ensamble
+from core.simulador import Simulador
+
+
+def _estado(sim: Simulador) -> list[tuple]:
+    return [(p.id, p.x, p.y, p.defensa, p.infectada) for p in sim.get_personas()]
+
+
+def test_misma_secuencia_que_random_seed():
+    fuente = FuenteAleatoria(42)
+    random.seed(42)
+    assert [fuente.randint(0, 99) for _ in range(50)] == [random.randint(0, 99) for _ in range(50)]
+
+
+def test_simulaciones_intercaladas_no_se_mezclan():
+    sola = Simulador(12, 130, 1, 4, True)
+    sola.inicializar()
+    esperado = [sola.ejecutar_ronda() for _ in range(30)]
+
+    estado_global = random.getstate()
+    a = Simulador(12, 130, 1, 4, True)
+    otra = Simulador(12, 130, 1, 99, True)
+    a.inicializar()
+    otra.inicializar()
+    obtenido = []
+    for _ in range(30):
+        obtenido.append(a.ejecutar_ronda())
+        otra.ejecutar_ronda()
+
+    assert obtenido == esperado
+    # el módulo global no se toca
+    assert random.getstate() == estado_global
+
+
+@pytest.mark.parametrize("generador", ["random", "numpy"])
+def test_misma_poblacion_inicial_con_cualquier_motor(generador):
+    pytest.importorskip("numpy")
+    clasico = Simulador(15, 80, 2, 5, motor="clasico", generador=generador)
+    vectorizado = Simulador(15, 80, 2, 5, motor="numpy", generador=generador)
+    clasico.inicializar()
+    vectorizado.inicializar()
+
+    assert _estado(clasico) == _estado(vectorizado)
+    assert clasico.get_personas_infectadas()[0].id == vectorizado.get_personas_infectadas()[0].id
+
+
+def test_el_generador_numpy_no_avanza_el_flujo():
+    pytest.importorskip("numpy")
+    con_numpy, sin_numpy = FuenteAleatoria(7), FuenteAleatoria(7)
+    primero = con_numpy.generador_numpy().random(3).tolist()
+
+    assert [con_numpy.randint(0, 1000) for _ in range(20)] == [sin_numpy.randint(0, 1000) for _ in range(20)]
+    assert FuenteAleatoria(7).generador_numpy().random(3).tolist() == primero
+    assert FuenteAleatoria(8).generador_numpy().random(3).tolist() != primero
+    assert FuenteAleatoria(7).hijas(1)[0].generador_numpy().random(3).tolist() != primero
+
+
+@pytest.mark.parametrize("generador", ["random", "numpy"])
+def test_flujos_hijos_reproducibles_e_independientes(generador):
+    if generador == "numpy":
+        pytest.importorskip("numpy")
+    hijas = crear_fuente(3, generador).hijas(4)
+    otra_vez = crear_fuente(3, generador).hijas(4)
+
+    secuencias = [[h.randint(0, 10 ** 6) for _ in range(10)] for h in hijas]
+    assert secuencias == [[h.randint(0, 10 ** 6) for _ in range(10)] for h in otra_vez]
+    assert len({tuple(s) for s in secuencias}) == 4
+
+
+def test_ensamble_con_flujos_no_avanza_los_del_llamador():
+    parametros = {"tamano_matriz": 10, "cantidad_personas": 60, "defensa_inicial": 1}
+    hijas = crear_fuente(11).hijas(6)
+    antes = copy.deepcopy(hijas)
+
+    serie = ejecutar_ensamble(parametros, hijas, 20, trabajadores=1)
+    assert [h.rng.getstate() for h in hijas] == [h.rng.getstate() for h in antes]
+    assert ejecutar_ensamble(parametros, hijas, 20, trabajadores=1) == serie
+    assert ejecutar_ensamble(parametros, hijas, 20, trabajadores=2) == serie
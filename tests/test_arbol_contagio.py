@@ -0,0 +1,242 @@
+# tests/test_arbol_contagio.py
+from __future__ import annotations
+
+import io
+import random
+
+import pytest
+
+from models.arbol_contagio import ArbolContagio
+from models.persona import Persona
+
+
+def _verificar(arbol: ArbolContagio) -> None:
+    """Recalcula desde cero lo que el árbol mantiene al agregar y curar."""
+    raices = [nodo for nodo in arbol.nodos.values() if nodo.get_padre() is None]
+    if arbol.raiz is not None:
+        assert arbol.raiz in raices
+
+    alcanzados = {}
+    niveles: list[int] = []
+    por_hijos: list[int] = []
+    orden = []
+    pila = [(raiz, 0) for raiz in raices]
+    while pila:
+        nodo, nivel = pila.pop()
+        assert nodo.get_persona().id not in alcanzados
+        alcanzados[nodo.get_persona().id] = nodo
+        orden.append(nodo)
+        assert nodo.get_nivel() == nivel
+        while len(niveles) <= nivel:
+            niveles.append(0)
+        niveles[nivel] = niveles[nivel] + 1
+        cantidad_hijos = len(nodo.get_hijos())
+        while len(por_hijos) <= cantidad_hijos:
+            por_hijos.append(0)
+        por_hijos[cantidad_hijos] = por_hijos[cantidad_hijos] + 1
+        for hijo in nodo.get_hijos():
+            assert hijo.get_padre() is nodo
+            pila.append((hijo, nivel + 1))
+
+    assert alcanzados.keys() == arbol.nodos.keys()
+    assert all(alcanzados[i] is arbol.nodos[i] for i in alcanzados)
+
+    # tamaño de cada subárbol, de las hojas hacia arriba
+    tamanos = {}
+    for nodo in reversed(orden):
+        tamanos[id(nodo)] = 1 + sum(tamanos[id(hijo)] for hijo in nodo.get_hijos())
+        assert nodo.get_tamano_subarbol() == tamanos[id(nodo)]
+        assert arbol.get_tamano_subarbol(nodo.get_persona().id) == tamanos[id(nodo)]
+        assert arbol.get_contagios_directos(nodo.get_persona().id) == len(nodo.get_hijos())
+
+    assert arbol.get_conteo_por_nivel() == niveles
+    assert arbol.get_profundidad() == max(0, len(niveles) - 1)
+    assert arbol.get_distribucion_contagios() == por_hijos
+    for k, grupo in enumerate(arbol.nodos_por_hijos):
+        assert all(len(nodo.get_hijos()) == k for nodo in grupo.values())
+
+    principales = arbol.get_principales_contagiadores(5)
+    hijos = [k for _, k in principales]
+    assert hijos == sorted(hijos, reverse=True)
+    esperado = sorted((len(n.get_hijos()) for n in orden if n.get_hijos()), reverse=True)[:5]
+    assert hijos == esperado
+
+
+@pytest.mark.parametrize("semilla", range(4))
+def test_agregados_al_agregar_y_curar(semilla):
+    rng = random.Random(semilla)
+    arbol = ArbolContagio()
+    contador = 0
+
+    def nueva() -> Persona:
+        nonlocal contador
+        contador = contador + 1
+        return Persona(f"p{contador}", 0, 0)
+
+    for paso in range(1500):
+        infectadas = list(arbol.nodos.values())
+        if not infectadas:
+            arbol.establecer_paciente_cero(nueva())
+        elif rng.random() < 0.7:
+            # contagia sobre todo la parte de arriba del árbol, para que crezca en ancho y en alto
+            infectador = rng.choice(infectadas[:max(1, len(infectadas) // 2)] if rng.random() < 0.5 else infectadas)
+            assert arbol.agregar_contagio(infectador.get_persona(), nueva())
+        else:
+            # de vez en cuando cura a la raíz (su subárbol sube un nivel)
+            nodo = arbol.raiz if rng.random() < 0.1 and arbol.raiz is not None else rng.choice(infectadas)
+            persona = nodo.get_persona()
+            assert arbol.curar_persona(persona)
+            assert not arbol.existe_persona(persona.id)
+        if paso % 10 == 0 or paso > 1450:
+            _verificar(arbol)
+    _verificar(arbol)
+
+
+def test_contagio_desde_quien_no_esta_en_el_arbol():
+    arbol = ArbolContagio()
+    cero = Persona("p1", 0, 0)
+    arbol.establecer_paciente_cero(cero)
+    assert not arbol.agregar_contagio(Persona("x", 0, 0), Persona("p2", 0, 0))
+    assert not arbol.curar_persona(Persona("x", 0, 0))
+    _verificar(arbol)
+
+
+def test_curar_la_raiz_sube_el_primer_hijo():
+    arbol = ArbolContagio()
+    personas = [Persona(f"p{i}", 0, 0) for i in range(6)]
+    arbol.establecer_paciente_cero(personas[0])
+    for hijo in personas[1:4]:
+        arbol.agregar_contagio(personas[0], hijo)
+    arbol.agregar_contagio(personas[1], personas[4])
+    arbol.agregar_contagio(personas[4], personas[5])
+    assert arbol.get_conteo_por_nivel() == [1, 3, 1, 1]
+
+    arbol.curar_persona(personas[0])
+    assert arbol.raiz.get_persona() is personas[1]
+    assert [h.get_persona().id for h in arbol.raiz.get_hijos()] == ["p4", "p2", "p3"]
+    assert arbol.get_conteo_por_nivel() == [1, 3, 1]
+    assert arbol.get_tamano_subarbol("p1") == 5
+    _verificar(arbol)
+
+
+def test_curar_un_nodo_intermedio_sube_a_sus_hijos():
+    arbol = ArbolContagio()
+    personas = [Persona(f"p{i}", 0, 0) for i in range(5)]
+    arbol.establecer_paciente_cero(personas[0])
+    arbol.agregar_contagio(personas[0], personas[1])
+    arbol.agregar_contagio(personas[1], personas[2])
+    arbol.agregar_contagio(personas[2], personas[3])
+    arbol.agregar_contagio(personas[1], personas[4])
+    assert arbol.get_profundidad() == 3
+
+    arbol.curar_persona(personas[1])
+    assert arbol.get_conteo_por_nivel() == [1, 2, 1]
+    assert arbol.get_profundidad() == 2
+    for persona in personas[2:]:
+        arbol.curar_persona(persona)
+    assert arbol.get_conteo_por_nivel() == [1]
+    arbol.curar_persona(personas[0])
+    assert arbol.get_profundidad() == 0
+    assert arbol.get_conteo_por_nivel() == []
+    _verificar(arbol)
+
+
+def _visualizar_recursivo(arbol: ArbolContagio) -> str:
+    # el dibujo de siempre, armado recursivamente
+    def rama(nodo, prefijo: str, es_ultimo: bool) -> str:
+        texto = prefijo + ("└── " if es_ultimo else "├── ") + nodo.get_persona().id + "\n"
+        hijos = nodo.get_hijos()
+        for i, hijo in enumerate(hijos):
+            texto = texto + rama(hijo, prefijo + ("    " if es_ultimo else "│   "), i == len(hijos) - 1)
+        return texto
+
+    texto = ("\n╔═══════════════════════════════════════╗\n"
+             "║     ÁRBOL DE PROPAGACIÓN              ║\n"
+             "╚═══════════════════════════════════════╝\n\n"
+             f"{arbol.raiz.get_persona().id} (Paciente Cero)\n")
+    hijos = arbol.raiz.get_hijos()
+    for i, hijo in enumerate(hijos):
+        texto = texto + rama(hijo, "", i == len(hijos) - 1)
+    return texto
+
+
+def _arbol_aleatorio(cantidad: int, semilla: int) -> tuple[ArbolContagio, list[Persona]]:
+    rng = random.Random(semilla)
+    arbol = ArbolContagio()
+    personas = [Persona(f"p{i}", 0, 0) for i in range(cantidad)]
+    arbol.establecer_paciente_cero(personas[0])
+    for i in range(1, cantidad):
+        arbol.agregar_contagio(personas[rng.randrange(i)], personas[i])
+    return arbol, personas
+
+
+def test_visualizar_sin_limites_dibuja_lo_mismo_de_siempre():
+    assert ArbolContagio().visualizar() == "Árbol vacío (sin infectados)"
+    arbol, _ = _arbol_aleatorio(300, 1)
+    assert arbol.visualizar() == _visualizar_recursivo(arbol)
+
+
+def test_visualizar_una_cadena_muy_profunda():
+    arbol = ArbolContagio()
+    personas = [Persona(f"p{i}", 0, 0) for i in range(5000)]
+    arbol.establecer_paciente_cero(personas[0])
+    for anterior, siguiente in zip(personas, personas[1:]):
+        arbol.agregar_contagio(anterior, siguiente)
+    lineas = arbol.visualizar().splitlines()
+    assert lineas[-1] == " " * 4 * 4998 + "└── p4999"
+
+
+def _arbol_chico() -> ArbolContagio:
+    # p0 ─ p1 ─ p4 ─ p6
+    #    │    └ p5
+    #    ├ p2
+    #    └ p3
+    arbol = ArbolContagio()
+    personas = [Persona(f"p{i}", 0, 0) for i in range(7)]
+    arbol.establecer_paciente_cero(personas[0])
+    for padre, hijo in ((0, 1), (0, 2), (0, 3), (1, 4), (1, 5), (4, 6)):
+        arbol.agregar_contagio(personas[padre], personas[hijo])
+    return arbol
+
+
+def test_visualizar_con_limites():
+    arbol = _arbol_chico()
+    assert arbol.visualizar(max_hijos=2).splitlines()[6:] == [
+        "├── p1",
+        "│   ├── p4",
+        "│   │   └── p6",
+        "│   └── p5",
+        "├── p2",
+        "└── … +1 más",
+    ]
+    assert arbol.visualizar(max_profundidad=1).splitlines()[6:] == [
+        "├── p1",
+        "│   └── … +2 más",
+        "├── p2",
+        "└── p3",
+    ]
+    assert arbol.visualizar(desde="p1", max_profundidad=1).splitlines()[5:] == [
+        "p1 (subárbol, nivel 1)",
+        "├── p4",
+        "│   └── … +1 más",
+        "└── p5",
+    ]
+    assert arbol.visualizar(desde="p9") == "La persona p9 no está en el árbol"
+
+
+def test_escribir_visualizacion_por_tandas_igual_que_visualizar():
+    arbol, _ = _arbol_aleatorio(10000, 2)
+    salida = io.StringIO()
+    arbol.escribir_visualizacion(salida)
+    assert salida.getvalue() == arbol.visualizar()
+
+    salida = io.StringIO()
+    arbol.escribir_visualizacion(salida, max_profundidad=3, max_hijos=4, desde="p5")
+    assert salida.getvalue() == arbol.visualizar(3, 4, "p5")
+
+
+def test_r_por_generacion_y_principales():
+    arbol = _arbol_chico()
+    assert arbol.get_r_por_generacion() == [3.0, 2 / 3, 1 / 2]
+    assert [(persona.id, k) for persona, k in arbol.get_principales_contagiadores(2)] == [("p0", 3), ("p1", 2)]
+    assert arbol.get_distribucion_contagios() == [4, 1, 1, 1]
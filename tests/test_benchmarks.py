@@ -0,0 +1,49 @@
+# tests/test_benchmarks.py
+from __future__ import annotations
+
+import copy
+
+from benchmarks.__main__ import main
+from benchmarks.casos import CASOS
+from benchmarks.suite import cargar, comparar, ejecutar_suite, guardar
+
+REJILLA_MINIMA = {
+    "tamano": (10,),
+    "densidad": (0.3,),
+    "usar_defensa_multiple": (True,),
+    "motor": ("clasico",),
+    "tipo_matriz": ("densa", "dispersa"),
+    "procesos": (1,),
+}
+
+
+def test_suite_mide_todos_los_casos():
+    resultados = ejecutar_suite(REJILLA_MINIMA, repeticiones=1)
+    casos = [resultado["caso"] for resultado in resultados["resultados"]]
+    assert sorted(set(casos)) == sorted(caso.nombre for caso in CASOS)
+    # las dos matrices solo multiplican los casos que dependen de ella
+    assert casos.count("matriz.mover_persona") == 2
+    assert casos.count("ejecutar_ronda") == 1
+    for resultado in resultados["resultados"]:
+        assert resultado["parametros"]["personas"] == 30
+        assert resultado["minimo"] <= resultado["segundos_por_op"] <= resultado["maximo"]
+        assert resultado["ops_por_segundo"] > 0
+
+
+def test_comparar_marca_regresiones_por_encima_del_umbral(tmp_path, capsys):
+    base = ejecutar_suite(REJILLA_MINIMA, repeticiones=1, filtro="arbol")
+    nuevo = copy.deepcopy(base)
+    nuevo["resultados"][0]["minimo"] *= 1.5
+    nuevo["resultados"][1]["minimo"] *= 1.05
+
+    filas = comparar(base, nuevo, umbral=10.0)
+    assert [fila["regresion"] for fila in filas] == [True, False] + [False] * (len(filas) - 2)
+    assert round(filas[0]["cambio"]) == 50
+
+    ruta_base, ruta_nuevo = str(tmp_path / "base.json"), str(tmp_path / "nuevo.json")
+    guardar(base, ruta_base)
+    guardar(nuevo, ruta_nuevo)
+    assert cargar(ruta_base) == base
+    assert main(["comparar", ruta_base, ruta_base]) == 0
+    assert main(["comparar", ruta_base, ruta_nuevo]) == 1
+    assert "1 regresión(es)" in capsys.readouterr().out
@@ -0,0 +1,68 @@
+# tests/test_board.py
+from __future__ import annotations
+
+import pytest
+
+pytest.importorskip("kivy")
+
+from ui.app_kivy.board import HEALTHY_COLOR, INFECTED_COLOR, BoardWidget
+
+
+def _persona(pid: str, x: int, y: int, infected: bool = False, defensa: int = 3) -> dict:
+    return {"id": pid, "x": x, "y": y, "infected": infected, "defensa": defensa}
+
+
+@pytest.fixture
+def tablero():
+    widget = BoardWidget(size=(200, 200), pos=(0, 0))
+    widget.configure_grid(10)
+    yield widget
+    widget._clock.cancel()
+
+
+def test_reusa_las_instrucciones_de_cada_persona(tablero):
+    tablero.update_people([_persona("p1", 0, 0), _persona("p2", 5, 5)])
+    sprites = dict(tablero._sprites)
+    grupos = len(tablero._people_group.children)
+
+    tablero.update_people([_persona("p1", 1, 0), _persona("p2", 5, 5, infected=True, defensa=0)])
+    assert tablero._sprites == sprites
+    assert all(tablero._sprites[pid] is sprites[pid] for pid in sprites)
+    assert len(tablero._people_group.children) == grupos
+
+    # p1 se movió una celda (20 px) a la derecha; p2 cambió de color y pulsa
+    assert tablero._sprites["p1"].cx == pytest.approx(30.0)
+    assert tuple(tablero._sprites["p2"].body_color.rgba) == pytest.approx(INFECTED_COLOR)
+    assert list(tablero._pulsing) == ["p2"]
+
+
+def test_altas_y_bajas(tablero):
+    tablero.update_people([_persona("p1", 0, 0), _persona("p2", 1, 1)])
+    tablero.update_people([_persona("p2", 1, 1), _persona("p3", 2, 2)])
+    assert set(tablero._sprites) == {"p2", "p3"}
+    assert tuple(tablero._sprites["p3"].body_color.rgba) == pytest.approx(HEALTHY_COLOR)
+    assert tablero._pulsing == {}
+
+
+def test_el_pulso_no_toca_a_las_sanas(tablero):
+    tablero.update_people([_persona("p1", 0, 0), _persona("p2", 3, 3, infected=True, defensa=0)])
+    sano = tuple(tablero._sprites["p1"].body.size)
+    tablero._tick(0.2)
+    assert tuple(tablero._sprites["p1"].body.size) == sano
+    infectado = tablero._sprites["p2"]
+    assert infectado.body.size[0] == pytest.approx(2 * infectado.r * tablero._pulse_scale())
+
+
+def test_con_celdas_muy_chicas_pasa_al_mapa_de_densidad():
+    pytest.importorskip("numpy")
+    widget = BoardWidget(size=(200, 200), pos=(0, 0))
+    try:
+        widget.configure_grid(100)   # 2 px por celda
+        assert widget.lod_active
+        widget.update_people([_persona("p1", 0, 0)])
+        assert widget._sprites == {}
+        widget.update_density_points([0, 0, 99], [0, 0, 5], [True, False, False])
+        assert widget._heat_texture.size == (100, 100)
+        assert tuple(widget._heat_rect.size) == (200, 200)
+    finally:
+        widget._clock.cancel()
@@ -0,0 +1,79 @@
+# tests/test_checkpoint.py
+from __future__ import annotations
+
+import pytest
+
+from core.checkpoint import load_checkpoint, save_checkpoint
+from core.simulador import Simulador
+
+
+def _estado(sim: Simulador) -> list[tuple]:
+    return [(p.id, p.x, p.y, p.defensa, p.infectada,
+             p.infectador.id if p.infectador is not None else None) for p in sim.get_personas()]
+
+
+def _arbol(sim: Simulador) -> dict:
+    return {id_persona: [h.get_persona().id for h in nodo.get_hijos()]
+            for id_persona, nodo in sim.get_arbol().nodos.items()}
+
+
+@pytest.mark.parametrize("motor,tipo_matriz", [
+    ("clasico", "densa"), ("clasico", "dispersa"), ("numpy", "densa"), ("numpy", "dispersa"),
+])
+@pytest.mark.parametrize("comprimir", [False, True])
+def test_ida_y_vuelta_y_la_corrida_sigue_igual(tmp_path, motor, tipo_matriz, comprimir):
+    if motor == "numpy":
+        pytest.importorskip("numpy")
+    original = Simulador(12, 130, 1, 4, True, motor=motor, tipo_matriz=tipo_matriz)
+    original.inicializar()
+    for _ in range(12):
+        original.ejecutar_ronda()
+    original.agregar_persona(0, 0)
+    assert original.get_cantidad_infectadas() > 5
+
+    ruta = str(tmp_path / "corrida.ckpt")
+    save_checkpoint(original, ruta, comprimir=comprimir)
+    copia = load_checkpoint(ruta)
+
+    assert copia.get_ronda_actual() == original.get_ronda_actual()
+    assert _estado(copia) == _estado(original)
+    assert _arbol(copia) == _arbol(original)
+    assert copia.get_estadisticas() == original.get_estadisticas()
+    assert list(map(repr, copia.get_matriz().get_todas_personas())) == \
+        list(map(repr, original.get_matriz().get_todas_personas()))
+
+    # mismo generador: las rondas siguientes dan lo mismo
+    for _ in range(20):
+        assert copia.ejecutar_ronda() == original.ejecutar_ronda()
+    assert _estado(copia) == _estado(original)
+    assert _arbol(copia) == _arbol(original)
+
+
+def test_el_motor_por_teselas_conserva_sus_procesos(tmp_path):
+    pytest.importorskip("numpy")
+    original = Simulador(12, 130, 1, 8, True, motor="teselas", procesos=3)
+    copia = None
+    try:
+        original.inicializar()
+        for _ in range(8):
+            original.ejecutar_ronda()
+        ruta = str(tmp_path / "teselas.ckpt")
+        save_checkpoint(original, ruta)
+        copia = load_checkpoint(ruta)
+
+        assert copia.procesos == 3
+        assert copia.motor_numpy.procesos == 3
+        for _ in range(10):
+            assert copia.ejecutar_ronda() == original.ejecutar_ronda()
+        assert _estado(copia) == _estado(original)
+    finally:
+        original.liberar_motor()
+        if copia is not None:
+            copia.liberar_motor()
+
+
+def test_rechaza_archivos_que_no_son_checkpoints(tmp_path):
+    ruta = tmp_path / "otro.bin"
+    ruta.write_bytes(b"no es un checkpoint")
+    with pytest.raises(ValueError):
+        load_checkpoint(str(ruta))
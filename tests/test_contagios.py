@@ -0,0 +1,51 @@
+# tests/test_contagios.py
+from __future__ import annotations
+
+import pytest
+
+from core.simulador import Simulador
+
+
+def _contagios_por_celda(sim: Simulador) -> None:
+    # El recorrido anterior: cada celda ocupada de la matriz, fila por fila.
+    for x, y in sim.matriz.get_celdas_ocupadas():
+        if not sim.matriz.hay_multiple_personas(x, y):
+            continue
+        personas = sim.matriz.obtener_personas_en(x, y)
+        sanas = [p for p in personas if not p.esta_infectada()]
+        infectadas = [p for p in personas if p.esta_infectada()]
+        if not sanas or not infectadas:
+            continue
+        for sana in sanas:
+            golpes = len(infectadas) if sim.usar_defensa_multiple else 1
+            for _ in range(golpes):
+                sana.reducir_defensa()
+            if sana.defensa == 0 and not sana.esta_infectada():
+                infectador = sim.fuente.choice(infectadas)
+                sana.infectar(infectador)
+                sim.arbol.agregar_contagio(infectador, sana)
+
+
+def _correr(multi: bool, tipo_matriz: str, por_celda: bool) -> list:
+    sim = Simulador(12, 130, 1, 4, multi, tipo_matriz=tipo_matriz)
+    if por_celda:
+        sim._verificar_contagios = lambda: _contagios_por_celda(sim)
+    sim.inicializar()
+
+    historia = []
+    for _ in range(40):
+        estadisticas = sim.ejecutar_ronda()
+        personas = [(p.id, p.x, p.y, p.defensa, p.infectada,
+                     p.infectador.id if p.infectador else None) for p in sim.get_personas()]
+        historia.append((estadisticas, personas))
+    return historia
+
+
+@pytest.mark.parametrize("tipo_matriz", ["densa", "dispersa"])
+@pytest.mark.parametrize("multi", [False, True])
+def test_agrupar_por_celda_da_lo_mismo_que_recorrer_la_matriz(multi, tipo_matriz):
+    agrupado = _correr(multi, tipo_matriz, por_celda=False)
+    por_celda = _correr(multi, tipo_matriz, por_celda=True)
+
+    assert agrupado == por_celda
+    assert agrupado[-1][0]["infectadas"] > 1
@@ -0,0 +1,67 @@
+# tests/test_ensamble.py
+from __future__ import annotations
+
+import pytest
+
+from core.ensamble import agregar_corridas, ejecutar_corrida, ejecutar_ensamble, percentil
+from core.simulador import Simulador
+
+
+PARAMETROS = {"tamano_matriz": 10, "cantidad_personas": 60, "defensa_inicial": 1,
+              "usar_defensa_multiple": True}
+
+
+def test_corrida_sigue_a_la_simulacion_y_repite_el_final():
+    # tablero chico: todas terminan infectadas mucho antes de max_rondas
+    parametros = {"tamano_matriz": 3, "cantidad_personas": 9, "defensa_inicial": 1}
+    corrida = ejecutar_corrida(parametros, 3, 200)
+
+    sim = Simulador(semilla_aleatoria=3, **parametros)
+    sim.inicializar()
+    infectadas = [sim.get_estadisticas()["infectadas"]]
+    while not sim.todas_infectadas() and len(infectadas) <= 200:
+        infectadas.append(sim.ejecutar_ronda()["infectadas"])
+
+    assert all(len(serie) == 201 for serie in corrida.values())
+    assert len(infectadas) < 201
+    assert corrida["infectadas"][:len(infectadas)] == infectadas
+    assert set(corrida["infectadas"][len(infectadas) - 1:]) == {9}
+
+
+def test_el_resultado_no_depende_de_los_trabajadores():
+    semillas = range(20, 32)
+    serie = ejecutar_ensamble(PARAMETROS, semillas, 30, trabajadores=1)
+    en_bloques = ejecutar_ensamble(PARAMETROS, semillas, 30, trabajadores=1, tamano_bloque=5)
+    paralelo = ejecutar_ensamble(PARAMETROS, semillas, 30, trabajadores=3)
+
+    assert serie == en_bloques == paralelo
+    assert serie["corridas"] == 12
+    assert serie["semillas"] == list(semillas)
+    assert serie["rondas"] == 30
+    assert sum(serie["tamano_final"]["distribucion"].values()) == 12
+
+
+def test_agregado_por_ronda():
+    corridas = [
+        {"sanas": [9, 8], "infectadas": [1, 2], "profundidad_arbol": [0, 1]},
+        {"sanas": [9, 5], "infectadas": [1, 5], "profundidad_arbol": [0, 2]},
+        {"sanas": [9, 9], "infectadas": [1, 1], "profundidad_arbol": [0, 0]},
+    ]
+    resumen = agregar_corridas(corridas, [1, 2, 3], percentiles=(50,))
+
+    assert resumen["rondas"] == 1
+    assert resumen["por_ronda"]["infectadas"] == {"media": [1.0, 8 / 3], "p50": [1.0, 2.0]}
+    assert resumen["tamano_final"]["distribucion"] == {1: 1, 2: 1, 5: 1}
+    assert (resumen["tamano_final"]["minimo"], resumen["tamano_final"]["maximo"]) == (1, 5)
+
+
+def test_percentil_interpola_entre_rangos():
+    assert percentil([7], 95) == 7.0
+    assert percentil([0, 10], 25) == 2.5
+    assert percentil([1, 2, 3, 4, 5], 50) == 3
+    assert percentil([1, 2, 3, 4, 5], 100) == 5
+
+
+def test_ensamble_sin_semillas():
+    with pytest.raises(ValueError):
+        ejecutar_ensamble(PARAMETROS, [], 10)
@@ -0,0 +1,87 @@
+# tests/test_eventos.py
+from __future__ import annotations
+
+import pytest
+
+from core.eventos import LectorEventos
+from core.simulador import Simulador
+
+CLAVES = ("ronda", "total_personas", "sanas", "infectadas", "profundidad_arbol")
+
+
+def _foto_simulador(sim: Simulador) -> tuple:
+    personas = [(p.id, p.x, p.y, p.defensa, p.infectada) for p in sim.get_personas()]
+    estadisticas = sim.get_estadisticas()
+    return personas, {clave: estadisticas[clave] for clave in CLAVES}
+
+
+def _foto_lector(lector: LectorEventos) -> tuple:
+    personas = [(d["id"], d["x"], d["y"], d["defensa"], d["infected"]) for d in lector.personas_snapshot()]
+    return personas, lector.get_estadisticas()
+
+
+@pytest.fixture(params=["clasico", "numpy"])
+def grabacion(request, tmp_path):
+    """Una corrida grabada y la foto del simulador vivo en cada ronda."""
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    ruta = str(tmp_path / "corrida.evt")
+    sim = Simulador(12, 130, 1, 8, True, motor=request.param)
+    sim.inicializar()
+    sim.grabar_eventos(ruta)
+
+    fotos = [_foto_simulador(sim)]
+    for ronda in range(1, 61):
+        sim.ejecutar_ronda()
+        fotos.append(_foto_simulador(sim))
+        if ronda == 20:
+            # curas y altas entre rondas quedan en el tramo de la ronda siguiente
+            infectada = sim.get_personas_infectadas()[-1]
+            assert sim.curar_persona(infectada.x, infectada.y)
+            assert sim.agregar_persona(0, 0) or sim.agregar_persona(11, 11)
+    sim.detener_grabacion()
+    assert fotos[-1][1]["infectadas"] > 5
+    return ruta, fotos
+
+
+def test_repetir_ronda_a_ronda_igual_que_en_vivo(grabacion):
+    ruta, fotos = grabacion
+    lector = LectorEventos(ruta)
+    assert lector.cantidad_rondas() == len(fotos)
+    assert _foto_lector(lector) == fotos[0]
+    for foto in fotos[1:]:
+        assert lector.avanzar()
+        assert _foto_lector(lector) == foto
+    assert not lector.avanzar()
+
+
+def test_saltar_a_cualquier_ronda(grabacion):
+    ruta, fotos = grabacion
+    lector = LectorEventos(ruta, intervalo_clave=7)
+    # adelante, atrás (desde fotos clave) y a la misma ronda
+    for ronda in (45, 3, 60, 0, 21, 20, 20, 59, 14):
+        lector.ir_a_ronda(ronda)
+        assert lector.ronda_actual() == ronda
+        assert _foto_lector(lector) == fotos[ronda]
+
+
+def test_rechaza_archivos_que_no_son_registros(tmp_path):
+    ruta = tmp_path / "otro.evt"
+    ruta.write_bytes(b"nada que ver")
+    with pytest.raises(ValueError):
+        LectorEventos(str(ruta))
+
+
+def test_fotos_clave_acotadas_en_memoria(grabacion):
+    ruta, fotos = grabacion
+    cantidad_personas = len(fotos[-1][0])
+    # presupuesto para unas cuatro fotos: el intervalo crece en vez de la memoria
+    lector = LectorEventos(ruta, intervalo_clave=2, memoria_claves=4 * 13 * cantidad_personas)
+    lector.ir_a_ronda(60)
+    assert len(lector._claves) <= 4
+    assert lector.intervalo_clave > 2
+
+    for ronda in (59, 1, 33, 20, 21, 60, 0):
+        lector.ir_a_ronda(ronda)
+        assert _foto_lector(lector) == fotos[ronda]
+    assert len(lector._claves) <= 4
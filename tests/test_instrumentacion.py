@@ -0,0 +1,70 @@
+# tests/test_instrumentacion.py
+from __future__ import annotations
+
+import pytest
+
+from core.instrumentacion import CONTADORES, FASES
+from core.simulador import Simulador
+
+def _simulador(motor: str) -> Simulador:
+    if motor == "numpy":
+        pytest.importorskip("numpy")
+    sim = Simulador(12, 130, 1, 8, True, motor=motor)
+    sim.inicializar()
+    return sim
+
+
+@pytest.mark.parametrize("motor", ["clasico", "numpy"])
+def test_medir_no_cambia_la_simulacion(motor):
+    medido, sin_medir = _simulador(motor), _simulador(motor)
+    medido.activar_instrumentacion()
+    for _ in range(30):
+        estadisticas = medido.ejecutar_ronda()
+        esperadas = sin_medir.ejecutar_ronda()
+        assert set(estadisticas.pop("instrumentacion")) == {"ronda", *FASES, *CONTADORES}
+        assert estadisticas == esperadas
+    assert ([(p.x, p.y, p.defensa, p.infectada) for p in medido.get_personas()]
+            == [(p.x, p.y, p.defensa, p.infectada) for p in sin_medir.get_personas()])
+
+
+@pytest.mark.parametrize("motor", ["clasico", "numpy"])
+def test_contadores_y_fases(motor):
+    sim = _simulador(motor)
+    infectadas_antes = sim.get_cantidad_infectadas()
+    sim.activar_instrumentacion()
+    infecciones_por_ronda = []
+    for _ in range(30):
+        estadisticas = sim.ejecutar_ronda()
+        ronda = estadisticas["instrumentacion"]
+        assert ronda["ronda"] == estadisticas["ronda"]
+        assert 0 <= ronda["celdas_mixtas"] <= ronda["celdas_revisadas"]
+        infecciones_por_ronda.append(ronda["infecciones"])
+
+    resumen = sim.get_instrumentacion()
+    assert resumen["rondas"] == 30
+    assert resumen["totales"]["infecciones"] == sum(infecciones_por_ronda)
+    # sin curas, todas las infecciones nuevas salen de las rondas
+    assert resumen["totales"]["infecciones"] == sim.get_cantidad_infectadas() - infectadas_antes > 0
+    assert resumen["fases"]["aumento_defensa"]["llamadas"] == 10
+    assert resumen["fases"]["estadisticas"]["llamadas"] == 30
+    assert "Instrumentación (30 rondas)" in sim.instrumentacion.formatear()
+
+
+def test_iter_rondas_mide_solo_los_resumenes_entregados():
+    sim = _simulador("clasico")
+    sim.activar_instrumentacion()
+    list(sim.iter_rondas(12, stride=4))
+    resumen = sim.get_instrumentacion()
+    assert resumen["rondas"] == 12
+    assert resumen["fases"]["movimiento"]["llamadas"] == 12
+    assert resumen["fases"]["estadisticas"]["llamadas"] == 3
+
+
+def test_desactivada_no_agrega_datos():
+    sim = _simulador("clasico")
+    assert sim.get_instrumentacion() is None
+    sim.activar_instrumentacion()
+    sim.ejecutar_ronda()
+    sim.desactivar_instrumentacion()
+    assert "instrumentacion" not in sim.ejecutar_ronda()
+    assert sim.get_instrumentacion() is None
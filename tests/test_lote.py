@@ -0,0 +1,70 @@
+# tests/test_lote.py
+from __future__ import annotations
+
+import csv
+import io
+import json
+
+import pytest
+
+import main
+from core.lote import COLUMNAS_ESTADISTICAS, ejecutar_lote
+from core.simulador import Simulador
+
+
+ARGUMENTOS = ["lote", "--tamano", "12", "--personas", "130", "--defensa", "1",
+              "--semilla", "4", "--defensa-multiple", "--rondas", "25"]
+
+
+def _esperado(rondas: int) -> list[dict]:
+    sim = Simulador(12, 130, 1, 4, True)
+    sim.inicializar()
+    return [sim.get_estadisticas()] + [sim.ejecutar_ronda() for _ in range(rondas)]
+
+
+def test_lote_escribe_csv(tmp_path, capsys):
+    ruta = tmp_path / "curva.csv"
+    assert main.main(ARGUMENTOS + ["--salida", str(ruta)]) == 0
+
+    with open(ruta, encoding="utf-8", newline="") as f:
+        filas = list(csv.reader(f))
+    assert tuple(filas[0]) == COLUMNAS_ESTADISTICAS
+    esperado = [[str(e[c]) for c in COLUMNAS_ESTADISTICAS] for e in _esperado(25)]
+    assert filas[1:] == esperado
+
+    resumen = capsys.readouterr().err
+    assert "rondas=25 fin=max_rondas" in resumen
+
+
+def test_lote_escribe_jsonl_por_stdout(capsys):
+    assert main.main(ARGUMENTOS + ["--formato", "jsonl"]) == 0
+
+    salida = capsys.readouterr()
+    lineas = [json.loads(linea) for linea in salida.out.splitlines()]
+    assert lineas == _esperado(25)
+    assert "fin=max_rondas" in salida.err
+
+
+def test_lote_termina_cuando_no_quedan_infectadas():
+    # sin contagios posibles (defensa enorme): el paciente cero se cura a mano
+    sim = Simulador(6, 10, 1000, 1)
+    sim.inicializar()
+    cero = sim.get_personas_infectadas()[0]
+    sim.curar_persona(cero.x, cero.y)
+
+    salida = io.StringIO()
+    resumen = ejecutar_lote(sim, 50, salida, "csv")
+    assert resumen["motivo_fin"] == "sin_infectadas"
+    assert resumen["rondas"] == 0
+    assert salida.getvalue().splitlines() == [",".join(COLUMNAS_ESTADISTICAS), "0,10,10,0,0,0.0"]
+
+
+def test_lote_termina_cuando_todas_estan_infectadas():
+    resumen = ejecutar_lote(Simulador(1, 1, 3, 1), None)
+    assert resumen["motivo_fin"] == "todas_infectadas"
+    assert resumen["rondas"] == 0
+
+
+def test_lote_rechaza_formatos_desconocidos():
+    with pytest.raises(ValueError):
+        ejecutar_lote(Simulador(5, 5, 3, 1), 1, io.StringIO(), "xml")
@@ -0,0 +1,81 @@
+# tests/test_matriz.py
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from core.simulador import Simulador
+from models.matriz import Matriz
+from models.matriz_dispersa import MatrizDispersa
+from models.persona import Persona
+
+
+def _ids(personas: list[Persona]) -> list[str]:
+    return [p.id for p in personas]
+
+
+def _comparar(densa: Matriz, dispersa: MatrizDispersa) -> None:
+    assert dispersa.get_celdas_ocupadas() == densa.get_celdas_ocupadas()
+    assert _ids(dispersa.get_todas_personas()) == _ids(densa.get_todas_personas())
+    assert sorted(dispersa.iterar_celdas_ocupadas()) == densa.get_celdas_ocupadas()
+    assert dispersa.contar_celdas_ocupadas() == len(densa.get_celdas_ocupadas())
+    for x in range(-1, densa.tamano + 1):
+        for y in range(-1, densa.tamano + 1):
+            assert _ids(dispersa.obtener_personas_en(x, y)) == _ids(densa.obtener_personas_en(x, y))
+            assert dispersa.hay_multiple_personas(x, y) == densa.hay_multiple_personas(x, y)
+    assert dispersa.visualizar() == densa.visualizar()
+
+
+def test_dispersa_se_comporta_como_la_densa():
+    rng = random.Random(8)
+    tamano = 7
+    densa, dispersa = Matriz(tamano), MatrizDispersa(tamano)
+    pares = []
+
+    for paso in range(400):
+        operacion = rng.random()
+        if operacion < 0.3 or not pares:
+            # también fuera del tablero: las dos rebotan al borde
+            x, y = rng.randint(-2, tamano + 1), rng.randint(-2, tamano + 1)
+            par = (Persona(f"p{paso}", x, y), Persona(f"p{paso}", x, y))
+            assert densa.agregar_persona(par[0]) and dispersa.agregar_persona(par[1])
+            pares.append(par)
+        elif operacion < 0.9:
+            a, b = rng.choice(pares)
+            x, y = a.x + rng.randint(-1, 1), a.y + rng.randint(-1, 1)
+            assert densa.mover_persona(a, x, y) and dispersa.mover_persona(b, x, y)
+        else:
+            a, b = pares.pop(rng.randrange(len(pares)))
+            assert densa.remover_persona(a) and dispersa.remover_persona(b)
+            assert not densa.remover_persona(a) and not dispersa.remover_persona(b)
+        for a, b in pares:
+            assert (a.x, a.y) == (b.x, b.y)
+        _comparar(densa, dispersa)
+
+
+def test_dispersa_libera_las_celdas_vacias():
+    dispersa = MatrizDispersa(50)
+    persona = Persona("p1", 3, 4)
+    dispersa.agregar_persona(persona)
+    for paso in range(40):
+        dispersa.mover_persona(persona, persona.x + 1, persona.y)
+    assert dispersa.contar_celdas_ocupadas() == 1
+    assert dispersa.get_celdas_ocupadas() == [(43, 4)]
+
+
+@pytest.mark.parametrize("motor", ["clasico", "numpy"])
+@pytest.mark.parametrize("multi", [False, True])
+def test_misma_simulacion_con_cualquier_matriz(motor, multi):
+    if motor == "numpy":
+        pytest.importorskip("numpy")
+    densa = Simulador(12, 130, 1, 4, multi, motor=motor, tipo_matriz="densa")
+    dispersa = Simulador(12, 130, 1, 4, multi, motor=motor, tipo_matriz="dispersa")
+    densa.inicializar()
+    dispersa.inicializar()
+
+    for _ in range(40):
+        assert densa.ejecutar_ronda() == dispersa.ejecutar_ronda()
+    assert _ids(densa.get_matriz().get_todas_personas()) == _ids(dispersa.get_matriz().get_todas_personas())
+    assert sorted(densa.get_arbol().nodos) == sorted(dispersa.get_arbol().nodos)
+    assert len(densa.get_personas_infectadas()) > 1
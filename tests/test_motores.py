@@ -0,0 +1,96 @@
+# tests/test_motores.py
+from __future__ import annotations
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from core.motor_numpy import DIRECCIONES
+from core.simulador import Simulador
+
+
+def _estado(sim: Simulador) -> list[tuple]:
+    return [(p.id, p.x, p.y, p.defensa, p.infectada) for p in sim.get_personas()]
+
+
+class _GuionNumpy:
+    """Reemplazo del rng del motor numpy: las direcciones salen del guion."""
+
+    def __init__(self, rng, guion: list) -> None:
+        self.rng = rng
+        self.guion = iter(guion)
+
+    def integers(self, low, high, size):
+        return next(self.guion)
+
+    def random(self, size):
+        return self.rng.random(size)
+
+
+def _con_guion(sim: Simulador, guion: list) -> None:
+    if sim.motor_numpy is not None:
+        sim.motor_numpy.rng = _GuionNumpy(sim.motor_numpy.rng, guion)
+        return
+    pasos = iter([DIRECCIONES[i] for indices in guion for i in indices.tolist()])
+    sim._obtener_direccion_aleatoria = lambda: next(pasos)
+
+
+@pytest.mark.parametrize("multi", [False, True])
+def test_numpy_igual_al_clasico_con_los_mismos_movimientos(multi):
+    # Los motores usan flujos aleatorios distintos; con el mismo guion de
+    # direcciones, posiciones, defensas e infectadas tienen que coincidir (el
+    # infectador elegido en una celda con varias infectadas puede variar).
+    tamano, cantidad, rondas = 12, 90, 40
+    clasico = Simulador(tamano, cantidad, 1, 3, multi, motor="clasico")
+    vectorizado = Simulador(tamano, cantidad, 1, 3, multi, motor="numpy")
+    clasico.inicializar()
+    vectorizado.inicializar()
+    assert _estado(clasico) == _estado(vectorizado)
+
+    guion = [np.random.default_rng(ronda).integers(0, len(DIRECCIONES), size=cantidad)
+             for ronda in range(rondas)]
+    _con_guion(clasico, guion)
+    _con_guion(vectorizado, guion)
+
+    for _ in range(rondas):
+        a = clasico.ejecutar_ronda()
+        b = vectorizado.ejecutar_ronda()
+        assert _estado(clasico) == _estado(vectorizado)
+        assert (a["sanas"], a["infectadas"]) == (b["sanas"], b["infectadas"])
+        assert len(clasico.get_arbol().nodos) == len(vectorizado.get_arbol().nodos)
+    assert len(vectorizado.get_personas_infectadas()) > 1
+
+
+@pytest.mark.parametrize("multi", [False, True])
+def test_numpy_reproducible_con_la_misma_semilla(multi):
+    a = Simulador(15, 80, 2, 5, multi, motor="numpy")
+    b = Simulador(15, 80, 2, 5, multi, motor="numpy")
+    a.inicializar()
+    b.inicializar()
+    for _ in range(30):
+        assert a.ejecutar_ronda() == b.ejecutar_ronda()
+    assert _estado(a) == _estado(b)
+    for _ in range(30):
+        assert a.ejecutar_ronda() == b.ejecutar_ronda()
+    assert _estado(a) == _estado(b)
+
+
+@pytest.mark.parametrize("procesos", [1, 3])
+def test_teselas_igual_a_numpy(procesos):
+    vectorizado = Simulador(20, 150, 2, 3, True, motor="numpy")
+    teselas = Simulador(20, 150, 2, 3, True, motor="teselas", procesos=procesos)
+    try:
+        vectorizado.inicializar()
+        teselas.inicializar()
+        for ronda in range(1, 31):
+            assert vectorizado.ejecutar_ronda() == teselas.ejecutar_ronda()
+            if ronda == 10:
+                # cambios desde fuera del motor entre rondas
+                persona = vectorizado.get_personas_infectadas()[-1]
+                assert vectorizado.curar_persona(persona.x, persona.y)
+                assert teselas.curar_persona(persona.x, persona.y)
+                assert vectorizado.agregar_persona(0, 0) == teselas.agregar_persona(0, 0)
+        assert _estado(vectorizado) == _estado(teselas)
+        assert sorted(vectorizado.get_arbol().nodos) == sorted(teselas.get_arbol().nodos)
+    finally:
+        teselas.liberar_motor()
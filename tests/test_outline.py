@@ -0,0 +1,105 @@
+# tests/test_outline.py
+from __future__ import annotations
+
+from models.arbol_contagio import ArbolContagio
+from models.persona import Persona
+from ui.app_kivy.outline import CHILDREN_PAGE, TreeOutline
+
+
+def _arbol(hijos_raiz: int) -> ArbolContagio:
+    """p0 contagia a p1..pN; p1 contagia a p1a y p1a a p1b."""
+    arbol = ArbolContagio()
+    raiz = Persona("p0", 0, 0)
+    arbol.establecer_paciente_cero(raiz)
+    hijos = [Persona(f"p{i}", 0, 0) for i in range(1, hijos_raiz + 1)]
+    for hijo in hijos:
+        arbol.agregar_contagio(raiz, hijo)
+    nieto = Persona("p1a", 0, 0)
+    arbol.agregar_contagio(hijos[0], nieto)
+    arbol.agregar_contagio(nieto, Persona("p1b", 0, 0))
+    return arbol
+
+
+def test_empieza_con_la_raiz_cerrada():
+    outline = TreeOutline(_arbol(3))
+    filas = outline.rows()
+    assert [(f.id, f.depth, f.children, f.subtree, f.expanded) for f in filas] == [("p0", 0, 3, 6, False)]
+    assert TreeOutline(ArbolContagio()).rows() == []
+
+
+def test_abrir_y_cerrar_nodos():
+    outline = TreeOutline(_arbol(3))
+    outline.toggle("p0")
+    assert [f.id for f in outline.rows()] == ["p0", "p1", "p2", "p3"]
+    outline.toggle("p1")
+    filas = outline.rows()
+    assert [(f.id, f.depth) for f in filas] == [("p0", 0), ("p1", 1), ("p1a", 2), ("p2", 1), ("p3", 1)]
+    assert filas[1].expanded and filas[1].subtree == 3
+
+    # cerrar un nodo oculta su subárbol pero recuerda lo abierto adentro
+    outline.toggle("p0")
+    assert [f.id for f in outline.rows()] == ["p0"]
+    outline.toggle("p0")
+    assert "p1a" in [f.id for f in outline.rows()]
+
+    # abrir una hoja no agrega filas
+    outline.toggle("p3")
+    assert [f.id for f in outline.rows()].count("p3") == 1
+
+
+def test_paginas_de_hijos():
+    total = 2 * CHILDREN_PAGE + 7
+    outline = TreeOutline(_arbol(total))
+    outline.toggle("p0")
+
+    filas = outline.rows()
+    assert len(filas) == 1 + CHILDREN_PAGE + 1
+    assert filas[-1].page == total - CHILDREN_PAGE
+    assert TreeOutline.row_text(filas[-1]).strip() == f"… +{total - CHILDREN_PAGE} más"
+
+    outline.turn_page("p0", +1)
+    filas = outline.rows()
+    assert filas[1].page == -CHILDREN_PAGE
+    assert filas[2].id == f"p{CHILDREN_PAGE + 1}"
+    assert filas[-1].page == total - 2 * CHILDREN_PAGE
+
+    outline.turn_page("p0", +1)
+    filas = outline.rows()
+    assert [f.id for f in filas[2:]] == [f"p{i}" for i in range(2 * CHILDREN_PAGE + 1, total + 1)]
+    assert filas[1].page == -2 * CHILDREN_PAGE
+
+    # hacia atrás no pasa de la primera página
+    for _ in range(5):
+        outline.turn_page("p0", -1)
+    assert outline.rows()[1].id == "p1"
+
+
+def test_reveal_abre_el_camino_y_la_pagina():
+    total = 3 * CHILDREN_PAGE
+    arbol = _arbol(total)
+    objetivo = f"p{2 * CHILDREN_PAGE + 5}"
+    outline = TreeOutline(arbol)
+
+    assert outline.reveal(objetivo)
+    filas = outline.rows()
+    assert objetivo in [f.id for f in filas if f.page == 0]
+    assert len(filas) <= 1 + CHILDREN_PAGE + 2
+
+    assert outline.reveal("p1b")
+    ids = [f.id for f in outline.rows() if f.page == 0]
+    assert ids[ids.index("p1"):ids.index("p1") + 3] == ["p1", "p1a", "p1b"]
+
+    assert not outline.reveal("nadie")
+
+
+def test_reveal_de_una_raiz_suelta():
+    arbol = _arbol(2)
+    # otro paciente cero (p. ej. infectar desde la interfaz): el primero queda suelto
+    suelto = arbol.raiz
+    arbol.establecer_paciente_cero(Persona("q0", 0, 0))
+    outline = TreeOutline(arbol)
+    assert [f.id for f in outline.rows()] == ["q0"]
+
+    assert outline.reveal("p1a")
+    ids = [f.id for f in outline.rows() if f.page == 0]
+    assert ids[0] == "q0" and suelto.get_persona().id in ids and "p1a" in ids
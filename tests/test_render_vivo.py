@@ -0,0 +1,109 @@
+# tests/test_render_vivo.py
+from __future__ import annotations
+
+import io
+import re
+import shutil
+
+import pytest
+
+from core.simulador import Simulador
+from ui.render_vivo import RenderizadorVivo
+
+_SECUENCIA = re.compile(r"\033\[([?\d;]*)([A-Za-z])")
+
+
+class _Pantalla:
+    """Terminal mínima: entiende lo que escribe RenderizadorVivo (cursor, borrar pantalla y línea)."""
+
+    def __init__(self, columnas: int, filas: int) -> None:
+        self.columnas, self.filas = columnas, filas
+        self.celdas = [[" "] * columnas for _ in range(filas)]
+        self.fila, self.columna = 0, 0
+
+    def escribir(self, texto: str) -> None:
+        posicion = 0
+        for secuencia in _SECUENCIA.finditer(texto):
+            self._texto(texto[posicion:secuencia.start()])
+            parametros, comando = secuencia.groups()
+            if comando == "H":
+                fila, _, columna = parametros.partition(";")
+                self.fila, self.columna = int(fila or 1) - 1, int(columna or 1) - 1
+            elif comando == "J":
+                self.celdas = [[" "] * self.columnas for _ in range(self.filas)]
+            elif comando == "K":
+                self.celdas[self.fila][self.columna:] = [" "] * (self.columnas - self.columna)
+            posicion = secuencia.end()
+        self._texto(texto[posicion:])
+
+    def _texto(self, texto: str) -> None:
+        for caracter in texto:
+            if caracter == "\n":
+                self.fila, self.columna = self.fila + 1, 0
+            else:
+                self.celdas[self.fila][self.columna] = caracter
+                self.columna = self.columna + 1
+
+    def lineas(self) -> list[str]:
+        return ["".join(fila).rstrip() for fila in self.celdas]
+
+
+class _Salida(io.StringIO):
+    def __init__(self) -> None:
+        super().__init__()
+        self.escrituras = 0
+
+    def write(self, texto: str) -> int:
+        self.escrituras = self.escrituras + 1
+        return super().write(texto)
+
+
+def _cuadro_completo(sim: Simulador, estado: str) -> list[str]:
+    salida = io.StringIO()
+    RenderizadorVivo(salida, usar_color=False).dibujar(sim, estado)
+    pantalla = _Pantalla(80, 24)
+    pantalla.escribir(salida.getvalue())
+    return pantalla.lineas()
+
+
+@pytest.fixture(autouse=True)
+def _terminal_80x24(monkeypatch):
+    monkeypatch.setattr(shutil, "get_terminal_size", lambda *args: (80, 24))
+
+
+# el segundo tablero no entra en 80x24 y se recorta
+@pytest.mark.parametrize("tamano, cantidad", [(15, 60), (40, 300)])
+def test_cambios_dejan_la_misma_pantalla_que_redibujar_todo(tamano, cantidad):
+    sim = Simulador(tamano, cantidad, 1, 8, True)
+    sim.inicializar()
+    salida = _Salida()
+    render = RenderizadorVivo(salida, usar_color=False)
+    pantalla = _Pantalla(80, 24)
+
+    largos = []
+    for ronda in range(25):
+        estado = f"Ronda {ronda}"
+        inicio = len(salida.getvalue())
+        render.dibujar(sim, estado)
+        pantalla.escribir(salida.getvalue()[inicio:])
+        largos.append(len(salida.getvalue()) - inicio)
+
+        assert pantalla.lineas() == _cuadro_completo(sim, estado)
+        sim.ejecutar_ronda()
+
+    # un solo write por cuadro, y los cuadros de cambios son más chicos que el primero
+    assert salida.escrituras == 25
+    assert max(largos[1:]) < largos[0]
+
+
+
+def test_tablero_mas_grande_que_la_terminal_se_recorta():
+    sim = Simulador(40, 300, 1, 8, True)
+    sim.inicializar()
+    render = RenderizadorVivo(io.StringIO(), usar_color=False)
+    render.dibujar(sim, "x")
+    # 3 de etiqueta + 4 por columna sin tocar la última columna; debajo queda una fila libre
+    assert render._columnas_visibles == 19
+    assert render._filas_visibles == 21
+    render.cerrar()
+    assert render.salida.getvalue().endswith("\033[24;1H\033[?25h\n")
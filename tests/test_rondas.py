@@ -0,0 +1,73 @@
+# tests/test_rondas.py
+from __future__ import annotations
+
+import io
+
+import pytest
+
+from core.lote import ejecutar_lote
+from core.simulador import Simulador
+
+CLAVES = ("ronda", "total_personas", "sanas", "infectadas", "profundidad_arbol", "r_efectivo")
+
+
+def _estado(sim: Simulador) -> list[tuple]:
+    return [(p.id, p.x, p.y, p.defensa, p.infectada) for p in sim.get_personas()]
+
+
+def _simulador() -> Simulador:
+    sim = Simulador(12, 130, 1, 8, True)
+    sim.inicializar()
+    return sim
+
+
+def test_resumen_con_las_mismas_cifras_que_las_estadisticas():
+    sim = _simulador()
+    for _ in range(15):
+        estadisticas = sim.ejecutar_ronda()
+        assert sim.resumen_ronda()._asdict() == {clave: estadisticas[clave] for clave in CLAVES}
+
+
+def test_ejecutar_rondas_igual_que_ronda_a_ronda():
+    paso_a_paso, de_corrido = _simulador(), _simulador()
+    for _ in range(25):
+        paso_a_paso.ejecutar_ronda()
+    de_corrido.ejecutar_rondas(25)
+    assert de_corrido.get_ronda_actual() == 25
+    assert _estado(de_corrido) == _estado(paso_a_paso)
+    assert de_corrido.get_estadisticas() == paso_a_paso.get_estadisticas()
+
+
+def test_iter_rondas_entrega_cada_stride_y_la_ultima():
+    sim = _simulador()
+    rondas = [resumen.ronda for resumen in sim.iter_rondas(23, stride=5)]
+    assert rondas == [5, 10, 15, 20, 23]
+    assert sim.get_ronda_actual() == 23
+
+
+def test_iter_rondas_se_detiene_con_stop_when():
+    sim = _simulador()
+    resumenes = list(sim.iter_rondas(None, stride=4, stop_when=lambda s: s.get_ronda_actual() >= 10))
+    assert [resumen.ronda for resumen in resumenes] == [4, 8, 10]
+
+    # si ya se cumple antes de empezar no se ejecuta ninguna ronda
+    assert list(sim.iter_rondas(5, stop_when=lambda s: True)) == []
+    assert sim.get_ronda_actual() == 10
+
+
+def test_iter_rondas_rechaza_stride_no_positivo():
+    with pytest.raises(ValueError):
+        next(_simulador().iter_rondas(5, stride=0))
+
+
+def test_lote_cada_n_rondas():
+    completo, salteado = io.StringIO(), io.StringIO()
+    ejecutar_lote(_simulador(), max_rondas=17, salida=completo)
+    resumen = ejecutar_lote(_simulador(), max_rondas=17, salida=salteado, cada=5)
+
+    filas = completo.getvalue().splitlines()
+    # encabezado, ronda inicial, rondas 5, 10, 15 y la última
+    assert salteado.getvalue().splitlines() == [filas[i] for i in (0, 1, 6, 11, 16, 18)]
+    assert resumen["rondas"] == 17
+    with pytest.raises(ValueError):
+        ejecutar_lote(_simulador(), max_rondas=3, cada=0)
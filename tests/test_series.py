@@ -0,0 +1,90 @@
+# tests/test_series.py
+from __future__ import annotations
+
+import pytest
+
+from ui.app_kivy.series import DecimatedSeries, KPIHistory, lttb
+
+
+def test_ventanas_recientes_sin_decimar():
+    serie = DecimatedSeries(capacity=16, recent=8)
+    assert serie.last() is None
+    assert serie.window() == ([], 1)
+    for v in range(5):
+        serie.append(v)
+    assert serie.window() == ([0.0, 1.0, 2.0, 3.0, 4.0], 1)
+    assert serie.window(3) == ([2.0, 3.0, 4.0], 1)
+    assert serie.last() == 4.0
+
+    # el buffer reciente es circular
+    for v in range(5, 12):
+        serie.append(v)
+    assert serie.window(8) == ([float(v) for v in range(4, 12)], 1)
+    assert serie.last() == 11.0
+
+
+def test_historial_acotado_promedia_de_a_pares():
+    serie = DecimatedSeries(capacity=8, recent=4)
+    valores = list(range(1000))
+    for v in valores:
+        serie.append(v)
+        assert len(serie.history) < serie.capacity
+
+    assert serie.count == 1000
+    # cada punto del historial es el promedio de `stride` rondas consecutivas
+    for k, punto in enumerate(serie.history):
+        tramo = valores[k * serie.stride:(k + 1) * serie.stride]
+        assert punto == pytest.approx(sum(tramo) / len(tramo))
+
+    # una ventana más larga que el buffer reciente sale del historial (más el tramo en curso)
+    puntos, stride = serie.window()
+    assert stride == serie.stride
+    ultimo_tramo = valores[-serie._n:] if serie._n else valores[-serie.stride:]
+    assert len(puntos) == len(serie.history) + (1 if serie._n else 0)
+    assert puntos[-1] == pytest.approx(sum(ultimo_tramo) / len(ultimo_tramo))
+
+
+def test_clear_vuelve_al_principio():
+    serie = DecimatedSeries(capacity=4, recent=2)
+    for v in range(50):
+        serie.append(v)
+    serie.clear()
+    assert (serie.count, serie.stride, len(serie.history), serie.last()) == (0, 1, 0, None)
+
+
+def test_lttb_conserva_extremos_y_picos():
+    valores = [0.0] * 1000
+    valores[137] = 50.0
+    valores[612] = -30.0
+    valores[-1] = 2.0
+    puntos = lttb(valores, 40)
+
+    assert len(puntos) == 40
+    assert puntos[0] == (0, 0.0) and puntos[-1] == (999, 2.0)
+    indices = [i for i, _ in puntos]
+    assert indices == sorted(set(indices))
+    assert (137, 50.0) in puntos and (612, -30.0) in puntos
+    assert all(valores[i] == v for i, v in puntos)
+
+
+@pytest.mark.parametrize("umbral", [0, 2, 10, 11])
+def test_lttb_devuelve_todo_si_no_hay_que_reducir(umbral):
+    valores = [float(v % 3) for v in range(10)]
+    assert lttb(valores, umbral) == list(enumerate(valores))
+
+
+def test_kpi_history_ignora_rondas_repetidas():
+    historial = KPIHistory(capacity=64, recent=16)
+    stats = [{"ronda": r, "total_personas": 10, "infectadas": r, "sanas": 10 - r, "profundidad_arbol": r // 2}
+             for r in range(1, 11)]
+    assert historial.extend(stats) == 10
+    # un clic en el tablero publica de nuevo la misma ronda: no se agrega
+    assert not historial.add(dict(stats[-1], sanas=3))
+    assert len(historial) == 10
+
+    puntos = historial.points("infectadas_ratio", max_points=5)
+    assert len(puntos) == 5
+    assert puntos[0] == (0.0, pytest.approx(0.1)) and puntos[-1] == (1.0, pytest.approx(1.0))
+    sanas = historial.points("sanas")
+    assert max(y for _, y in sanas) == 1.0
+    assert historial.points("sanas", rounds=3) == [(0.0, 1.0), (0.5, 0.5), (1.0, 0.0)]
@@ -0,0 +1,101 @@
+# tests/test_simulador.py
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from core.simulador import Simulador
+
+
+def _comprobar_contadores(sim: Simulador) -> None:
+    personas = sim.get_personas()
+    infectadas = [p for p in personas if p.esta_infectada()]
+    sanas = [p for p in personas if not p.esta_infectada()]
+
+    assert sim.get_cantidad_infectadas() == len(infectadas)
+    assert sim.get_cantidad_sanas() == len(sanas)
+    assert sorted(p.id for p in sim.get_personas_infectadas()) == sorted(p.id for p in infectadas)
+    assert [p.id for p in sim.get_personas_sanas()] == [p.id for p in sanas]
+    assert sim.todas_infectadas() == (len(sanas) == 0)
+
+    estadisticas = sim.get_estadisticas()
+    assert (estadisticas["total_personas"], estadisticas["sanas"], estadisticas["infectadas"]) == \
+        (len(personas), len(sanas), len(infectadas))
+
+
+@pytest.mark.parametrize("motor", ["clasico", "numpy"])
+def test_contadores_en_vivo_coinciden_con_un_recuento(motor):
+    if motor == "numpy":
+        pytest.importorskip("numpy")
+    rng = random.Random(3)
+    sim = Simulador(12, 130, 1, 4, True, motor=motor)
+    sim.inicializar()
+    _comprobar_contadores(sim)
+    maximo = 0
+
+    for ronda in range(60):
+        sim.ejecutar_ronda()
+        operacion = rng.random()
+        if operacion < 0.15:
+            infectadas = sim.get_personas_infectadas()
+            if infectadas:
+                persona = rng.choice(infectadas)
+                assert sim.curar_persona(persona.x, persona.y)
+        elif operacion < 0.35:
+            assert sim.agregar_persona(rng.randrange(12), rng.randrange(12))
+        elif operacion < 0.5:
+            # contagio hecho desde fuera del simulador (p. ej. un clic en la UI)
+            sanas = sim.get_personas_sanas()
+            infectadas = sim.get_personas_infectadas()
+            if sanas and infectadas:
+                sana, infectadora = rng.choice(sanas), rng.choice(infectadas)
+                sana.infectar(infectadora)
+                sim.get_arbol().agregar_contagio(infectadora, sana)
+        _comprobar_contadores(sim)
+        maximo = max(maximo, sim.get_cantidad_infectadas())
+    assert maximo > 3
+
+
+def test_las_vistas_se_reusan_mientras_no_cambie_la_poblacion():
+    sim = Simulador(10, 40, 3, 2)
+    sim.inicializar()
+    sanas = sim.get_personas_sanas()
+    assert sim.get_personas_sanas() is sanas
+
+    sim.agregar_persona(0, 0)
+    assert sim.get_personas_sanas() is not sanas
+    assert len(sim.get_personas_sanas()) == len(sanas) + 1
+
+
+@pytest.mark.parametrize("motor", ["clasico", "numpy"])
+def test_r_efectivo_son_los_contagios_de_la_ronda_por_infectada(motor):
+    if motor == "numpy":
+        pytest.importorskip("numpy")
+    sim = Simulador(12, 130, 1, 8, True, motor=motor)
+    sim.inicializar()
+    for _ in range(30):
+        antes = sim.get_cantidad_infectadas()
+        estadisticas = sim.ejecutar_ronda()
+        assert estadisticas["r_efectivo"] == pytest.approx((estadisticas["infectadas"] - antes) / antes)
+    assert sim.get_arbol().contar_nodos() == sim.get_cantidad_infectadas()
+
+
+@pytest.mark.parametrize("motor", ["clasico", "numpy"])
+def test_densidad_por_celda(motor):
+    np = pytest.importorskip("numpy")
+    sim = Simulador(12, 130, 1, 8, True, motor=motor)
+    sim.inicializar()
+    for _ in range(3):
+        sim.ejecutar_rondas(7)
+        sanas, infectadas = sim.get_densidad_celdas()
+        esperadas_sanas = np.zeros((12, 12), dtype=np.int64)
+        esperadas_infectadas = np.zeros((12, 12), dtype=np.int64)
+        for persona in sim.get_personas():
+            if persona.infectada:
+                esperadas_infectadas[persona.x, persona.y] += 1
+            else:
+                esperadas_sanas[persona.x, persona.y] += 1
+        assert (sanas == esperadas_sanas).all()
+        assert (infectadas == esperadas_infectadas).all()
+        assert infectadas.sum() == sim.get_cantidad_infectadas()
@@ -0,0 +1,268 @@
+# tests/test_snapshot.py
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from core.simulador import Simulador
+from ui.app_kivy.snapshot import PeopleSnapshot, PeopleView, apply_changes, extract_changes
+from ui.app_kivy.worker import SimulationWorker
+
+
+def _columnas(snapshot: PeopleSnapshot) -> list[tuple]:
+    return list(zip(snapshot.ids, snapshot.x, snapshot.y, snapshot.defensa, map(bool, snapshot.infected)))
+
+
+def _personas(sim: Simulador) -> list[tuple]:
+    return [(p.id, p.x, p.y, p.defensa, p.infectada) for p in sim.get_personas()]
+
+
+def _simulador(motor: str = "clasico") -> Simulador:
+    if motor == "numpy":
+        pytest.importorskip("numpy")
+    sim = Simulador(12, 130, 1, 8, True, motor=motor)
+    sim.inicializar()
+    return sim
+
+
+def test_update_devuelve_solo_lo_que_cambio():
+    sim = _simulador()
+    snapshot = PeopleSnapshot()
+
+    delta = snapshot.update(sim.get_personas())
+    assert delta.reset and delta.added == len(sim.get_personas())
+    assert list(delta.changed) == list(range(len(sim.get_personas())))
+    assert _columnas(snapshot) == _personas(sim)
+
+    # sin cambios: delta vacío y sin reset
+    delta = snapshot.update(sim.get_personas())
+    assert not delta.reset and len(delta.changed) == 0 and delta.added == 0
+
+    for ronda in range(30):
+        antes = _columnas(snapshot)
+        sim.ejecutar_ronda()
+        if ronda == 10:
+            assert sim.agregar_persona(0, 0) or sim.agregar_persona(11, 11)
+        delta = snapshot.update(sim.get_personas())
+        despues = _personas(sim)
+        assert _columnas(snapshot) == despues
+
+        esperadas = [i for i in range(len(antes)) if antes[i] != despues[i]]
+        esperadas.extend(range(len(antes), len(despues)))
+        assert list(delta.changed) == esperadas
+        assert delta.added == len(despues) - len(antes)
+        assert delta.infected_changed == sum(antes[i][4] != despues[i][4] for i in range(len(antes)))
+        assert not delta.reset
+
+
+def test_clear_y_poblacion_mas_chica_avisan_reset():
+    sim = _simulador()
+    snapshot = PeopleSnapshot()
+    snapshot.update(sim.get_personas())
+
+    snapshot.clear()
+    delta = snapshot.update(sim.get_personas())
+    assert delta.reset and delta.added == len(sim.get_personas())
+
+    # otra simulación con menos personas: se rehace todo
+    otra = Simulador(5, 10, 3, 1)
+    otra.inicializar()
+    delta = snapshot.update(otra.get_personas())
+    assert delta.reset and delta.added == 10 and len(snapshot) == 10
+    assert _columnas(snapshot) == _personas(otra)
+
+
+class _Lecturas(list):
+    """Lista que anota qué posiciones se leyeron."""
+
+    def __init__(self, personas) -> None:
+        super().__init__(personas)
+        self.leidas: set[int] = set()
+
+    def __getitem__(self, i):
+        self.leidas.add(i)
+        return super().__getitem__(i)
+
+
+@pytest.mark.parametrize("motor", ["clasico", "numpy"])
+def test_entre_rondas_solo_mira_las_anotadas(motor):
+    sim = _simulador(motor)
+    snapshot = PeopleSnapshot()
+    assert sim.tomar_cambios() is None
+    snapshot.update(sim.get_personas())
+
+    for ronda in range(30):
+        sim.ejecutar_ronda()
+        personas = sim.get_personas()
+        # después de una ronda hay que compararlas todas
+        assert sim.tomar_cambios() is None
+        snapshot.update(personas)
+
+        if ronda % 5 == 4:
+            infectada = sim.get_personas_infectadas()[-1]
+            assert sim.curar_persona(infectada.x, infectada.y)
+            assert sim.agregar_persona(ronda % 12, 0)
+            personas = sim.get_personas()
+            cambios = sim.tomar_cambios()
+            # la curada es la primera infectada de su celda, no necesariamente `infectada`
+            assert len(cambios) == 1 and personas[cambios[0]].infectada is False
+            assert sim.tomar_cambios() == []
+
+            antes = _columnas(snapshot)
+            lecturas = _Lecturas(personas)
+            delta = snapshot.update(lecturas, cambios)
+            assert lecturas.leidas == {cambios[0], len(personas) - 1}
+            assert list(delta.changed) == [cambios[0], len(personas) - 1]
+            assert delta.infected_changed == 1 and delta.added == 1
+            assert _columnas(snapshot) == _personas(sim)
+            assert antes[cambios[0]] != _columnas(snapshot)[cambios[0]]
+
+    assert sim.get_cantidad_infectadas() > 0
+
+
+# --------- del hilo de simulación a la UI ----------
+
+def test_extract_y_apply_llevan_el_espejo_al_mismo_estado():
+    sim = _simulador()
+    origen = PeopleSnapshot()
+    espejo = PeopleSnapshot()
+
+    for ronda in range(25):
+        if ronda == 12:
+            origen.clear()
+        if ronda == 18:
+            assert sim.agregar_persona(0, 0) or sim.agregar_persona(11, 11)
+        delta = origen.update(sim.get_personas())
+        cambios = extract_changes(origen, delta)
+        delta_espejo = apply_changes(espejo, cambios)
+
+        assert _columnas(espejo) == _columnas(origen) == _personas(sim)
+        assert delta_espejo.reset == delta.reset
+        assert list(delta_espejo.changed) == list(delta.changed)
+        assert (delta_espejo.added, delta_espejo.infected_changed) == (delta.added, delta.infected_changed)
+        sim.ejecutar_ronda()
+
+
+def _tomar_cuadros(worker: SimulationWorker, espejo: PeopleSnapshot, segundos: float) -> list:
+    cuadros = []
+    fin = time.perf_counter() + segundos
+    while time.perf_counter() < fin:
+        cuadro = worker.take_frame()
+        if cuadro is not None:
+            if cuadro.people is not None:
+                apply_changes(espejo, cuadro.people)
+            cuadros.append(cuadro)
+        time.sleep(0.01)
+    return cuadros
+
+
+def test_worker_publica_cuadros_que_reconstruyen_la_simulacion():
+    sim = _simulador()
+    worker = SimulationWorker(sim)
+    worker.rounds_per_sec = 0
+    espejo = PeopleSnapshot()
+    worker.start()
+    try:
+        worker.play()
+        cuadros = _tomar_cuadros(worker, espejo, 0.3)
+        worker.pause()
+        worker.submit(lambda: sim.agregar_persona(0, 0) or sim.agregar_persona(11, 11))
+        cuadros.extend(_tomar_cuadros(worker, espejo, 0.3))
+    finally:
+        worker.stop()
+
+    with worker.lock:
+        assert _columnas(espejo) == _personas(sim)
+        ronda = sim.get_ronda_actual()
+    assert ronda > 0
+    # cada ronda llega una sola vez, en orden, aunque la UI salte cuadros
+    rondas = [stats["ronda"] for cuadro in cuadros for stats in cuadro.rounds_stats]
+    assert rondas == list(range(rondas[0], ronda + 1))
+    assert cuadros[-1].stats["total_personas"] == len(sim.get_personas())
+    assert all(cuadro.error is None for cuadro in cuadros)
+
+
+def test_worker_sobrevive_a_un_error_y_lo_publica():
+    sim = _simulador()
+    worker = SimulationWorker(sim)
+    worker.rounds_per_sec = 0
+    espejo = PeopleSnapshot()
+    hechos = []
+    worker.start()
+    try:
+        worker.submit(lambda: 1 / 0, hechos.append)
+        cuadros = _tomar_cuadros(worker, espejo, 0.3)
+        assert [type(c.error) for c in cuadros if c.error is not None] == [ZeroDivisionError]
+        assert hechos == []
+
+        # el hilo sigue vivo y responde a otros comandos
+        worker.submit(lambda: 7, hechos.append)
+        _tomar_cuadros(worker, espejo, 0.2)
+        assert hechos == [7]
+        assert not worker.is_playing()
+    finally:
+        worker.stop()
+
+
+def _filas_vista(vista: PeopleView) -> list[int]:
+    return [vista.index(k) for k in range(len(vista))]
+
+
+def test_vista_ordena_y_filtra_sin_copiar_columnas():
+    sim = _simulador()
+    sim.ejecutar_rondas(5)
+    snapshot = PeopleSnapshot()
+    snapshot.update(sim.get_personas())
+    vista = PeopleView(snapshot)
+    todas = list(range(len(snapshot)))
+
+    # sin orden ni filtro la vista es el snapshot tal cual
+    assert _filas_vista(vista) == todas
+
+    vista.set_sort("defensa")
+    assert _filas_vista(vista) == sorted(todas, key=lambda i: snapshot.defensa[i])
+    vista.set_sort("defensa", descending=True)
+    assert _filas_vista(vista) == sorted(todas, key=lambda i: snapshot.defensa[i], reverse=True)
+
+    vista.set_sort("estado", descending=True)
+    vista.set_infected_only(True)
+    infectadas = [i for i in todas if snapshot.infected[i]]
+    assert infectadas and _filas_vista(vista) == infectadas
+
+    vista.set_sort(None)
+    vista.set_infected_only(False)
+    assert _filas_vista(vista) == todas
+
+    with pytest.raises(ValueError):
+        vista.set_sort("x")
+
+
+def test_vista_queda_vieja_hasta_rehacerse():
+    sim = _simulador()
+    snapshot = PeopleSnapshot()
+    vista = PeopleView(snapshot)
+    vista.apply_delta(snapshot.update(sim.get_personas()))
+    assert len(vista) == len(sim.get_personas())
+
+    # sin orden ni filtro nunca queda vieja
+    sim.ejecutar_ronda()
+    vista.apply_delta(snapshot.update(sim.get_personas(), sim.tomar_cambios()))
+    assert not vista.stale
+
+    vista.set_infected_only(True)
+    for _ in range(30):
+        sim.ejecutar_ronda()
+        vista.apply_delta(snapshot.update(sim.get_personas(), sim.tomar_cambios()))
+        if vista.stale:
+            break
+    assert vista.stale
+    vista.rebuild()
+    assert not vista.stale
+    assert _filas_vista(vista) == [i for i in range(len(snapshot)) if snapshot.infected[i]]
+
+    # un reset rehace la vista en el acto
+    snapshot.clear()
+    vista.apply_delta(snapshot.update(sim.get_personas()))
+    assert not vista.stale
+    assert _filas_vista(vista) == [i for i in range(len(snapshot)) if snapshot.infected[i]]
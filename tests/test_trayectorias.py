@@ -0,0 +1,88 @@
+# tests/test_trayectorias.py
+from __future__ import annotations
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from core.simulador import Simulador
+from core.trayectorias import LectorTrayectorias
+
+
+@pytest.mark.parametrize("motor", ["clasico", "numpy"])
+def test_crece_en_rondas_y_personas(tmp_path, motor):
+    ruta = str(tmp_path / "corrida.trj")
+    sim = Simulador(12, 20, 2, 3, motor=motor)
+    sim.inicializar()
+    # capacidades chicas para que el archivo se amplíe varias veces
+    sim.grabar_trayectorias(ruta, capacidad_rondas=2)
+
+    esperado = [[(p.x, p.y, p.defensa, p.infectada) for p in sim.get_personas()]]
+    for ronda in range(1, 41):
+        sim.ejecutar_ronda()
+        esperado.append([(p.x, p.y, p.defensa, p.infectada) for p in sim.get_personas()])
+        if ronda in (5, 6, 30):
+            # más personas que las columnas previstas: se rehace el archivo
+            # (las agregadas entre rondas aparecen desde la fila siguiente)
+            for k in range(15):
+                sim.agregar_persona(k % 12, (ronda + 5 * k) % 12)
+
+    # mientras graba, el encabezado ya tiene la cuenta de rondas al día
+    assert LectorTrayectorias(ruta).cantidad_rondas() == len(esperado)
+    grabador = sim.grabador_trayectorias
+    assert grabador.capacidad_rondas >= len(esperado)
+    assert grabador.capacidad_personas >= len(esperado[-1]) > 20
+    sim.detener_trayectorias()
+
+    lector = LectorTrayectorias(ruta)
+    assert lector.cantidad_rondas() == len(esperado)
+    assert lector.cantidad_personas() == len(esperado[-1])
+    assert lector.ids == [p.id for p in sim.get_personas()][:len(esperado[-1])]
+    for ronda, personas in enumerate(esperado):
+        fila = lector.rondas(ronda, ronda + 1)[0]
+        cantidad = len(personas)
+        assert list(zip(fila["x"][:cantidad].tolist(), fila["y"][:cantidad].tolist(),
+                        fila["defensa"][:cantidad].tolist(),
+                        fila["infectada"][:cantidad].astype(bool).tolist())) == personas
+        # las que todavía no existían quedan en -1
+        assert (fila["x"][cantidad:] == -1).all() and (fila["y"][cantidad:] == -1).all()
+
+
+def test_vistas_por_persona_y_por_campo(tmp_path):
+    ruta = str(tmp_path / "corrida.trj")
+    sim = Simulador(10, 30, 2, 8)
+    sim.inicializar()
+    sim.grabar_trayectorias(ruta)
+    xs = [[p.x for p in sim.get_personas()]]
+    for _ in range(10):
+        sim.ejecutar_ronda()
+        xs.append([p.x for p in sim.get_personas()])
+    sim.detener_trayectorias()
+
+    lector = LectorTrayectorias(ruta)
+    assert lector.campo("x").tolist() == xs
+    assert lector.persona("p7")["x"].tolist() == [fila[6] for fila in xs]
+    assert lector.persona(6)["x"].tolist() == [fila[6] for fila in xs]
+
+
+def test_ronda_inicial_distinta_de_cero(tmp_path):
+    ruta = str(tmp_path / "corrida.trj")
+    sim = Simulador(10, 30, 2, 8)
+    sim.inicializar()
+    for _ in range(7):
+        sim.ejecutar_ronda()
+    sim.grabar_trayectorias(ruta)
+    for _ in range(3):
+        sim.ejecutar_ronda()
+    sim.detener_trayectorias()
+
+    lector = LectorTrayectorias(ruta)
+    assert lector.ronda_inicial == 7
+    assert lector.rondas(7, 11).shape[0] == 4
+
+
+def test_rechaza_archivos_que_no_son_trayectorias(tmp_path):
+    ruta = tmp_path / "otro.trj"
+    ruta.write_bytes(b"x" * 128)
+    with pytest.raises(ValueError):
+        LectorTrayectorias(str(ruta))
@@ -0,0 +1,31 @@
+# ui/ansi.py
+from __future__ import annotations
+
+import os
+
+
+# Secuencias ANSI compartidas por los renderizadores de consola
+BORRAR_PANTALLA = "\033[H\033[2J"
+VERDE = "\033[32m"
+ROJO = "\033[31m"
+GRIS = "\033[90m"
+NORMAL = "\033[0m"
+
+
+def consola_con_ansi() -> bool:
+    # la consola clásica de Windows solo entiende ANSI con ANSICON
+    return os.name != "nt" or "ANSICON" in os.environ
+
+
+class ColoresAnsi:
+    """Colores de celda para Visualizador y RenderizadorVivo; sin color si usar_color es False."""
+    usar_color: bool = False
+
+    def _color(self, s: str, code: str) -> str:
+        if not self.usar_color:
+            return s
+        return f"{code}{s}{NORMAL}"
+
+    def _verde(self, s: str) -> str: return self._color(s, VERDE)
+    def _rojo(self, s: str) -> str:  return self._color(s, ROJO)
+    def _gris(self, s: str) -> str:  return self._color(s, GRIS)
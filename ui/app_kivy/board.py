@@ -1,115 +1,387 @@
 # ui/app_kivy/board.py
 from __future__ import annotations
 
-from typing import Callable, List, Dict
+from typing import Callable, List, Dict, Tuple, Any
 from math import sin
 from kivy.uix.widget import Widget
 from kivy.properties import NumericProperty, ListProperty, ObjectProperty
-from kivy.graphics import Color, Line, Ellipse, Rectangle
+from kivy.graphics import Color, Line, Ellipse, Rectangle, InstructionGroup
+from kivy.graphics.texture import Texture
 from kivy.clock import Clock
 from kivy.metrics import dp
 
+# numpy es opcional (solo para el mapa de densidad). No se toma de core.motor_numpy:
+# la reproducción (replay.py) usa este tablero sin importar el motor.
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from ui.app_kivy.snapshot import PeopleSnapshot, PeopleDelta
+
+
+HEALTHY_COLOR = (0.2, 0.8, 0.35, 1)       # verde
+INFECTED_COLOR = (0.9, 0.2, 0.2, 1)       # rojo
+BAR_BG_COLOR = (0.6, 0.6, 0.6, 1)
+BAR_HEALTHY_COLOR = (0.2, 0.7, 1.0, 1)
+BAR_INFECTED_COLOR = (1.0, 0.4, 0.4, 1)
+GRID_COLOR = (0.18, 0.18, 0.18, 1)
+
+# Nivel de detalle: con celdas más chicas que esto (en px) se dibuja un mapa
+# de densidad en una textura en vez de una figura por persona (requiere numpy)
+LOD_MIN_CELL_PX = 5.0
+MIN_VIEW_CELLS = 8
+ZOOM_STEP = 1.25
+
+
+class _PersonSprite:
+    """
+    Instrucciones de canvas de una persona (círculo + barra de defensa). Se
+    crean una vez y después solo se cambian posiciones, tamaños y colores.
+    """
+    __slots__ = ("group", "body_color", "body", "bar_bg", "bar_color", "bar",
+                 "x", "y", "infected", "defensa", "cx", "cy", "r")
+
+    def __init__(self) -> None:
+        self.group = InstructionGroup()
+        self.body_color = Color(*HEALTHY_COLOR)
+        self.body = Ellipse()
+        self.bar_bg = Rectangle()
+        self.bar_color = Color(*BAR_HEALTHY_COLOR)
+        self.bar = Rectangle()
+
+        self.group.add(self.body_color)
+        self.group.add(self.body)
+        self.group.add(Color(*BAR_BG_COLOR))
+        self.group.add(self.bar_bg)
+        self.group.add(self.bar_color)
+        self.group.add(self.bar)
+
+        # último estado dibujado; -1 obliga a ubicarla la primera vez
+        self.x = -1
+        self.y = -1
+        self.infected = False
+        self.defensa = -1
+        # centro y radio base del círculo (para el pulso)
+        self.cx = 0.0
+        self.cy = 0.0
+        self.r = 0.0
+
 
 class BoardWidget(Widget):
-    """Tablero 2D con grid y personas (animación de pulso en infectados)."""
+    """
+    Tablero 2D con grid y personas (animación de pulso en infectados).
+
+    El canvas se arma en modo retenido: el fondo y el grid van en su propio
+    grupo y solo se rehacen si cambia el tamaño; cada persona tiene su grupo
+    de instrucciones, que se actualiza solo cuando cambia su posición, estado
+    o defensa. El pulso cambia el tamaño de los círculos infectados en el lugar.
+
+    Con la rueda del mouse se hace zoom (ventana cuadrada de celdas). Si las
+    celdas visibles quedan muy chicas (tableros grandes), lod_active es True y
+    el tablero espera update_density en lugar de update_people.
+    """
     grid_size = NumericProperty(0)
     people: List[Dict] = ListProperty([])  # cada item: {"id","x","y","infected","defensa"}
     on_cell_action: Callable[[int, int], None] = ObjectProperty(None, allownone=True)
+    # se llama sin argumentos cuando cambia la vista (zoom o nivel de detalle):
+    # quien alimenta el tablero debe volver a mandarle datos
+    on_view_change: Callable[[], None] = ObjectProperty(None, allownone=True)
 
     def __init__(self, on_cell_action: Callable[[int, int], None] | None = None, **kwargs):
         super().__init__(**kwargs)
         self.on_cell_action = on_cell_action
         self._anim_t = 0.0
-        self._clock = Clock.schedule_interval(self._tick, 1 / 30.0)  # 30 FPS
-        self.bind(size=lambda *_: self._redraw(), pos=lambda *_: self._redraw())
         self._bg_color = (0.08, 0.08, 0.08, 1)
 
+        self._sprites: Dict[str, _PersonSprite] = {}
+        self._pulsing: Dict[str, _PersonSprite] = {}  # solo las infectadas
+
+        # ventana visible: celdas [x0, x0 + cells) x [y0, y0 + cells)
+        self._view_x0 = 0
+        self._view_y0 = 0
+        self._view_cells = 0
+        self._lod = False
+        self._heat_texture = None
+        # tras un cambio de vista, el próximo delta se aplica a toda la población
+        self._needs_full = True
+
+        with self.canvas:
+            Color(*self._bg_color)
+            self._bg_rect = Rectangle(pos=self.pos, size=self.size)
+        self._grid_group = InstructionGroup()
+        self._people_group = InstructionGroup()
+        self._heat_group = InstructionGroup()
+        self._heat_rect = Rectangle(pos=self.pos, size=(0, 0))
+        self._heat_group.add(Color(1, 1, 1, 1))
+        self._heat_group.add(self._heat_rect)
+        self.canvas.add(self._heat_group)
+        self.canvas.add(self._grid_group)
+        self.canvas.add(self._people_group)
+
+        self._clock = Clock.schedule_interval(self._tick, 1 / 30.0)  # 30 FPS
+        self.bind(size=lambda *_: self._relayout(), pos=lambda *_: self._relayout())
+
     # --------- API ----------
     def configure_grid(self, n: int) -> None:
         self.grid_size = int(n)
-        self._redraw()
+        self._view_x0 = 0
+        self._view_y0 = 0
+        self._view_cells = self.grid_size
+        self._needs_full = True
+        self._relayout()
+
+    @property
+    def lod_active(self) -> bool:
+        return self._lod
+
+    def visible_region(self) -> Tuple[int, int, int, int]:
+        """Celdas visibles como (x0, y0, x1, y1), con x1 e y1 excluidos."""
+        x1 = min(self.grid_size, self._view_x0 + self._view_cells)
+        y1 = min(self.grid_size, self._view_y0 + self._view_cells)
+        return self._view_x0, self._view_y0, x1, y1
+
+    def update_density(self, healthy: Any, infected: Any) -> None:
+        """
+        Modo LOD: recibe sanas e infectadas por celda (arreglos n x n indexados
+        [x, y], ver Simulador.get_densidad_celdas), arma un buffer RGBA de la
+        ventana visible y lo copia a una sola textura.
+        """
+        x0, y0, x1, y1 = self.visible_region()
+        if x1 <= x0 or y1 <= y0:
+            return
+        # la textura va fila por fila desde abajo: filas = y, columnas = x
+        rgba = self._density_rgba(healthy[x0:x1, y0:y1].T, infected[x0:x1, y0:y1].T)
+
+        height, width = rgba.shape[0], rgba.shape[1]
+        texture = self._heat_texture
+        if texture is None or texture.size != (width, height):
+            texture = Texture.create(size=(width, height), colorfmt="rgba")
+            texture.mag_filter = "nearest"
+            texture.min_filter = "nearest"
+            self._heat_texture = texture
+        texture.blit_buffer(rgba.tobytes(), colorfmt="rgba", bufferfmt="ubyte")
+
+        self._heat_rect.texture = texture
+        self._heat_rect.pos = self.pos
+        self._heat_rect.size = self.size
+
+    def update_people_delta(self, snapshot: PeopleSnapshot, delta: PeopleDelta) -> None:
+        """
+        Aplica solo lo que cambió (ver SimulationController.refresh_board).
+        Tras un reset o un cambio de vista recorre todo el snapshot una vez.
+        """
+        self._heat_rect.size = (0, 0)
+        full = delta.reset or self._needs_full
+        self._needs_full = False
+        if full:
+            self._people_group.clear()
+            self._sprites = {}
+            self._pulsing = {}
+            indices = range(len(snapshot))
+        else:
+            indices = delta.changed
+
+        ids, xs, ys = snapshot.ids, snapshot.x, snapshot.y
+        for i in indices:
+            x, y = xs[i], ys[i]
+            if not self._in_view(x, y):
+                # salió de la ventana con zoom (o nunca estuvo)
+                if ids[i] in self._sprites:
+                    self._remove_person(ids[i])
+                continue
+            self._apply_person(ids[i], x, y, bool(snapshot.infected[i]), snapshot.defensa[i])
+
+    def update_density_points(self, xs: Any, ys: Any, infected: Any) -> None:
+        """
+        Como update_density, pero a partir de la posición e infección de cada
+        persona (p. ej. el estado de un registro de eventos).
+        """
+        n = self.grid_size
+        celdas = np.asarray(xs, dtype=np.int64) * n + np.asarray(ys, dtype=np.int64)
+        infectada = np.asarray(infected, dtype=bool)
+        total = np.bincount(celdas, minlength=n * n)
+        infectadas = np.bincount(celdas[infectada], minlength=n * n)
+        self.update_density((total - infectadas).reshape(n, n), infectadas.reshape(n, n))
 
     def update_people(self, people: List[Dict]) -> None:
         self.people = people
-        self._redraw()
+        if self._lod:
+            # en modo LOD no se dibujan personas: hay que usar update_density
+            return
+        self._heat_rect.size = (0, 0)
+        seen = set()
+        for p in people:
+            pid = p["id"]
+            seen.add(pid)
+            self._apply_person(pid, int(p["x"]), int(p["y"]), bool(p.get("infected")), int(p.get("defensa", 0)))
+
+        if len(seen) != len(self._sprites):
+            for pid in [pid for pid in self._sprites if pid not in seen]:
+                self._remove_person(pid)
 
     # --------- Animación ----------
     def _tick(self, dt: float) -> None:
         self._anim_t = (self._anim_t + dt) % 1000
-        if self.people:
-            self._redraw_dynamic()
+        if not self._pulsing:
+            return
+        scale = self._pulse_scale()
+        for sprite in self._pulsing.values():
+            rr = sprite.r * scale
+            sprite.body.pos = (sprite.cx - rr, sprite.cy - rr)
+            sprite.body.size = (2 * rr, 2 * rr)
+
+    def _pulse_scale(self) -> float:
+        k = (sin(self._anim_t * 4.0) + 1.0) * 0.5  # 0..1
+        return 1.0 + 0.25 * k
 
     # --------- Render ----------
     def _cell_rect(self, x: int, y: int):
-        if self.grid_size <= 0:
+        if self._view_cells <= 0:
             return 0, 0, 0, 0
-        cw = self.width / self.grid_size
-        ch = self.height / self.grid_size
-        return (self.x + x * cw, self.y + y * ch, cw, ch)
+        cw = self.width / self._view_cells
+        ch = self.height / self._view_cells
+        return (self.x + (x - self._view_x0) * cw, self.y + (y - self._view_y0) * ch, cw, ch)
 
-    def _redraw(self) -> None:
-        self.canvas.clear()
-        with self.canvas:
-            Color(*self._bg_color)
-            Rectangle(pos=self.pos, size=self.size)
-
-            # Grid
-            if self.grid_size > 0:
-                Color(0.18, 0.18, 0.18, 1)
-                for i in range(self.grid_size + 1):
-                    # vertical
-                    x = self.x + i * (self.width / self.grid_size)
-                    Line(points=[x, self.y, x, self.top], width=1)
-                    # horizontal
-                    y = self.y + i * (self.height / self.grid_size)
-                    Line(points=[self.x, y, self.right, y], width=1)
-
-            # Personas (estático; el pulso se renderiza en _redraw_dynamic)
-            for p in self.people:
-                self._draw_person(p, pulsing=False)
-
-    def _redraw_dynamic(self) -> None:
-        # Solo re-dibuja las “capas” de personas (encima del grid)
-        self._redraw()  # por simplicidad; si necesitas más rendimiento, separa en grupos canvas
-
-        # Añade pulso sobre infectados
-        with self.canvas:
-            for p in self.people:
-                if p.get("infected"):
-                    self._draw_person(p, pulsing=True)
-
-    def _draw_person(self, p: Dict, pulsing: bool) -> None:
-        x, y = int(p["x"]), int(p["y"])
-        cx, cy, cw, ch = self._cell_rect(x, y)
-        r = min(cw, ch) * 0.32
-        cxm, cym = cx + cw / 2, cy + ch / 2
-
-        if p.get("infected"):
-            base = (0.9, 0.2, 0.2, 1)  # rojo
-        else:
-            base = (0.2, 0.8, 0.35, 1)  # verde
+    def _in_view(self, x: int, y: int) -> bool:
+        return (self._view_x0 <= x < self._view_x0 + self._view_cells
+                and self._view_y0 <= y < self._view_y0 + self._view_cells)
 
-        if pulsing:
-            k = (sin(self._anim_t * 4.0) + 1.0) * 0.5  # 0..1
-            rr = r * (1.0 + 0.25 * k)
-            Color(*base)
-            Ellipse(pos=(cxm - rr, cym - rr), size=(2 * rr, 2 * rr))
-        else:
-            Color(*base)
-            Ellipse(pos=(cxm - r, cym - r), size=(2 * r, 2 * r))
+    def _relayout(self) -> None:
+        # cambió el tamaño, la posición, el zoom o la cantidad de celdas: se
+        # rehace el grid y se reubican las personas (sin crear instrucciones)
+        self._bg_rect.pos = self.pos
+        self._bg_rect.size = self.size
+
+        cells = self._view_cells
+        cell_px = min(self.width, self.height) / cells if cells > 0 else 0.0
+        lod = np is not None and cells > 0 and cell_px < LOD_MIN_CELL_PX
+        lod_changed = lod != self._lod
+        self._lod = lod
+        if lod_changed:
+            self._needs_full = True
+
+        self._grid_group.clear()
+        if lod:
+            # las figuras por persona no se ven a este tamaño: se liberan
+            self._people_group.clear()
+            self._sprites = {}
+            self._pulsing = {}
+            self._heat_rect.pos = self.pos
+            self._heat_rect.size = self.size
+        elif cells > 0:
+            self._heat_rect.size = (0, 0)
+            self._grid_group.add(Color(*GRID_COLOR))
+            for i in range(cells + 1):
+                # vertical
+                x = self.x + i * (self.width / cells)
+                self._grid_group.add(Line(points=[x, self.y, x, self.top], width=1))
+                # horizontal
+                y = self.y + i * (self.height / cells)
+                self._grid_group.add(Line(points=[self.x, y, self.right, y], width=1))
+
+        for sprite in self._sprites.values():
+            self._place(sprite)
+
+        if lod_changed and self.on_view_change:
+            self.on_view_change()
 
-        # defensa “barra” breve
-        def_val = int(p.get("defensa", 0))
-        Color(0.6, 0.6, 0.6, 1)
+    def _zoom(self, factor: float, cx: float, cy: float) -> None:
+        # factor > 1 acerca; (cx, cy) es el punto de la pantalla que queda fijo
+        if self.grid_size <= 0 or self.width <= 0 or self.height <= 0:
+            return
+        cells = int(round(self._view_cells / factor))
+        cells = max(min(MIN_VIEW_CELLS, self.grid_size), min(self.grid_size, cells))
+        if cells == self._view_cells:
+            return
+
+        # celda bajo el cursor antes y después del zoom
+        fx = (cx - self.x) / self.width
+        fy = (cy - self.y) / self.height
+        gx = self._view_x0 + fx * self._view_cells
+        gy = self._view_y0 + fy * self._view_cells
+        self._view_cells = cells
+        self._view_x0 = max(0, min(self.grid_size - cells, int(round(gx - fx * cells))))
+        self._view_y0 = max(0, min(self.grid_size - cells, int(round(gy - fy * cells))))
+        self._needs_full = True
+
+        lod_before = self._lod
+        self._relayout()
+        # si cambió el nivel de detalle, _relayout ya avisó
+        if self._lod == lod_before and self.on_view_change:
+            self.on_view_change()
+
+    def _density_rgba(self, healthy: Any, infected: Any) -> Any:
+        # color por celda: rojo según la fracción de infectadas, verde según
+        # la de sanas; el brillo crece con el logaritmo de la cantidad
+        total = healthy + infected
+        maximo = int(total.max()) if total.size > 0 else 0
+        frac = infected / np.maximum(total, 1)
+        brillo = np.where(total > 0, 0.35 + 0.65 * np.log1p(total) / np.log1p(max(maximo, 1)), 0.0)
+
+        rgba = np.empty(total.shape + (4,), dtype=np.uint8)
+        fondo = [int(255 * c) for c in self._bg_color[:3]]
+        rgba[..., 0] = np.where(total > 0, (230 * frac + 50 * (1 - frac)) * brillo, fondo[0])
+        rgba[..., 1] = np.where(total > 0, (205 * (1 - frac) + 50 * frac) * brillo, fondo[1])
+        rgba[..., 2] = np.where(total > 0, 60 * brillo, fondo[2])
+        rgba[..., 3] = 255
+        return rgba
+
+    def _apply_person(self, pid: str, x: int, y: int, infected: bool, defensa: int) -> None:
+        sprite = self._sprites.get(pid)
+        if sprite is None:
+            sprite = _PersonSprite()
+            self._sprites[pid] = sprite
+            self._people_group.add(sprite.group)
+        elif sprite.x == x and sprite.y == y and sprite.infected == infected and sprite.defensa == defensa:
+            return
+
+        if infected != sprite.infected:
+            sprite.body_color.rgba = INFECTED_COLOR if infected else HEALTHY_COLOR
+            sprite.bar_color.rgba = BAR_INFECTED_COLOR if infected else BAR_HEALTHY_COLOR
+            if infected:
+                self._pulsing[pid] = sprite
+            else:
+                self._pulsing.pop(pid, None)
+
+        sprite.x = x
+        sprite.y = y
+        sprite.infected = infected
+        sprite.defensa = defensa
+        self._place(sprite)
+
+    def _remove_person(self, pid: str) -> None:
+        sprite = self._sprites.pop(pid)
+        self._pulsing.pop(pid, None)
+        self._people_group.remove(sprite.group)
+
+    def _place(self, sprite: _PersonSprite) -> None:
+        if not self._in_view(sprite.x, sprite.y):
+            # fuera de la ventana con zoom: se oculta sin borrar las instrucciones
+            sprite.r = 0.0
+            sprite.body.size = (0, 0)
+            sprite.bar_bg.size = (0, 0)
+            sprite.bar.size = (0, 0)
+            return
+
+        cx, cy, cw, ch = self._cell_rect(sprite.x, sprite.y)
+        sprite.r = min(cw, ch) * 0.32
+        sprite.cx, sprite.cy = cx + cw / 2, cy + ch / 2
+
+        rr = sprite.r * self._pulse_scale() if sprite.infected else sprite.r
+        sprite.body.pos = (sprite.cx - rr, sprite.cy - rr)
+        sprite.body.size = (2 * rr, 2 * rr)
+
+        # defensa “barra” breve (capada a 5 para visual)
         bw = cw * 0.6
         bh = dp(3)
-        bx = cxm - bw / 2
+        bx = sprite.cx - bw / 2
         by = cy + ch * 0.1
-        Rectangle(pos=(bx, by), size=(bw, bh))
-        # fill defensa (capado a 5 para visual)
-        fill = max(0.0, min(1.0, def_val / 5.0))
-        Color(0.2, 0.7, 1.0, 1) if not p.get("infected") else Color(1.0, 0.4, 0.4, 1)
-        Rectangle(pos=(bx, by), size=(bw * fill, bh))
+        fill = max(0.0, min(1.0, sprite.defensa / 5.0))
+        sprite.bar_bg.pos = (bx, by)
+        sprite.bar_bg.size = (bw, bh)
+        sprite.bar.pos = (bx, by)
+        sprite.bar.size = (bw * fill, bh)
 
     # --------- Interacción ----------
     def on_touch_down(self, touch):
@@ -117,10 +389,17 @@ class BoardWidget(Widget):
             return super().on_touch_down(touch)
         if self.grid_size <= 0:
             return True
-        cw = self.width / self.grid_size
-        ch = self.height / self.grid_size
-        gx = int((touch.x - self.x) // cw)
-        gy = int((touch.y - self.y) // ch)
+        if touch.is_mouse_scrolling:
+            # en Kivy "scrolldown" es girar la rueda hacia adelante
+            if touch.button == "scrolldown":
+                self._zoom(ZOOM_STEP, touch.x, touch.y)
+            elif touch.button == "scrollup":
+                self._zoom(1 / ZOOM_STEP, touch.x, touch.y)
+            return True
+        cw = self.width / self._view_cells
+        ch = self.height / self._view_cells
+        gx = self._view_x0 + int((touch.x - self.x) // cw)
+        gy = self._view_y0 + int((touch.y - self.y) // ch)
         if self.on_cell_action:
             self.on_cell_action(gx, gy)
-        return True
\ No newline at end of file
+        return True
@@ -0,0 +1,118 @@
+# ui/app_kivy/health.py
+from __future__ import annotations
+
+import time
+from typing import List, Optional
+
+from kivy.metrics import dp
+from kivymd.uix.boxlayout import MDBoxLayout
+from kivymd.uix.button import MDFlatButton
+from kivymd.uix.label import MDLabel
+from kivymd.uix.selectioncontrol import MDSwitch
+
+from ui.app_kivy.snapshot import PeopleSnapshot, PeopleDelta, PeopleView
+from ui.app_kivy.virtual_list import ROW_HEIGHT, VirtualList
+
+
+COLUMNS = ("ID", "Defensa", "Estado", "X", "Y")
+# Con orden o filtro activos, la vista se rehace a lo sumo cada tanto (s)
+RESORT_INTERVAL = 1.0
+# (clave, descendente, texto del botón) que recorre el botón de orden
+SORT_CYCLE = (
+    (None, False, "Orden: lista"),
+    ("defensa", False, "Orden: defensa ↑"),
+    ("defensa", True, "Orden: defensa ↓"),
+    ("estado", True, "Orden: infectadas primero"),
+)
+
+
+class _HealthRow(MDBoxLayout):
+    def __init__(self, **kwargs):
+        super().__init__(orientation="horizontal", size_hint_y=None, height=ROW_HEIGHT, **kwargs)
+        self.cells: List[MDLabel] = [MDLabel(text="", halign="left") for _ in COLUMNS]
+        for label in self.cells:
+            self.add_widget(label)
+
+    def show(self, values: Optional[tuple]) -> None:
+        for label, value in zip(self.cells, values or ("",) * len(COLUMNS)):
+            label.text = value
+
+
+class HealthTable(VirtualList):
+    """
+    Tabla de salud virtualizada (ver VirtualList): los datos salen de las
+    columnas de un PeopleSnapshot a través de una PeopleView (orden y
+    filtro), así que abrirla no depende de la cantidad de personas.
+    """
+
+    def __init__(self, snapshot: PeopleSnapshot, **kwargs):
+        super().__init__(self._row_count, self._make_row, self._fill_row, **kwargs)
+        self.view = PeopleView(snapshot)
+        self._sort_pos = 0
+        self._last_rebuild = 0.0
+
+        # barra: orden, filtro y cantidad de filas
+        bar = MDBoxLayout(orientation="horizontal", spacing=dp(8), size_hint_y=None, height=dp(36))
+        self.btn_sort = MDFlatButton(text=SORT_CYCLE[0][2], on_release=lambda *_: self._next_sort())
+        self.sw_infected = MDSwitch(active=False)
+        self.sw_infected.bind(active=lambda _sw, value: self._set_infected_only(bool(value)))
+        self.lbl_count = MDLabel(text="", halign="right")
+        bar.add_widget(self.btn_sort)
+        bar.add_widget(self.sw_infected)
+        bar.add_widget(MDLabel(text="Solo infectadas", halign="left"))
+        bar.add_widget(self.lbl_count)
+        self.add_widget(bar)
+
+        header = MDBoxLayout(orientation="horizontal", size_hint_y=None, height=dp(26))
+        for txt in COLUMNS:
+            header.add_widget(MDLabel(text=f"[b]{txt}[/b]", markup=True, halign="left"))
+        self.add_widget(header)
+
+        self.add_body()
+
+    # --------- API ----------
+    def apply_delta(self, delta: PeopleDelta) -> None:
+        """Tras actualizar el snapshot: reescribe solo las filas visibles."""
+        self.view.apply_delta(delta)
+        if self.view.stale and time.perf_counter() - self._last_rebuild >= RESORT_INTERVAL:
+            self._rebuild_view()
+        self.refresh()
+
+    def refresh(self) -> None:
+        super().refresh()
+        self.lbl_count.text = f"{len(self.view)} filas"
+
+    # --------- Filas de la VirtualList ----------
+    def _row_count(self) -> int:
+        return len(self.view)
+
+    def _make_row(self) -> _HealthRow:
+        return _HealthRow()
+
+    def _fill_row(self, row: _HealthRow, k: Optional[int]) -> None:
+        if k is None:
+            row.show(None)
+            return
+        snap = self.view.snapshot
+        i = self.view.index(k)
+        row.show((snap.ids[i], str(snap.defensa[i]),
+                  "INFECTADA" if snap.infected[i] else "SANA",
+                  str(snap.x[i]), str(snap.y[i])))
+
+    # --------- Internos ----------
+    def _rebuild_view(self) -> None:
+        self.view.rebuild()
+        self._last_rebuild = time.perf_counter()
+
+    def _next_sort(self) -> None:
+        self._sort_pos = (self._sort_pos + 1) % len(SORT_CYCLE)
+        key, descending, text = SORT_CYCLE[self._sort_pos]
+        self.btn_sort.text = text
+        self.view.set_sort(key, descending)
+        self._last_rebuild = time.perf_counter()
+        self.scroll_to(0)
+
+    def _set_infected_only(self, active: bool) -> None:
+        self.view.set_infected_only(active)
+        self._last_rebuild = time.perf_counter()
+        self.scroll_to(0)
@@ -3,73 +3,112 @@ from __future__ import annotations
 
 from typing import Dict, List
 from kivy.uix.widget import Widget
-from kivy.properties import ListProperty
+from kivy.properties import ObjectProperty
 from kivy.graphics import Color, Line
 from kivy.metrics import dp
 from kivymd.uix.boxlayout import MDBoxLayout
 from kivymd.uix.card import MDCard
 from kivymd.uix.label import MDLabel
+from kivymd.uix.button import MDFlatButton
+
+from ui.app_kivy.series import KPIHistory
+
+
+# Colores de cada serie en la sparkline
+SERIES_COLORS = {
+    "infectadas_ratio": (0.35, 0.75, 1.0, 1),
+    "sanas": (0.35, 0.85, 0.45, 0.8),
+    "profundidad_arbol": (1.0, 0.75, 0.3, 0.8),
+}
+# Ventanas que recorre el botón de zoom (rondas; None = toda la corrida)
+WINDOWS = (None, 1000, 100)
+# Puntos por línea: el costo de dibujar no depende del largo de la corrida
+SPARK_MAX_POINTS = 200
 
 
 class Sparkline(Widget):
-    data = ListProperty([])  # valores 0..1
+    """
+    Líneas del historial de KPIs. Las instrucciones Line se crean una vez y
+    en cada refresco solo se les cambian los puntos (a lo sumo
+    SPARK_MAX_POINTS por serie).
+    """
+    window = ObjectProperty(None, allownone=True)  # rondas visibles (None = toda la corrida)
 
-    def __init__(self, **kwargs):
+    def __init__(self, history: KPIHistory, **kwargs):
         super().__init__(**kwargs)
-        self.bind(size=lambda *_: self._redraw(), pos=lambda *_: self._redraw(), data=lambda *_: self._redraw())
-
-    def _redraw(self):
-        self.canvas.clear()
-        if not self.data:
-            return
+        self.history = history
+        self._lines: Dict[str, Line] = {}
         with self.canvas:
-            Color(0.35, 0.75, 1.0, 1)
-            n = len(self.data)
-            if n < 2:
-                return
-            points = []
-            for i, v in enumerate(self.data):
-                x = self.x + (i / (n - 1)) * self.width
-                y = self.y + v * self.height
-                points.extend([x, y])
-            Line(points=points, width=1.2)
+            for nombre in KPIHistory.SERIES:
+                Color(*SERIES_COLORS[nombre])
+                self._lines[nombre] = Line(points=[], width=1.2 if nombre == "infectadas_ratio" else 1.0)
+        self.bind(size=lambda *_: self.redraw(), pos=lambda *_: self.redraw(), window=lambda *_: self.redraw())
+
+    def redraw(self) -> None:
+        max_points = max(2, min(SPARK_MAX_POINTS, int(self.width)))
+        for nombre, line in self._lines.items():
+            points: List[float] = []
+            for u, v in self.history.points(nombre, self.window, max_points):
+                points.append(self.x + u * self.width)
+                points.append(self.y + v * self.height)
+            line.points = points if len(points) >= 4 else []
 
 
 class KPIsWidget(MDCard):
-    """Tarjetas KPI + sparkline de infectados."""
+    """Tarjetas KPI + sparkline del historial (infectadas, sanas y profundidad del árbol)."""
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.radius = dp(14)
         self.padding = dp(10)
         self.md_bg_color = (0.12, 0.12, 0.12, 1)
-        self.series_infectados: List[float] = []
+        self.history = KPIHistory()
 
         self.lbl_ronda = MDLabel(text="Ronda: -", halign="left")
         self.lbl_tot = MDLabel(text="Personas: -", halign="left")
         self.lbl_sanas = MDLabel(text="Sanas: -", halign="left")
         self.lbl_inf = MDLabel(text="Infectadas: -", halign="left")
         self.lbl_prof = MDLabel(text="Profundidad árbol: -", halign="left")
+        self.lbl_r = MDLabel(text="R efectivo: -", halign="left")
+        # tiempos por fase: solo tiene texto si la instrumentación está activa
+        self.lbl_perf = MDLabel(text="", halign="left", theme_text_color="Hint", font_style="Caption")
 
-        self.spark = Sparkline(size_hint_y=None, height=dp(48))
+        self.spark = Sparkline(self.history, size_hint_y=None, height=dp(48))
+        self.btn_window = MDFlatButton(text="Todo", on_release=lambda *_: self._next_window())
 
         box = MDBoxLayout(orientation="vertical", spacing=dp(6))
         row1 = MDBoxLayout(orientation="horizontal", spacing=dp(8), size_hint_y=None, height=dp(24))
         row1.add_widget(self.lbl_ronda)
         row1.add_widget(self.lbl_prof)
+        row1.add_widget(self.lbl_r)
 
         row2 = MDBoxLayout(orientation="horizontal", spacing=dp(8), size_hint_y=None, height=dp(24))
         row2.add_widget(self.lbl_tot)
         row2.add_widget(self.lbl_sanas)
         row2.add_widget(self.lbl_inf)
 
+        row3 = MDBoxLayout(orientation="horizontal", size_hint_y=None, height=dp(36))
+        row3.add_widget(self.lbl_perf)
+        row3.add_widget(self.btn_window)
+
         box.add_widget(row1)
         box.add_widget(row2)
+        box.add_widget(row3)
         box.add_widget(self.spark)
         self.add_widget(box)
 
     def reset_series(self) -> None:
-        self.series_infectados = []
-        self.spark.data = []
+        self.history.clear()
+        self.spark.redraw()
+
+    def _next_window(self) -> None:
+        i = WINDOWS.index(self.spark.window) if self.spark.window in WINDOWS else 0
+        self.spark.window = WINDOWS[(i + 1) % len(WINDOWS)]
+        self.btn_window.text = "Todo" if self.spark.window is None else f"Últimas {self.spark.window}"
+
+    def add_rounds(self, rounds_stats: List[Dict[str, int]]) -> None:
+        """Agrega al historial cada ronda ejecutada, aunque la UI no haya mostrado todas."""
+        if self.history.extend(rounds_stats):
+            self.spark.redraw()
 
     def update_stats(self, stats: Dict[str, int]) -> None:
         if not stats:
@@ -79,12 +118,20 @@ class KPIsWidget(MDCard):
         self.lbl_sanas.text = f"Sanas: {stats.get('sanas', '-')}"
         self.lbl_inf.text = f"Infectadas: {stats.get('infectadas', '-')}"
         self.lbl_prof.text = f"Profundidad árbol: {stats.get('profundidad_arbol', '-')}"
+        r_efectivo = stats.get('r_efectivo')
+        self.lbl_r.text = f"R efectivo: {r_efectivo:.2f}" if r_efectivo is not None else "R efectivo: -"
+
+        medida = stats.get('instrumentacion')
+        if medida:
+            self.lbl_perf.text = (f"mov {1000 * medida['movimiento']:.1f} ms · "
+                                  f"contagios {1000 * medida['contagios']:.1f} ms · "
+                                  f"defensa {1000 * medida['aumento_defensa']:.1f} ms · "
+                                  f"stats {1000 * medida['estadisticas']:.1f} ms\n"
+                                  f"celdas {medida['celdas_revisadas']} · mixtas {medida['celdas_mixtas']} · "
+                                  f"infecciones {medida['infecciones']}")
+        else:
+            self.lbl_perf.text = ""
 
-        # sparkline normalizada por total
-        tot = max(1, int(stats.get('total_personas', 1)))
-        inf = int(stats.get('infectadas', 0))
-        ratio = max(0.0, min(1.0, inf / tot))
-        self.series_infectados.append(ratio)
-        # muestra últimos 80 puntos
-        self.series_infectados = self.series_infectados[-80:]
-        self.spark.data = self.series_infectados[:]
+        # solo entra al historial si es una ronda nueva (un clic no agrega punto)
+        if self.history.add(stats):
+            self.spark.redraw()
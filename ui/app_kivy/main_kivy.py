@@ -6,13 +6,13 @@ import os, sys, time
 if __name__ in {"__main__", "__mp_main__"}:
     sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
-from typing import Optional, Dict, Any, List
+from array import array
+from typing import Optional, Dict, Any, List, Callable
 
 from kivy.clock import Clock
 from kivy.metrics import dp
 from kivy.core.window import Window
 from kivy.uix.widget import Widget
-from kivy.uix.gridlayout import GridLayout
 
 from kivymd.app import MDApp
 from kivymd.uix.boxlayout import MDBoxLayout
@@ -23,7 +23,6 @@ from kivymd.uix.label import MDLabel
 from kivymd.uix.slider import MDSlider
 from kivymd.uix.selectioncontrol import MDSwitch
 from kivymd.uix.dialog import MDDialog
-from kivymd.uix.scrollview import MDScrollView
 from kivymd.uix.expansionpanel import MDExpansionPanel, MDExpansionPanelOneLine
 
 # Top bar: alias para versiones antiguas
@@ -36,6 +35,11 @@ from core.simulador import Simulador
 from ui.app_kivy.board import BoardWidget
 from ui.app_kivy.kpis import KPIsWidget
 from ui.app_kivy.tree import open_tree_dialog
+from ui.app_kivy.health import HealthTable
+from ui.app_kivy.snapshot import PeopleSnapshot, PeopleDelta, apply_changes
+from ui.app_kivy.worker import SimulationWorker
+
+EMPTY_DELTA = PeopleDelta(False, array("i"), 0, 0)
 
 
 # --- utilidades UI ---
@@ -51,12 +55,25 @@ def make_hint(text: str) -> MDLabel:
 
 # ==================== CONTROLADOR ====================
 class SimulationController:
-    """Conecta el motor (Simulador) con la UI y el reloj de animación."""
+    """
+    Conecta el motor (Simulador) con la UI. Las rondas corren en un
+    SimulationWorker (otro hilo) a su propio ritmo; la UI toma el último
+    cuadro publicado una vez por frame (_poll) y lo reparte con on_after_step.
+    """
     def __init__(self) -> None:
         self.sim: Optional[Simulador] = None
-        self._event = None
+        self.worker: Optional[SimulationWorker] = None
+        self._event = None  # lectura de cuadros en el reloj de la UI
         self.rounds_per_sec: float = 2.0
-        self.on_after_step = None  # callback(stats: dict[str, Any]) -> None
+        self.instrumented: bool = False
+        self.on_after_step = None  # callback(stats, rounds_stats) -> None, con cada cuadro nuevo
+        # copia del lado de la UI de lo que publicó el worker; refresh_board manda solo las diferencias
+        self.snapshot = PeopleSnapshot()
+        self._delta: PeopleDelta = EMPTY_DELTA
+        self._density: Optional[tuple] = None
+        self._stats: Dict[str, Any] = {}
+        # pedir personas aunque el tablero esté en modo LOD (p. ej. con la tabla de salud abierta)
+        self.keep_people: bool = False
 
     # Motor
     def new_simulation(self, n_grid: int, n_people: int, defensa: int,
@@ -70,56 +87,137 @@ class SimulationController:
             usar_defensa_multiple=multidaño
         )
         self.sim.inicializar()
+        self.set_instrumentation(self.instrumented)
 
-    def step(self) -> Dict[str, Any]:
-        if not self.sim:
-            return {}
-        stats = self.sim.ejecutar_ronda()
-        if self.on_after_step:
-            self.on_after_step(stats)
-        return stats
+        self.snapshot.clear()
+        self._delta = EMPTY_DELTA
+        self._density = None
+        self._stats = self.sim.get_estadisticas()
+
+        self.worker = SimulationWorker(self.sim)
+        self.worker.rounds_per_sec = self.rounds_per_sec
+        self.worker.start()
+        self._event = Clock.schedule_interval(self._poll, 1 / 30.0)
+
+    def step(self) -> None:
+        # la ronda corre en el worker; el resultado llega con el próximo cuadro
+        if self.worker:
+            self.worker.step()
 
     def play(self) -> None:
-        if not self.sim:
-            return
-        self.stop()
-        interval = 1.0 / max(0.1, self.rounds_per_sec)
-        self._event = Clock.schedule_interval(lambda dt: self.step(), interval)
+        if self.worker:
+            self.worker.play()
 
     def pause(self) -> None:
-        self.stop()
+        if self.worker:
+            self.worker.pause()
+
+    def is_playing(self) -> bool:
+        return self.worker is not None and self.worker.is_playing()
 
     def stop(self) -> None:
+        """Detiene el worker y la lectura de cuadros (al crear otra simulación o al salir)."""
         if self._event is not None:
             self._event.cancel()
             self._event = None
+        if self.worker is not None:
+            self.worker.stop()
+            self.worker = None
 
     def set_speed(self, rps: float) -> None:
-        """Actualiza la velocidad y reinicia el scheduler si está corriendo."""
+        """Rondas por segundo del worker (no depende de los FPS de la UI)."""
         self.rounds_per_sec = max(0.1, rps)
-        if self._event is not None:
-            # reprogramar con el nuevo intervalo
-            self.play()
+        if self.worker:
+            self.worker.rounds_per_sec = self.rounds_per_sec
+
+    def set_instrumentation(self, active: bool) -> None:
+        """Activa/desactiva la medición por fase (se ve en los KPIs)."""
+        self.instrumented = active
+        if not self.sim:
+            return
+        if self.worker:
+            self.worker.submit(lambda: self._apply_instrumentation(active))
+        else:
+            self._apply_instrumentation(active)
+
+    def _apply_instrumentation(self, active: bool) -> None:
+        if active:
+            self.sim.activar_instrumentacion()
+        else:
+            self.sim.desactivar_instrumentacion()
+
+    def _poll(self, _dt: float) -> None:
+        frame = self.worker.take_frame() if self.worker else None
+        if frame is None:
+            return
+        self._stats = frame.stats
+        if frame.people is not None:
+            self._delta = apply_changes(self.snapshot, frame.people)
+        if frame.density is not None:
+            self._density = frame.density
+        if self.on_after_step:
+            self.on_after_step(frame.stats, frame.rounds_stats)
+        if frame.error is not None:
+            # el worker ya se pausó; se puede seguir con Play o crear otra simulación
+            self.pause()
+            MDDialog(title="Error en la simulación",
+                     text=f"{type(frame.error).__name__}: {frame.error}\nLa simulación quedó en pausa.").open()
 
     # API para la UI
     def grid_size(self) -> int:
-        return self.sim.get_matriz().get_tamano() if self.sim else 0
-
-    def persons_snapshot(self) -> List[Dict[str, Any]]:
-        if not self.sim:
-            return []
-        data: List[Dict[str, Any]] = []
-        for p in self.sim.get_personas():
-            x, y = p.get_posicion()
-            data.append({"id": p.id, "x": x, "y": y, "infected": p.esta_infectada(), "defensa": p.defensa})
-        return data
+        return self.sim.tamano_matriz if self.sim else 0
+
+    def take_delta(self) -> PeopleDelta:
+        """Lo que cambió en self.snapshot con el último cuadro (una sola vez)."""
+        delta = self._delta
+        self._delta = EMPTY_DELTA
+        return delta
+
+    def refresh_board(self, board: BoardWidget, delta: Optional[PeopleDelta] = None) -> None:
+        """
+        Manda al tablero el último cuadro: densidad por celda en modo LOD y,
+        si no, solo las personas de `delta`. También le dice al worker qué
+        incluir en los cuadros siguientes.
+        """
+        if not self.worker:
+            return
+        lod = board.lod_active
+        want_people = not lod or self.keep_people
+        if self.worker.want_density != lod or self.worker.want_people != want_people:
+            self.worker.want_density = lod
+            self.worker.want_people = want_people
+            if not lod:
+                self._density = None
+            self.worker.request_frame()
+
+        if lod:
+            if self._density is not None:
+                board.update_density(*self._density)
+            return
+        board.update_people_delta(self.snapshot, delta if delta is not None else EMPTY_DELTA)
 
     def stats(self) -> Dict[str, Any]:
-        return self.sim.get_estadisticas() if self.sim else {}
+        return dict(self._stats) if self.sim else {}
 
-    def tree_text(self) -> str:
-        return self.sim.get_arbol().visualizar() if self.sim else "(sin árbol)"
+    def show_tree(self) -> None:
+        """Abre el árbol desplegable; lo lee con el lock del worker, que lo sigue modificando."""
+        if not self.sim:
+            MDDialog(title="Aviso", text="Crea una simulación primero.").open()
+            return
+        open_tree_dialog(self.sim.get_arbol(), self.worker.lock)
+
+    def submit_action(self, action: Callable[[int, int], bool], x: int, y: int,
+                      on_done: Callable[[bool], None]) -> None:
+        """
+        Encola un clic del tablero (curar/infectar/agregar) para que el worker
+        lo aplique entre dos rondas; on_done(ok) se llama en el hilo de la UI.
+        """
+        if not self.worker:
+            return
+        self.worker.submit(lambda: action(x, y),
+                           lambda ok: Clock.schedule_once(lambda _dt: on_done(bool(ok))))
 
+    # Acciones sobre la simulación: corren en el worker (ver submit_action)
     def curar_at(self, x: int, y: int) -> bool:
         return self.sim.curar_persona(persona_x := x, persona_y := y) if self.sim else False  # noqa
 
@@ -157,6 +255,8 @@ class ControlPanel(MDCard):
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
+        # tabla de salud abierta (None si está cerrada)
+        self._health_table: Optional[HealthTable] = None
         self.padding = dp(12)
         self.size_hint_x = 0.36
         self.radius = dp(16)
@@ -202,7 +302,7 @@ class ControlPanel(MDCard):
         self.btn_minus = MDIconButton(icon="minus", on_release=lambda *_: self._bump_speed(-0.5))
         self.lbl_speed = MDLabel(text="Velocidad: 2.0 r/s",
                                  halign="center", size_hint_x=None, width=dp(160))
-        self.slider_speed = MDSlider(min=0.5, max=20, value=2.0, step=0.5)
+        self.slider_speed = MDSlider(min=0.5, max=200, value=2.0, step=0.5)
         self.slider_speed.bind(value=self._on_speed_change)
         self.btn_plus = MDIconButton(icon="plus", on_release=lambda *_: self._bump_speed(+0.5))
         row_speed.add_widget(self.btn_minus)
@@ -211,6 +311,13 @@ class ControlPanel(MDCard):
         row_speed.add_widget(self.btn_plus)
         controls_box.add_widget(row_speed)
 
+        self.sw_perf = MDSwitch(active=False)
+        self.sw_perf.bind(active=lambda _sw, value: self.controller.set_instrumentation(bool(value)))
+        row_perf = MDBoxLayout(orientation="horizontal", spacing=dp(8), size_hint_y=None, height=dp(34))
+        row_perf.add_widget(self.sw_perf)
+        row_perf.add_widget(MDLabel(text="Medir tiempos por fase (KPIs)", halign="left"))
+        controls_box.add_widget(row_perf)
+
         # INDICADORES
         self.kpis = KPIsWidget()
         self.kpis.size_hint_y = None
@@ -289,53 +396,41 @@ class ControlPanel(MDCard):
 
     # ------- acciones de herramientas -------
     def _show_tree(self) -> None:
-        txt = self.controller.tree_text() if self.controller.sim else "(sin árbol)"
-        open_tree_dialog(txt)
+        self.controller.show_tree()
 
     def _open_health_table(self) -> None:
         if not self.controller.sim:
             MDDialog(title="Aviso", text="Crea una simulación primero.").open()
             return
 
-        rows = []
-        for d in self.controller.persons_snapshot():
-            estado = "INFECTADA" if d["infected"] else "SANA"
-            rows.append((d["id"], str(d["defensa"]), estado, str(d["x"]), str(d["y"])))
-
-        wrapper = MDBoxLayout(orientation="vertical", size_hint=(0.95, None),
-                              height=dp(420), padding=(dp(6), 0, dp(6), dp(6)))
-        scroll = MDScrollView(size_hint=(1, 1))
-        wrapper.add_widget(scroll)
-
-        grid = GridLayout(cols=5, size_hint_y=None, size_hint_x=1, padding=dp(8), spacing=dp(10))
-        grid.bind(minimum_height=grid.setter("height"))
-
-        def H(txt):  # header
-            return MDLabel(text=f"[b]{txt}[/b]", markup=True, halign="left",
-                           size_hint_y=None, height=dp(26))
-        def C(txt):  # cell
-            return MDLabel(text=txt, halign="left", size_hint_y=None, height=dp(24))
+        # la tabla lee las columnas del snapshot del controlador; mientras el
+        # diálogo está abierto, _apply_health_delta reescribe las filas visibles
+        self.controller.keep_people = True
+        self.controller.refresh_board(self.board)
 
-        for h in ("ID", "Defensa", "Estado", "X", "Y"):
-            grid.add_widget(H(h))
-
-        for rid, defn, est, xs, ys in rows:
-            grid.add_widget(C(rid));  grid.add_widget(C(defn))
-            grid.add_widget(C(est));  grid.add_widget(C(xs))
-            grid.add_widget(C(ys))
-
-        scroll.add_widget(grid)
+        table = HealthTable(self.controller.snapshot, size_hint=(0.95, None), height=dp(420),
+                            padding=(dp(6), 0, dp(6), dp(6)))
 
         dlg = None
         dlg = MDDialog(
             title="Tabla de salud (personas)",
             type="custom",
-            content_cls=wrapper,
+            content_cls=table,
             buttons=[MDFillRoundFlatIconButton(text="Cerrar", icon="close",
                                                on_release=lambda *_: dlg.dismiss())],
         )
+        dlg.bind(on_dismiss=lambda *_: self._close_health_table())
+        self._health_table = table
         dlg.open()
 
+    def _apply_health_delta(self, delta: PeopleDelta) -> None:
+        if self._health_table is not None:
+            self._health_table.apply_delta(delta)
+
+    def _close_health_table(self) -> None:
+        self.controller.keep_people = False
+        self._health_table = None
+
     def _snapshot_board(self) -> None:
         os.makedirs("screenshots", exist_ok=True)
         path = os.path.join("screenshots", f"tablero_{int(time.time())}.png")
@@ -364,9 +459,8 @@ class ControlPanel(MDCard):
 
         self.controller.new_simulation(n, p, d, seed, mult)
         self.board.configure_grid(n)
-        self.board.update_people(self.controller.persons_snapshot())
         self.kpis.reset_series()
-        self.kpis.update_stats(self.controller.stats())
+        self.refresh_views()
         MDDialog(title="Simulación", text="Simulación inicializada.").open()
 
     def _on_play(self) -> None:
@@ -382,9 +476,17 @@ class ControlPanel(MDCard):
         if not self.controller.sim:
             MDDialog(title="Aviso", text="Crea una simulación primero.").open()
             return
-        stats = self.controller.step()
-        self.board.update_people(self.controller.persons_snapshot())
-        self.kpis.update_stats(stats)
+        self.controller.step()
+
+    def refresh_views(self, stats: Optional[Dict[str, Any]] = None,
+                      rounds_stats: Optional[List[Dict[str, Any]]] = None) -> None:
+        """Tablero, tabla de salud (si está abierta) y KPIs a partir del mismo cuadro."""
+        delta = self.controller.take_delta()
+        self.controller.refresh_board(self.board, delta)
+        self._apply_health_delta(delta)
+        if rounds_stats:
+            self.kpis.add_rounds(rounds_stats)
+        self.kpis.update_stats(stats if stats is not None else self.controller.stats())
 
 
 # ==================== LAYOUT RAÍZ ====================
@@ -407,6 +509,7 @@ class RootLayout(MDBoxLayout):
         # Cuerpo: tablero + panel
         body = MDBoxLayout(orientation="horizontal", spacing=dp(8), padding=dp(8))
         self.board = BoardWidget(on_cell_action=self._on_board_action)
+        self.board.on_view_change = lambda: self.controller.refresh_board(self.board)
         self.board.size_hint_x = 0.64
 
         self.panel = ControlPanel()
@@ -428,23 +531,23 @@ class RootLayout(MDBoxLayout):
     def _on_board_action(self, x: int, y: int) -> None:
         if not self.controller.sim:
             return
-        ok = False
-        if self.mode == "infect":
-            ok = self.controller.infectar_en_celda(x, y)
-        elif self.mode == "cure":
-            ok = self.controller.curar_at(x, y)
-        elif self.mode == "add":
-            ok = self.controller.agregar_at(x, y)
-
-        if ok:
-            self.board.update_people(self.controller.persons_snapshot())
-            self.panel.kpis.update_stats(self.controller.stats())
-        else:
-            MDDialog(title="Sin acción", text=f"No se pudo aplicar acción en ({x}, {y}).").open()
+        action = {
+            "infect": self.controller.infectar_en_celda,
+            "cure": self.controller.curar_at,
+            "add": self.controller.agregar_at,
+        }.get(self.mode)
+        if action is None:
+            return
+
+        def done(ok: bool) -> None:
+            # el cambio llega al tablero con el próximo cuadro del worker
+            if not ok:
+                MDDialog(title="Sin acción", text=f"No se pudo aplicar acción en ({x}, {y}).").open()
 
-    def _after_step(self, stats: Dict[str, Any]) -> None:
-        self.board.update_people(self.controller.persons_snapshot())
-        self.panel.kpis.update_stats(stats)
+        self.controller.submit_action(action, x, y, done)
+
+    def _after_step(self, stats: Dict[str, Any], rounds_stats: List[Dict[str, Any]]) -> None:
+        self.panel.refresh_views(stats, rounds_stats)
 
     # --- acciones topbar ---
     def _toggle_add(self) -> None:
@@ -460,8 +563,7 @@ class RootLayout(MDBoxLayout):
         self._toast("Modo: Curar (clic en celda)")
 
     def _show_tree(self) -> None:
-        txt = self.controller.tree_text() if self.controller.sim else "(sin árbol)"
-        open_tree_dialog(txt)
+        self.controller.show_tree()
 
     # --- utilidades ---
     def _toast(self, msg: str) -> None:
@@ -470,7 +572,7 @@ class RootLayout(MDBoxLayout):
     def _on_key(self, _window, key, _scancode, _codepoint, _modifiers):
         # SPACE = play/pause, → = step
         if key == 32:
-            if self.controller._event:
+            if self.controller.is_playing():
                 self.controller.pause()
                 self._toast("Pause")
             else:
@@ -492,6 +594,10 @@ class ResidentEvilApp(MDApp):
         self.theme_cls.primary_palette = "Red"
         return RootLayout()
 
+    def on_stop(self):
+        # el hilo de simulación no debe sobrevivir a la ventana
+        self.root.controller.stop()
+
 
 if __name__ == "__main__":
     ResidentEvilApp().run()
@@ -0,0 +1,111 @@
+# ui/app_kivy/outline.py
+from __future__ import annotations
+
+from typing import Dict, List, NamedTuple
+
+from models.arbol_contagio import ArbolContagio
+from models.nodo_arbol import NodoArbol
+
+
+# Hijos que se muestran por página debajo de un nodo abierto
+CHILDREN_PAGE = 50
+
+
+class OutlineRow(NamedTuple):
+    """Una línea del árbol desplegable."""
+    id: str               # persona del nodo (o del padre, en las filas de paginación)
+    depth: int            # sangría (0 = raíz)
+    children: int         # contagios directos
+    subtree: int          # nodos del subárbol, contando el nodo
+    expanded: bool
+    page: int             # 0 = nodo; +N / -N = "… N más" / "… N antes" (pasan de página)
+
+
+class TreeOutline:
+    """
+    Vista desplegable de un ArbolContagio: guarda solo qué nodos están
+    abiertos (y en qué página de hijos) y arma las filas recorriendo esos
+    nodos, así que el costo depende de lo abierto y no del tamaño del árbol.
+    Quien la use desde otro hilo debe tener tomado el lock del worker al
+    llamar a rows y reveal.
+    """
+
+    def __init__(self, arbol: ArbolContagio) -> None:
+        self.arbol = arbol
+        self.expanded: Dict[str, int] = {}   # id -> primer hijo de la página visible
+        self.extra_roots: List[str] = []     # raíces sueltas que se mostraron con reveal
+
+    def toggle(self, id_persona: str) -> None:
+        if id_persona in self.expanded:
+            del self.expanded[id_persona]
+        else:
+            self.expanded[id_persona] = 0
+
+    def turn_page(self, id_persona: str, direction: int) -> None:
+        if id_persona in self.expanded:
+            self.expanded[id_persona] = max(0, self.expanded[id_persona] + direction * CHILDREN_PAGE)
+
+    def rows(self) -> List[OutlineRow]:
+        filas: List[OutlineRow] = []
+        raices: List[NodoArbol] = []
+        if self.arbol.raiz is not None:
+            raices.append(self.arbol.raiz)
+        for id_persona in self.extra_roots:
+            nodo = self.arbol.nodos.get(id_persona)
+            if nodo is not None and nodo.get_padre() is None and nodo is not self.arbol.raiz:
+                raices.append(nodo)
+
+        # preorden con pila explícita, igual que ArbolContagio.visualizar
+        pila: List[tuple] = [(nodo, 0) for nodo in reversed(raices)]
+        while pila:
+            nodo, profundidad = pila.pop()
+            if isinstance(nodo, OutlineRow):
+                filas.append(nodo)
+                continue
+            id_persona = nodo.get_persona().id
+            hijos = nodo.get_hijos()
+            abierto = id_persona in self.expanded and len(hijos) > 0
+            filas.append(OutlineRow(id_persona, profundidad, len(hijos), nodo.tamano_subarbol, abierto, 0))
+            if not abierto:
+                continue
+
+            inicio = min(self.expanded[id_persona], max(0, len(hijos) - 1))
+            inicio = inicio - inicio % CHILDREN_PAGE
+            fin = min(len(hijos), inicio + CHILDREN_PAGE)
+            # se apilan al revés para que salgan en orden
+            if fin < len(hijos):
+                pila.append((OutlineRow(id_persona, profundidad + 1, 0, 0, False, len(hijos) - fin), 0))
+            for i in range(fin - 1, inicio - 1, -1):
+                pila.append((hijos[i], profundidad + 1))
+            if inicio > 0:
+                pila.append((OutlineRow(id_persona, profundidad + 1, 0, 0, False, -inicio), 0))
+        return filas
+
+    def reveal(self, id_persona: str) -> bool:
+        """
+        Abre los ancestros de la persona (y la página de hijos donde está)
+        para que su fila aparezca en rows. False si no está en el árbol.
+        """
+        nodo = self.arbol.nodos.get(id_persona)
+        if nodo is None:
+            return False
+        while nodo.get_padre() is not None:
+            padre = nodo.get_padre()
+            self.expanded[padre.get_persona().id] = padre.get_hijos().index(nodo)
+            nodo = padre
+        id_raiz = nodo.get_persona().id
+        if nodo is not self.arbol.raiz and id_raiz not in self.extra_roots:
+            self.extra_roots.append(id_raiz)
+        return True
+
+    @staticmethod
+    def row_text(fila: OutlineRow) -> str:
+        sangria = "    " * fila.depth
+        if fila.page > 0:
+            return f"{sangria}… +{fila.page} más"
+        if fila.page < 0:
+            return f"{sangria}… {-fila.page} antes"
+        if fila.children == 0:
+            return f"{sangria}  {fila.id}"
+        marca = "▾" if fila.expanded else "▸"
+        return f"{sangria}{marca} {fila.id}  ({fila.children} directos · {fila.subtree} en el subárbol)"
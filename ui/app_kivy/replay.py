@@ -0,0 +1,169 @@
+# ui/app_kivy/replay.py
+from __future__ import annotations
+
+# --- permitir ejecutar como módulo: python -m ui.app_kivy.replay eventos.evt
+import os, sys
+if __name__ in {"__main__", "__mp_main__"}:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from kivy.clock import Clock
+from kivy.metrics import dp
+
+from kivymd.app import MDApp
+from kivymd.uix.boxlayout import MDBoxLayout
+from kivymd.uix.card import MDCard
+from kivymd.uix.button import MDIconButton
+from kivymd.uix.label import MDLabel
+from kivymd.uix.slider import MDSlider
+
+# Solo el lector de eventos: la reproducción no necesita el motor de simulación
+from core.eventos import LectorEventos
+from ui.app_kivy.board import BoardWidget
+from ui.app_kivy.kpis import KPIsWidget
+
+
+# ==================== CONTROLADOR ====================
+class ReplayController:
+    """
+    Reproduce un registro de eventos sobre el tablero y los KPIs existentes.
+    A cualquier velocidad: en cada frame avanza las rondas que correspondan y
+    dibuja solo el estado final (los estados intermedios se saltan).
+    """
+    def __init__(self, lector: LectorEventos, board: BoardWidget, kpis: KPIsWidget) -> None:
+        self.lector = lector
+        self.board = board
+        self.kpis = kpis
+        self.rounds_per_sec: float = 5.0
+        self._event = None
+        self._pendiente: float = 0.0
+        self.on_refresh = None  # callback() -> None, p. ej. para mover un slider
+
+        self.board.configure_grid(lector.tamano_matriz)
+        # al cambiar el nivel de detalle o el zoom se vuelve a dibujar el estado actual
+        self.board.on_view_change = self._refresh
+        self._refresh()
+
+    def play(self) -> None:
+        self.stop()
+        self._pendiente = 0.0
+        self._event = Clock.schedule_interval(self._tick, 1 / 30.0)
+
+    def pause(self) -> None:
+        self.stop()
+
+    def stop(self) -> None:
+        if self._event is not None:
+            self._event.cancel()
+            self._event = None
+
+    def set_speed(self, rps: float) -> None:
+        self.rounds_per_sec = max(0.1, rps)
+
+    def step(self) -> None:
+        if self.lector.avanzar(1):
+            self._refresh()
+
+    def seek(self, posicion: int) -> None:
+        """Salta a la posición `posicion` (0 = primera ronda grabada)."""
+        retrocede = posicion < self.lector.posicion_ronda
+        self.lector.ir_a_posicion(posicion)
+        if retrocede:
+            self.kpis.reset_series()
+        self._refresh()
+
+    def _tick(self, dt: float) -> None:
+        self._pendiente = self._pendiente + dt * self.rounds_per_sec
+        pasos = int(self._pendiente)
+        if pasos <= 0:
+            return
+        self._pendiente = self._pendiente - pasos
+
+        if not self.lector.avanzar(pasos):
+            self.stop()
+            return
+        self._refresh()
+
+    def _refresh(self) -> None:
+        lector = self.lector
+        if self.board.lod_active:
+            # tablero grande: conteos por celda en vez de una figura por persona
+            self.board.update_density_points(lector.x, lector.y, lector.infectada)
+        else:
+            self.board.update_people(lector.personas_snapshot())
+        self.kpis.update_stats(self.lector.get_estadisticas())
+        if self.on_refresh:
+            self.on_refresh()
+
+
+# ==================== LAYOUT ====================
+class ReplayLayout(MDBoxLayout):
+    def __init__(self, ruta: str, **kwargs):
+        super().__init__(**kwargs)
+        self.orientation = "horizontal"
+        self.spacing = dp(8)
+        self.padding = dp(8)
+
+        self.board = BoardWidget()
+        self.board.size_hint_x = 0.64
+
+        panel = MDCard(orientation="vertical", padding=dp(12), spacing=dp(10), radius=dp(16),
+                       size_hint_x=0.36, md_bg_color=(18/255, 18/255, 18/255, 1))
+        self.kpis = KPIsWidget(size_hint_y=None, height=dp(200))
+
+        self.controller = ReplayController(LectorEventos(ruta), self.board, self.kpis)
+        self.controller.on_refresh = self._sync_slider
+        ultima = max(0, self.controller.lector.cantidad_rondas() - 1)
+
+        toolbar = MDBoxLayout(orientation="horizontal", spacing=dp(8), size_hint_y=None, height=dp(44))
+        toolbar.add_widget(MDIconButton(icon="play", on_release=lambda *_: self.controller.play()))
+        toolbar.add_widget(MDIconButton(icon="pause", on_release=lambda *_: self.controller.pause()))
+        toolbar.add_widget(MDIconButton(icon="skip-next", on_release=lambda *_: self.controller.step()))
+
+        self.lbl_speed = MDLabel(text="Velocidad: 5.0 r/s", size_hint_y=None, height=dp(24))
+        self.slider_speed = MDSlider(min=0.5, max=500, value=5.0, step=0.5, size_hint_y=None, height=dp(40))
+        self.slider_speed.bind(value=self._on_speed_change)
+
+        self.lbl_seek = MDLabel(text="Posición", size_hint_y=None, height=dp(24))
+        self.slider_seek = MDSlider(min=0, max=max(1, ultima), value=0, step=1, size_hint_y=None, height=dp(40))
+        self.slider_seek.bind(on_touch_up=self._on_seek)
+
+        for w in (toolbar, self.lbl_speed, self.slider_speed, self.lbl_seek, self.slider_seek, self.kpis):
+            panel.add_widget(w)
+
+        self.add_widget(self.board)
+        self.add_widget(panel)
+        self._sync_slider()
+
+    def _on_speed_change(self, _slider, value: float) -> None:
+        self.lbl_speed.text = f"Velocidad: {float(value):.1f} r/s"
+        self.controller.set_speed(float(value))
+
+    def _on_seek(self, slider, touch) -> None:
+        if slider.collide_point(*touch.pos):
+            self.controller.seek(int(slider.value))
+
+    def _sync_slider(self) -> None:
+        if not hasattr(self, "slider_seek"):
+            return
+        self.slider_seek.value = self.controller.lector.posicion_ronda
+        self.lbl_seek.text = f"Ronda {self.controller.lector.ronda_actual()}"
+
+
+# ==================== APP ====================
+class ReplayApp(MDApp):
+    def __init__(self, ruta: str, **kwargs):
+        super().__init__(**kwargs)
+        self.ruta = ruta
+
+    def build(self):
+        self.title = "Resident Evil UDEM — Repetición"
+        self.theme_cls.theme_style = "Dark"
+        self.theme_cls.primary_palette = "Red"
+        return ReplayLayout(self.ruta)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Uso: python -m ui.app_kivy.replay <registro_de_eventos>")
+        sys.exit(1)
+    ReplayApp(sys.argv[1]).run()
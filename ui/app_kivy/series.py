@@ -0,0 +1,179 @@
+# ui/app_kivy/series.py
+from __future__ import annotations
+
+from array import array
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+# Puntos del historial completo de cada serie: al llenarse se juntan de a
+# pares (la resolución baja a la mitad), así la memoria no crece con la corrida
+HISTORY_CAPACITY = 2048
+# Rondas recientes que se guardan sin decimar (ventanas con zoom)
+RECENT_CAPACITY = 512
+
+
+class DecimatedSeries:
+    """
+    Una serie numérica de largo ilimitado en memoria acotada:
+    - `recent`: las últimas RECENT_CAPACITY rondas tal cual, en un buffer circular.
+    - `history`: toda la corrida promediada en tramos de `stride` rondas; cuando
+      se llena, los tramos se juntan de a pares y `stride` se duplica.
+    """
+
+    def __init__(self, capacity: int = HISTORY_CAPACITY, recent: int = RECENT_CAPACITY) -> None:
+        self.capacity = max(2, capacity - capacity % 2)
+        self.recent_capacity = max(1, recent)
+        self.clear()
+
+    def clear(self) -> None:
+        self.count = 0            # valores agregados en total
+        self.stride = 1           # rondas por punto de `history`
+        self.history = array("d")
+        self._sum = 0.0           # tramo en curso de `history`
+        self._n = 0
+        self._recent = array("d", bytes(8 * self.recent_capacity))
+        self._head = 0            # próxima posición a escribir en _recent
+
+    def append(self, value: float) -> None:
+        value = float(value)
+        self._recent[self._head] = value
+        self._head = (self._head + 1) % self.recent_capacity
+        self.count = self.count + 1
+
+        self._sum = self._sum + value
+        self._n = self._n + 1
+        if self._n < self.stride:
+            return
+        self.history.append(self._sum / self._n)
+        self._sum = 0.0
+        self._n = 0
+        if len(self.history) >= self.capacity:
+            self._decimate()
+
+    def _decimate(self) -> None:
+        h = self.history
+        self.history = array("d", ((h[i] + h[i + 1]) / 2 for i in range(0, len(h) - 1, 2)))
+        self.stride = self.stride * 2
+
+    def last(self) -> Optional[float]:
+        if self.count == 0:
+            return None
+        return self._recent[(self._head - 1) % self.recent_capacity]
+
+    def window(self, rounds: Optional[int] = None) -> Tuple[List[float], int]:
+        """
+        Valores de las últimas `rounds` rondas (None = toda la corrida) y las
+        rondas que representa cada uno. Si caben en el buffer reciente salen
+        sin decimar; si no, salen de `history`.
+        """
+        if rounds is None or rounds > self.count:
+            rounds = self.count
+        if rounds <= min(self.count, self.recent_capacity):
+            start = self._head - rounds
+            values = [self._recent[(start + i) % self.recent_capacity] for i in range(rounds)]
+            return values, 1
+
+        points = list(self.history)
+        if self._n:
+            points.append(self._sum / self._n)
+        keep = -(-rounds // self.stride)
+        return points[-keep:], self.stride
+
+
+def lttb(values: Sequence[float], threshold: int) -> List[Tuple[int, float]]:
+    """
+    Largest-Triangle-Three-Buckets: elige `threshold` puntos (índice, valor)
+    que conservan la forma de la serie (picos incluidos) para dibujarla con
+    un costo fijo sin importar su largo.
+    """
+    n = len(values)
+    if threshold >= n or threshold < 3:
+        return list(enumerate(values))
+
+    sampled: List[Tuple[int, float]] = [(0, values[0])]
+    bucket = (n - 2) / (threshold - 2)
+    a = 0
+    for i in range(threshold - 2):
+        # promedio del tramo siguiente (el tercer vértice del triángulo)
+        nxt_start = int((i + 1) * bucket) + 1
+        nxt_end = min(int((i + 2) * bucket) + 1, n)
+        cuenta = nxt_end - nxt_start
+        avg_x = (nxt_start + nxt_end - 1) / 2
+        avg_y = sum(values[nxt_start:nxt_end]) / cuenta if cuenta else values[n - 1]
+
+        start = int(i * bucket) + 1
+        end = int((i + 1) * bucket) + 1
+        ax, ay = a, values[a]
+        mejor, mejor_area = start, -1.0
+        for j in range(start, end):
+            area = abs((ax - avg_x) * (values[j] - ay) - (ax - j) * (avg_y - ay))
+            if area > mejor_area:
+                mejor, mejor_area = j, area
+        sampled.append((mejor, values[mejor]))
+        a = mejor
+
+    sampled.append((n - 1, values[n - 1]))
+    return sampled
+
+
+class KPIHistory:
+    """
+    Historial por ronda de los KPIs del tablero, todas las series con el
+    mismo eje: cada `add` agrega un valor a cada una.
+    """
+    SERIES = ("infectadas_ratio", "sanas", "profundidad_arbol")
+
+    def __init__(self, capacity: int = HISTORY_CAPACITY, recent: int = RECENT_CAPACITY) -> None:
+        self.series: Dict[str, DecimatedSeries] = {
+            nombre: DecimatedSeries(capacity, recent) for nombre in self.SERIES
+        }
+        self.last_round: Optional[int] = None
+
+    def clear(self) -> None:
+        for serie in self.series.values():
+            serie.clear()
+        self.last_round = None
+
+    def __len__(self) -> int:
+        return self.series["sanas"].count
+
+    def add(self, stats: Dict[str, int]) -> bool:
+        """
+        Agrega las estadísticas de una ronda. Las que no son de una ronda
+        nueva (p. ej. tras un clic en el tablero) se ignoran; devuelve si se
+        agregó.
+        """
+        ronda = stats.get("ronda")
+        if ronda is not None:
+            if self.last_round is not None and ronda <= self.last_round:
+                return False
+            self.last_round = ronda
+        total = max(1, int(stats.get("total_personas", 1)))
+        infectadas = int(stats.get("infectadas", 0))
+        self.series["infectadas_ratio"].append(max(0.0, min(1.0, infectadas / total)))
+        self.series["sanas"].append(int(stats.get("sanas", 0)))
+        self.series["profundidad_arbol"].append(int(stats.get("profundidad_arbol", 0)))
+        return True
+
+    def extend(self, rounds_stats: Iterable[Dict[str, int]]) -> int:
+        agregadas = 0
+        for stats in rounds_stats:
+            if self.add(stats):
+                agregadas = agregadas + 1
+        return agregadas
+
+    def points(self, nombre: str, rounds: Optional[int] = None, max_points: int = 200) -> List[Tuple[float, float]]:
+        """
+        Hasta `max_points` puntos (x, y) de la serie `nombre` normalizados a
+        0..1 (x por el ancho de la ventana, y por el máximo de la ventana
+        salvo la proporción de infectadas, que ya está en 0..1).
+        """
+        values, _stride = self.series[nombre].window(rounds)
+        if not values:
+            return []
+        if nombre == "infectadas_ratio":
+            escala = 1.0
+        else:
+            escala = max(values) or 1.0
+        ultimo = max(1, len(values) - 1)
+        return [(i / ultimo, v / escala) for i, v in lttb(values, max_points)]
@@ -0,0 +1,201 @@
+# ui/app_kivy/snapshot.py
+from __future__ import annotations
+
+from array import array
+from itertools import compress
+from typing import Iterable, NamedTuple, Optional, Sequence
+
+from models.persona import Persona
+
+
+class PeopleDelta(NamedTuple):
+    """Lo que cambió entre dos llamadas a PeopleSnapshot.update."""
+    reset: bool            # la población se rehízo: hay que redibujar todo
+    changed: array         # posiciones (en la lista del simulador) movidas, con otro estado/defensa o nuevas
+    infected_changed: int  # cuántas de ellas cambiaron de sana a infectada o al revés
+    added: int             # cuántas son nuevas (las últimas de `changed`)
+
+
+class PeopleSnapshot:
+    """
+    Último estado de las personas que vio la UI, en arreglos compactos
+    (array de la biblioteca estándar) indexados por la posición de cada
+    persona en la lista del simulador. update compara contra las personas
+    actuales y devuelve solo las posiciones que cambiaron: no arma un dict
+    por persona y lo que se reserva por cuadro crece con los cambios, no con
+    la población. Si se le pasan las posiciones candidatas (ver
+    Simulador.tomar_cambios) solo mira esas y las agregadas.
+    """
+
+    def __init__(self) -> None:
+        self.clear()
+
+    def clear(self) -> None:
+        # la próxima update avisa reset (p. ej. al crear otra simulación)
+        self._reset_pending = True
+        self.ids: list[str] = []
+        self.x = array("i")
+        self.y = array("i")
+        self.defensa = array("i")
+        self.infected = array("b")
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def update(self, personas: Sequence[Persona], candidates: Optional[Iterable[int]] = None) -> PeopleDelta:
+        anterior = len(self.ids)
+        if len(personas) < anterior:
+            self.clear()
+            anterior = 0
+        if candidates is None:
+            candidates = range(anterior)
+        reset = self._reset_pending
+        self._reset_pending = False
+
+        xs, ys, defensas, infected = self.x, self.y, self.defensa, self.infected
+        changed = array("i")
+        infected_changed = 0
+
+        for i in candidates:
+            if i >= anterior:
+                continue
+            p = personas[i]
+            if p.x != xs[i] or p.y != ys[i] or p.defensa != defensas[i] or p.infectada != infected[i]:
+                if p.infectada != infected[i]:
+                    infected_changed = infected_changed + 1
+                xs[i] = p.x
+                ys[i] = p.y
+                defensas[i] = p.defensa
+                infected[i] = p.infectada
+                changed.append(i)
+
+        for i in range(anterior, len(personas)):
+            p = personas[i]
+            self.ids.append(p.id)
+            xs.append(p.x)
+            ys.append(p.y)
+            defensas.append(p.defensa)
+            infected.append(p.infectada)
+            changed.append(i)
+
+        return PeopleDelta(reset, changed, infected_changed, len(personas) - anterior)
+
+
+class PeopleChanges(NamedTuple):
+    """
+    Copia de lo que cambió según un PeopleDelta, para pasar de un snapshot a
+    otro (p. ej. del hilo de simulación a la UI) sin compartir los arreglos.
+    x, y, defensa e infected van en el mismo orden que `changed`.
+    """
+    reset: bool
+    changed: array
+    x: array
+    y: array
+    defensa: array
+    infected: array
+    new_ids: list[str]   # ids de las agregadas (las últimas de `changed`)
+    infected_changed: int
+
+
+def extract_changes(snapshot: PeopleSnapshot, delta: PeopleDelta) -> PeopleChanges:
+    changed = delta.changed
+    return PeopleChanges(
+        delta.reset, changed,
+        array("i", (snapshot.x[i] for i in changed)),
+        array("i", (snapshot.y[i] for i in changed)),
+        array("i", (snapshot.defensa[i] for i in changed)),
+        array("b", (snapshot.infected[i] for i in changed)),
+        [snapshot.ids[i] for i in changed[len(changed) - delta.added:]],
+        delta.infected_changed,
+    )
+
+
+def apply_changes(snapshot: PeopleSnapshot, changes: PeopleChanges) -> PeopleDelta:
+    """Lleva `snapshot` al estado de quien armó `changes` y devuelve el delta equivalente."""
+    if changes.reset:
+        snapshot.clear()
+    snapshot._reset_pending = False
+
+    agregadas = len(changes.new_ids)
+    existentes = len(changes.changed) - agregadas
+    for k in range(existentes):
+        i = changes.changed[k]
+        snapshot.x[i] = changes.x[k]
+        snapshot.y[i] = changes.y[k]
+        snapshot.defensa[i] = changes.defensa[k]
+        snapshot.infected[i] = changes.infected[k]
+
+    snapshot.ids.extend(changes.new_ids)
+    snapshot.x.extend(changes.x[existentes:])
+    snapshot.y.extend(changes.y[existentes:])
+    snapshot.defensa.extend(changes.defensa[existentes:])
+    snapshot.infected.extend(changes.infected[existentes:])
+
+    return PeopleDelta(changes.reset, changes.changed, changes.infected_changed, agregadas)
+
+
+# Órdenes posibles de PeopleView (None = el de la lista del simulador)
+SORT_KEYS = ("defensa", "estado")
+
+
+class PeopleView:
+    """
+    Orden y filtro sobre las filas de un PeopleSnapshot sin copiar sus
+    columnas: solo guarda las posiciones en el orden a mostrar (y ni eso
+    mientras no haya orden ni filtro). La tabla de salud pide las filas de a
+    una con index(k), solo las que entran en pantalla.
+    """
+
+    def __init__(self, snapshot: PeopleSnapshot) -> None:
+        self.snapshot = snapshot
+        self.sort_key: Optional[str] = None
+        self.descending = False
+        self.infected_only = False
+        self._order: Optional[array] = None
+        # cambió algo que afecta orden o filtro desde el último rebuild
+        self.stale = False
+
+    def __len__(self) -> int:
+        return len(self.snapshot) if self._order is None else len(self._order)
+
+    def index(self, k: int) -> int:
+        """Posición en el snapshot de la fila k de la vista."""
+        return k if self._order is None else self._order[k]
+
+    def set_sort(self, key: Optional[str], descending: bool = False) -> None:
+        if key is not None and key not in SORT_KEYS:
+            raise ValueError(f"Orden desconocido: {key}")
+        self.sort_key = key
+        self.descending = descending
+        self.rebuild()
+
+    def set_infected_only(self, active: bool) -> None:
+        self.infected_only = active
+        self.rebuild()
+
+    def rebuild(self) -> None:
+        self.stale = False
+        snap = self.snapshot
+        if self.sort_key is None and not self.infected_only:
+            self._order = None
+            return
+
+        if self.infected_only:
+            filas = compress(range(len(snap)), snap.infected)
+        else:
+            filas = range(len(snap))
+        if self.sort_key == "defensa":
+            filas = sorted(filas, key=snap.defensa.__getitem__, reverse=self.descending)
+        elif self.sort_key == "estado":
+            filas = sorted(filas, key=snap.infected.__getitem__, reverse=self.descending)
+        self._order = array("i", filas)
+
+    def apply_delta(self, delta: PeopleDelta) -> None:
+        """
+        Tras actualizar el snapshot: sin orden ni filtro la vista ya está al
+        día; con orden o filtro queda `stale` y se rehace cuando convenga.
+        """
+        if delta.reset:
+            self.rebuild()
+        elif self._order is not None and len(delta.changed):
+            self.stale = True
@@ -1,7 +1,8 @@
 # ui/app_kivy/tree.py
 from __future__ import annotations
 import os, time
-from typing import Tuple
+from contextlib import nullcontext
+from typing import List, Optional
 from kivy.clock import Clock
 from kivy.metrics import dp
 from kivy.core.window import Window
@@ -9,11 +10,16 @@ from kivy.core.clipboard import Clipboard
 from kivy.resources import resource_find
 from kivy.core.text import LabelBase
 
-from kivy.uix.codeinput import CodeInput
+from kivy.uix.behaviors import ButtonBehavior
 from kivymd.uix.dialog import MDDialog
 from kivymd.uix.boxlayout import MDBoxLayout
-from kivymd.uix.scrollview import MDScrollView
-from kivymd.uix.button import MDFillRoundFlatIconButton
+from kivymd.uix.label import MDLabel
+from kivymd.uix.textfield import MDTextField
+from kivymd.uix.button import MDFillRoundFlatIconButton, MDIconButton
+
+from models.arbol_contagio import ArbolContagio
+from ui.app_kivy.outline import TreeOutline, OutlineRow
+from ui.app_kivy.virtual_list import ROW_HEIGHT, VirtualList
 
 # Registrar fuente monoespaciada (viene con Kivy)
 try:
@@ -26,40 +32,98 @@ try:
 except Exception:
     MONO = "Roboto"
 
-def _normalize(text: str) -> str:
+# Cada cuánto se vuelven a leer las filas abiertas mientras la simulación corre (s)
+REFRESH_INTERVAL = 1.0
+
+
+class _OutlineLine(ButtonBehavior, MDLabel):
+    """Una fila del árbol: clic abre/cierra el nodo o pasa de página."""
+    def __init__(self, **kwargs):
+        super().__init__(text="", halign="left", font_name=MONO, size_hint_y=None,
+                         height=ROW_HEIGHT, shorten=True, shorten_from="right", **kwargs)
+        self.row: Optional[OutlineRow] = None
+
+
+class TreeViewer(VirtualList):
     """
-    Asegura que no vengan caracteres raros; si tu visualizador usa ASCII,
-    reemplaza box-drawing por equivalentes ASCII.
+    Árbol de contagio desplegable: empieza con solo la raíz y carga los
+    hijos de un nodo al abrirlo (de a páginas), con el tamaño del subárbol
+    al lado. Como la tabla de salud, es una VirtualList: hay tantas filas
+    (widgets) como entran en pantalla. `lock` es el del worker que modifica
+    el árbol.
     """
-    return (text.replace("│", "|")
-                .replace("─", "-")
-                .replace("└", "`-")
-                .replace("├", "+-"))
-
-def _wrap_tree_text(raw: str) -> str:
-    raw = raw.strip("\n")
-    if not raw:
-        return "(árbol vacío)"
-    title = "ÁRBOL DE PROPAGACIÓN"
-    lines = raw.splitlines()
-    width = max(len(title), *(len(l) for l in lines))
-    width = max(20, min(120, width))
-    bar = "─" * width
-    return f"{title}\n{bar}\n{raw}\n"
-
-def _build_tree_widget(text: str) -> Tuple[MDScrollView, CodeInput]:
-    pretty = _wrap_tree_text(text)
-    scroll = MDScrollView(do_scroll_x=True, do_scroll_y=True,
-                          size_hint=(0.95, None), height=dp(520))
-    code = CodeInput(text=pretty, readonly=True, font_name=MONO,
-                     size_hint=(1, None), height=dp(520),
-                     background_color=(0, 0, 0, 0),  # transparente
-                     foreground_color=(1, 1, 1, 1))
-    scroll.add_widget(code)
-    return scroll, code
-
-def open_tree_dialog(text: str) -> None:
-    content, code = _build_tree_widget(_normalize(text))
+
+    def __init__(self, arbol: ArbolContagio, lock=None, **kwargs):
+        super().__init__(self._row_count, self._make_row, self._fill_row, **kwargs)
+        self.outline = TreeOutline(arbol)
+        self.lock = lock if lock is not None else nullcontext()
+        self._outline_rows: List[OutlineRow] = []
+
+        search = MDBoxLayout(orientation="horizontal", spacing=dp(8), size_hint_y=None, height=dp(48))
+        self.txt_id = MDTextField(hint_text="Ir a persona (id)", mode="rectangle")
+        self.txt_id.bind(on_text_validate=lambda *_: self.jump_to(self.txt_id.text.strip()))
+        search.add_widget(self.txt_id)
+        search.add_widget(MDIconButton(icon="magnify", on_release=lambda *_: self.jump_to(self.txt_id.text.strip())))
+        self.add_widget(search)
+
+        self.add_body()
+        self.reload()
+
+    # --------- API ----------
+    def reload(self) -> None:
+        """Vuelve a leer del árbol las filas abiertas (cambian mientras la simulación corre)."""
+        with self.lock:
+            self._outline_rows = self.outline.rows()
+        self.refresh()
+
+    def jump_to(self, id_persona: str) -> None:
+        if not id_persona:
+            return
+        with self.lock:
+            encontrada = self.outline.reveal(id_persona)
+        if not encontrada:
+            MDDialog(title="Sin resultado", text=f"La persona {id_persona} no está en el árbol.").open()
+            return
+        self.reload()
+        for k, fila in enumerate(self._outline_rows):
+            if fila.page == 0 and fila.id == id_persona:
+                self.scroll_to(k - len(self._rows) // 2)
+                break
+
+    def visible_text(self) -> str:
+        return "\n".join(TreeOutline.row_text(fila) for fila in self._outline_rows)
+
+    # --------- Filas de la VirtualList ----------
+    def _row_count(self) -> int:
+        return len(self._outline_rows)
+
+    def _make_row(self) -> _OutlineLine:
+        return _OutlineLine(on_release=self._on_line)
+
+    def _fill_row(self, row: _OutlineLine, k: Optional[int]) -> None:
+        row.row = self._outline_rows[k] if k is not None else None
+        row.text = TreeOutline.row_text(row.row) if row.row is not None else ""
+
+    # --------- Internos ----------
+    def _on_line(self, line: _OutlineLine) -> None:
+        fila = line.row
+        if fila is None:
+            return
+        if fila.page > 0:
+            self.outline.turn_page(fila.id, +1)
+        elif fila.page < 0:
+            self.outline.turn_page(fila.id, -1)
+        elif fila.children > 0:
+            self.outline.toggle(fila.id)
+        else:
+            return
+        self.reload()
+
+
+def open_tree_dialog(arbol: ArbolContagio, lock=None) -> None:
+    content = TreeViewer(arbol, lock, size_hint=(0.95, None), height=dp(520))
+    # mientras está abierto, el árbol sigue cambiando con la simulación
+    event = Clock.schedule_interval(lambda _dt: content.reload(), REFRESH_INTERVAL)
     dlg = None
 
     def save_png(*_):
@@ -80,14 +144,15 @@ def open_tree_dialog(text: str) -> None:
         Clock.schedule_once(_do_save, 0.05)
 
     def copy_text(*_):
-        Clipboard.copy(code.text)
-        MDDialog(title="Copiado", text="El árbol se copió al portapapeles.").open()
+        # solo lo desplegado; el árbol completo va con "Guardar TXT"
+        Clipboard.copy(content.visible_text())
+        MDDialog(title="Copiado", text="Las filas abiertas del árbol se copiaron al portapapeles.").open()
 
     def save_txt(*_):
         os.makedirs("screenshots", exist_ok=True)
         path = os.path.join("screenshots", f"arbol_{int(time.time())}.txt")
-        with open(path, "w", encoding="utf-8") as f:
-            f.write(code.text)
+        with open(path, "w", encoding="utf-8") as f, content.lock:
+            arbol.escribir_visualizacion(f)
         MDDialog(title="Guardado", text=f"Archivo de texto guardado en:\n{path}").open()
 
     dlg = MDDialog(
@@ -101,4 +166,5 @@ def open_tree_dialog(text: str) -> None:
             MDFillRoundFlatIconButton(text="Cerrar", icon="close", on_release=lambda *_: dlg.dismiss()),
         ],
     )
+    dlg.bind(on_dismiss=lambda *_: event.cancel())
     dlg.open()
@@ -0,0 +1,87 @@
+# ui/app_kivy/virtual_list.py
+from __future__ import annotations
+
+from typing import Any, Callable, List, Optional
+
+from kivy.metrics import dp
+from kivy.uix.slider import Slider
+from kivymd.uix.boxlayout import MDBoxLayout
+
+
+ROW_HEIGHT = dp(24)
+
+
+class VirtualList(MDBoxLayout):
+    """
+    Lista virtualizada: hay solo tantas filas (widgets) como entran en el
+    alto disponible y al desplazarse se les cambia el contenido. Recibe
+    cuántas filas hay (row_count), cómo crear una fila vacía (make_row) y
+    cómo llenarla con la fila k de los datos (fill_row; k = None la deja en
+    blanco, debajo de la última). Quien la usa agrega sus barras arriba y
+    después llama a add_body.
+    """
+
+    def __init__(self, row_count: Callable[[], int], make_row: Callable[[], Any],
+                 fill_row: Callable[[Any, Optional[int]], None], **kwargs):
+        super().__init__(orientation="vertical", spacing=dp(4), **kwargs)
+        self.row_count = row_count
+        self.make_row = make_row
+        self.fill_row = fill_row
+        self.first = 0              # fila de los datos que va arriba
+        self._rows: List[Any] = []
+        self._syncing = False       # la lista mueve la barra: no reaccionar a su bind
+
+        self._body = MDBoxLayout(orientation="horizontal", spacing=dp(4))
+        self._rows_box = MDBoxLayout(orientation="vertical")
+        # barra de desplazamiento: arriba = primera fila
+        self.scrollbar = Slider(orientation="vertical", min=0, max=1, value=1,
+                                size_hint_x=None, width=dp(24))
+        self.scrollbar.bind(value=self._on_scrollbar)
+        self._body.add_widget(self._rows_box)
+        self._body.add_widget(self.scrollbar)
+
+    # --------- API ----------
+    def add_body(self) -> None:
+        self.add_widget(self._body)
+        self._rows_box.bind(height=lambda *_: self._build_rows())
+        self._build_rows()
+
+    def refresh(self) -> None:
+        total = self.row_count()
+        visibles = len(self._rows)
+        self.first = max(0, min(self.first, total - visibles))
+        self._syncing = True
+        self.scrollbar.max = max(1, total - visibles)
+        self.scrollbar.value = self.scrollbar.max - self.first
+        self._syncing = False
+        for offset, row in enumerate(self._rows):
+            k = self.first + offset
+            self.fill_row(row, k if k < total else None)
+
+    def scroll_to(self, first: int) -> None:
+        self.first = max(0, first)
+        self.refresh()
+
+    # --------- Internos ----------
+    def _build_rows(self) -> None:
+        # tantas filas como entran en el alto disponible
+        needed = max(1, int(self._rows_box.height // ROW_HEIGHT))
+        while len(self._rows) < needed:
+            row = self.make_row()
+            self._rows.append(row)
+            self._rows_box.add_widget(row)
+        while len(self._rows) > needed:
+            self._rows_box.remove_widget(self._rows.pop())
+        self.refresh()
+
+    def _on_scrollbar(self, _slider, value: float) -> None:
+        if not self._syncing:
+            self.scroll_to(int(round(self.scrollbar.max - value)))
+
+    def on_touch_down(self, touch):
+        if touch.is_mouse_scrolling and self._rows_box.collide_point(*touch.pos):
+            # como en ScrollView: "scrolldown" sube hacia las primeras filas
+            paso = -3 if touch.button == "scrolldown" else 3
+            self.scroll_to(self.first + paso)
+            return True
+        return super().on_touch_down(touch)
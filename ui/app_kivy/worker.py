@@ -0,0 +1,198 @@
+# ui/app_kivy/worker.py
+from __future__ import annotations
+
+import queue
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+from core.simulador import Simulador
+from ui.app_kivy.snapshot import PeopleSnapshot, PeopleChanges, extract_changes
+
+
+# Rondas cuyas estadísticas se guardan hasta el próximo cuadro (si la UI no
+# toma cuadros, p. ej. con la ventana minimizada, se quedan las últimas)
+MAX_PENDING_ROUNDS = 4096
+
+
+class Frame(NamedTuple):
+    """Lo que el hilo de simulación publica para que la UI lo dibuje."""
+    stats: Dict[str, Any]                # estadísticas del estado publicado
+    rounds_stats: List[Dict[str, Any]]   # las de cada ronda ejecutada desde el cuadro anterior
+    people: Optional[PeopleChanges]      # personas que cambiaron (None si no se pidieron)
+    density: Optional[tuple]             # (sanas, infectadas) por celda si se pidió (modo LOD)
+    error: Optional[BaseException]       # excepción de una ronda o de un comando (el worker quedó en pausa)
+
+
+class SimulationWorker:
+    """
+    Ejecuta las rondas en un hilo aparte, al ritmo de rounds_per_sec (0 = sin
+    límite), sin depender del reloj de la UI.
+
+    Doble buffer: el hilo guarda su propio PeopleSnapshot (lo último que
+    publicó) y, cuando la UI ya tomó el cuadro anterior, publica uno nuevo con
+    solo lo que cambió desde entonces. Si el hilo va más rápido que la UI, los
+    estados intermedios no se copian: se saltan.
+
+    Todo lo que modifica la simulación desde la UI (clics, un paso) entra por
+    submit y se ejecuta en este hilo entre dos rondas. Para leer la simulación
+    desde otro hilo hay que tomar `lock`.
+
+    Si una ronda o un comando lanza una excepción, el hilo no muere: se pausa
+    y la publica en el campo `error` del próximo cuadro.
+    """
+
+    def __init__(self, sim: Simulador) -> None:
+        self.sim = sim
+        self.lock = threading.RLock()
+        self.rounds_per_sec: float = 2.0
+        # qué incluir en cada cuadro (lo decide la UI según el nivel de detalle)
+        self.want_people: bool = True
+        self.want_density: bool = False
+
+        self._commands: "queue.Queue[tuple[Callable[[], Any], Optional[Callable[[Any], None]]]]" = queue.Queue()
+        self._playing = threading.Event()
+        self._stopping = threading.Event()
+        self._wake = threading.Event()
+
+        self._snapshot = PeopleSnapshot()
+        self._frame: Optional[Frame] = None   # publicado y todavía no tomado
+        self._frame_lock = threading.Lock()
+        self._rounds_stats: deque = deque(maxlen=MAX_PENDING_ROUNDS)
+        self._last_stats: Dict[str, Any] = sim.get_estadisticas()
+        self._error: Optional[BaseException] = None
+        self._dirty = True
+
+        self._thread = threading.Thread(target=self._run, name="simulacion", daemon=True)
+
+    # --------- API (desde la UI) ----------
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopping.set()
+        self._wake.set()
+        if self._thread.is_alive() and threading.current_thread() is not self._thread:
+            self._thread.join(timeout=2.0)
+
+    def play(self) -> None:
+        self._playing.set()
+        self._wake.set()
+
+    def pause(self) -> None:
+        self._playing.clear()
+
+    def is_playing(self) -> bool:
+        return self._playing.is_set()
+
+    def step(self) -> None:
+        self.submit(self._step)
+
+    def submit(self, fn: Callable[[], Any], on_done: Optional[Callable[[Any], None]] = None) -> None:
+        """
+        Ejecuta fn en el hilo de simulación entre rondas; on_done(resultado) se
+        llama en ese hilo. Si fn falla no se llama: el error sale en el cuadro.
+        """
+        self._commands.put((fn, on_done))
+        self._wake.set()
+
+    def request_frame(self) -> None:
+        # p. ej. al cambiar want_density: publicar aunque no haya rondas nuevas
+        self._dirty = True
+        self._wake.set()
+
+    def take_frame(self) -> Optional[Frame]:
+        """El último cuadro publicado, o None si no hay uno nuevo. Lo llama la UI una vez por cuadro."""
+        with self._frame_lock:
+            frame = self._frame
+            self._frame = None
+        if frame is not None:
+            # libera el buffer: el hilo puede publicar el siguiente
+            self._wake.set()
+        return frame
+
+    # --------- Hilo ----------
+    def _run(self) -> None:
+        next_round = time.perf_counter()
+        while not self._stopping.is_set():
+            self._run_commands()
+            self._publish()
+
+            if not self._playing.is_set():
+                self._wait(0.1)
+                next_round = time.perf_counter()
+                continue
+
+            rps = self.rounds_per_sec
+            if rps > 0:
+                now = time.perf_counter()
+                if next_round > now:
+                    self._wait(min(next_round - now, 0.1))
+                    continue
+                # sin acumular atraso si una ronda tardó más que el intervalo
+                next_round = max(next_round + 1.0 / rps, now - 0.1)
+
+            self._step()
+
+    def _wait(self, seconds: float) -> None:
+        self._wake.wait(seconds)
+        self._wake.clear()
+
+    def _fail(self, error: BaseException) -> None:
+        traceback.print_exception(type(error), error, error.__traceback__)
+        self._playing.clear()
+        self._error = error
+        self._dirty = True
+
+    def _step(self) -> None:
+        try:
+            with self.lock:
+                stats = self.sim.ejecutar_ronda()
+        except Exception as error:
+            self._fail(error)
+            return
+        self._rounds_stats.append(stats)
+        self._last_stats = stats
+        self._dirty = True
+
+    def _run_commands(self) -> None:
+        while True:
+            try:
+                fn, on_done = self._commands.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                with self.lock:
+                    result = fn()
+                    # un clic cambia la población sin pasar por ejecutar_ronda
+                    self._last_stats = self.sim.get_estadisticas()
+            except Exception as error:
+                self._fail(error)
+                continue
+            self._dirty = True
+            if on_done is not None:
+                on_done(result)
+
+    def _publish(self) -> None:
+        if not self._dirty:
+            return
+        with self._frame_lock:
+            if self._frame is not None:
+                return
+
+        with self.lock:
+            people = None
+            if self.want_people:
+                personas = self.sim.get_personas()
+                delta = self._snapshot.update(personas, self.sim.tomar_cambios())
+                people = extract_changes(self._snapshot, delta)
+            density = self.sim.get_densidad_celdas() if self.want_density else None
+        frame = Frame(self._last_stats, list(self._rounds_stats), people, density, self._error)
+
+        self._rounds_stats.clear()
+        self._error = None
+        self._dirty = False
+        with self._frame_lock:
+            self._frame = frame
@@ -7,12 +7,23 @@ if __name__ in {"__main__", "__mp_main__"}:
     sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
 from typing import Optional, Any
+import time
 
 from core.simulador import Simulador
 from ui.visualizador import Visualizador
+from ui.render_vivo import RenderizadorVivo
 from models.persona import Persona
 
 
+# Segundos entre cuadros al ver varias rondas en vivo
+PAUSA_EN_VIVO = 0.05
+
+# Con más nodos que esto, la opción 8 pregunta límites antes de dibujar el árbol
+NODOS_ARBOL_GRANDE = 2000
+PROFUNDIDAD_ARBOL_GRANDE = 8
+HIJOS_ARBOL_GRANDE = 20
+
+
 class MenuPrincipal:
     """
     Menú de texto simple para manejar la simulación.
@@ -28,6 +39,7 @@ class MenuPrincipal:
       9) Ver estadísticas
      10) Infectar manualmente por id (además del inicial)
      11) Ver tabla de personas (vida/estado)
+     12) Instrumentación (tiempos por fase de la ronda)
       0) Salir
     """
 
@@ -53,6 +65,7 @@ class MenuPrincipal:
             print(" 9) Ver estadísticas")
             print("10) Infectar manualmente por id (además del inicial)")
             print("11) Ver tabla de personas (vida/estado)")
+            print("12) Instrumentación (tiempos por fase de la ronda)")
             print(" 0) Salir")
 
             opcion = input("\nElige una opción: ").strip()
@@ -79,6 +92,8 @@ class MenuPrincipal:
                 self._infectar_por_id()
             elif opcion == "11":
                 self._mostrar_tabla_personas()
+            elif opcion == "12":
+                self._instrumentacion()
             elif opcion == "0":
                 print("\nHasta luego 👋")
                 return
@@ -137,13 +152,42 @@ class MenuPrincipal:
             print("Debes ingresar un entero.")
             return
 
+        txt_cada = input("¿Cada cuántas rondas mostrar el estado? [1, 0 = solo al final]: ").strip()
+        cada = 1 if txt_cada == "" else self._to_int_or(txt_cada, 1)
+
         k = max(0, k)
-        for _ in range(k):
-            stats = self.simulador.ejecutar_ronda()  # type: ignore[union-attr]
-            print(f"\n>>> Después de la ronda {stats.get('ronda', '?')}:")
+        if cada is None or cada <= 0:
+            # avance rápido: no se arman estadísticas en las rondas intermedias
+            self.simulador.ejecutar_rondas(k)  # type: ignore[union-attr]
+            print(f"\n>>> Después de la ronda {self.simulador.get_ronda_actual()}:")  # type: ignore[union-attr]
+            self._mostrar_stats_compactas(self.simulador.get_estadisticas())  # type: ignore[union-attr]
+            return
+
+        if input("¿Ver el tablero en vivo? (s/N): ").strip().lower() == "s":
+            self._ejecutar_en_vivo(k, cada)
+            return
+
+        for resumen in self.simulador.iter_rondas(k, stride=cada):  # type: ignore[union-attr]
+            stats = resumen._asdict()
+            if self.simulador.instrumentacion is not None:  # type: ignore[union-attr]
+                stats['instrumentacion'] = self.simulador.instrumentacion.ultima_ronda()  # type: ignore[union-attr]
+            print(f"\n>>> Después de la ronda {resumen.ronda}:")
             self._mostrar_stats_compactas(stats)
             self._mostrar_tabla_personas()
 
+    def _ejecutar_en_vivo(self, k: int, cada: int) -> None:
+        # el tablero se redibuja en el lugar: solo cambian las celdas que se movieron
+        render = RenderizadorVivo(usar_color=self.vista.usar_color)
+        try:
+            for resumen in self.simulador.iter_rondas(k, stride=cada):  # type: ignore[union-attr]
+                render.dibujar(self.simulador,  # type: ignore[arg-type]
+                               f"Ronda {resumen.ronda}: Sanas={resumen.sanas}, "
+                               f"Infectadas={resumen.infectadas}, "
+                               f"Profundidad árbol={resumen.profundidad_arbol}")
+                time.sleep(PAUSA_EN_VIVO)
+        finally:
+            render.cerrar()
+
     def _curar_persona(self) -> None:
         if not self._hay_simulador_inicializado():
             return
@@ -206,7 +250,22 @@ class MenuPrincipal:
     def _mostrar_arbol(self) -> None:
         if not self._hay_simulador():
             return
-        self.vista.mostrar_arbol(self.simulador)  # type: ignore[arg-type]
+        arbol = self.simulador.get_arbol()  # type: ignore[union-attr]
+        if arbol.contar_nodos() <= NODOS_ARBOL_GRANDE:
+            self.vista.mostrar_arbol(self.simulador)  # type: ignore[arg-type]
+            return
+
+        print(f"El árbol tiene {arbol.contar_nodos()} nodos; se puede limitar lo que se dibuja.")
+        txt_prof = input(f"Profundidad máxima [{PROFUNDIDAD_ARBOL_GRANDE}, 0 = sin límite]: ").strip()
+        txt_hijos = input(f"Hijos por nodo [{HIJOS_ARBOL_GRANDE}, 0 = sin límite]: ").strip()
+        desde = input("Desde el id (Enter para el paciente cero): ").strip()
+
+        max_profundidad = PROFUNDIDAD_ARBOL_GRANDE if txt_prof == "" else self._to_int_or(txt_prof, PROFUNDIDAD_ARBOL_GRANDE)
+        max_hijos = HIJOS_ARBOL_GRANDE if txt_hijos == "" else self._to_int_or(txt_hijos, HIJOS_ARBOL_GRANDE)
+        self.vista.mostrar_arbol(self.simulador,  # type: ignore[arg-type]
+                                 max_profundidad=max_profundidad or None,
+                                 max_hijos=max_hijos or None,
+                                 desde=desde or None)
 
     def _mostrar_estadisticas(self) -> None:
         if not self._hay_simulador():
@@ -214,6 +273,20 @@ class MenuPrincipal:
         stats = self.simulador.get_estadisticas()  # type: ignore[union-attr]
         self._mostrar_stats_detalladas(stats)
 
+    def _instrumentacion(self) -> None:
+        if not self._hay_simulador():
+            return
+        sim = self.simulador
+        if sim.instrumentacion is None:  # type: ignore[union-attr]
+            sim.activar_instrumentacion()  # type: ignore[union-attr]
+            print("Instrumentación activada: las próximas rondas medirán cada fase.")
+            return
+
+        print(sim.instrumentacion.formatear())  # type: ignore[union-attr]
+        if input("¿Desactivarla? (s/N): ").strip().lower() == "s":
+            sim.desactivar_instrumentacion()  # type: ignore[union-attr]
+            print("Instrumentación desactivada.")
+
     def _mostrar_tabla_personas(self) -> None:
         if not self._hay_simulador():
             return
@@ -245,13 +318,35 @@ class MenuPrincipal:
         print(f"Ronda {stats.get('ronda', '?')}: "
               f"Sanas={stats.get('sanas', '?')}, "
               f"Infectadas={stats.get('infectadas', '?')}, "
-              f"Profundidad árbol={stats.get('profundidad_arbol', '?')}")
+              f"Profundidad árbol={stats.get('profundidad_arbol', '?')}, "
+              f"R efectivo={stats.get('r_efectivo', 0.0):.2f}")
+
+        medida = stats.get('instrumentacion')
+        if medida:
+            print(f"  tiempos: mov={1000 * medida['movimiento']:.2f} ms, "
+                  f"contagios={1000 * medida['contagios']:.2f} ms, "
+                  f"defensa={1000 * medida['aumento_defensa']:.2f} ms, "
+                  f"stats={1000 * medida['estadisticas']:.2f} ms | "
+                  f"celdas={medida['celdas_revisadas']}, mixtas={medida['celdas_mixtas']}, "
+                  f"infecciones={medida['infecciones']}")
 
     def _mostrar_stats_detalladas(self, stats: dict[str, Any]) -> None:
         print("\n--- ESTADÍSTICAS ---")
-        for k in ("ronda", "total_personas", "sanas", "infectadas", "profundidad_arbol"):
+        for k in ("ronda", "total_personas", "sanas", "infectadas", "profundidad_arbol", "r_efectivo"):
             print(f"{k}: {stats.get(k)}")
 
+        arbol = self.simulador.get_arbol()  # type: ignore[union-attr]
+        print("\n--- TRANSMISIÓN ---")
+        print(f"contagios directos promedio: {arbol.get_promedio_contagios():.2f}")
+        print("R por generación: " + ", ".join(f"{r:.2f}" for r in arbol.get_r_por_generacion()[:10]))
+        print(f"distribución de contagios directos (k: personas): "
+              + ", ".join(f"{k}: {v}" for k, v in enumerate(arbol.get_distribucion_contagios()) if v > 0))
+        principales = arbol.get_principales_contagiadores(5)
+        if principales:
+            print("principales contagiadores: "
+                  + ", ".join(f"{persona.id} ({k}, subárbol {arbol.get_tamano_subarbol(persona.id)})"
+                              for persona, k in principales))
+
     def _hay_simulador(self) -> bool:
         if self.simulador is None:
             print("Primero crea el simulador (opción 1).")
@@ -0,0 +1,149 @@
+# ui/render_vivo.py
+from __future__ import annotations
+
+# Permite ejecutar este archivo directo: python ui/render_vivo.py
+if __name__ in {"__main__", "__mp_main__"}:
+    import os, sys
+    sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from typing import Optional, TextIO, Dict, List, Tuple
+import shutil
+import sys
+
+from core.simulador import Simulador
+from ui.ansi import BORRAR_PANTALLA, ColoresAnsi
+
+
+# Secuencias ANSI
+OCULTAR_CURSOR = "\033[?25l"
+MOSTRAR_CURSOR = "\033[?25h"
+BORRAR_LINEA = "\033[K"
+
+# Filas de pantalla antes del tablero: estado y encabezado de columnas
+FILAS_ARRIBA = 2
+ANCHO_CELDA = 4   # 3 caracteres + separador, igual que Visualizador._render_matriz
+ANCHO_ETIQUETA = 3
+
+
+def _mover_cursor(fila: int, columna: int) -> str:
+    # fila y columna empiezan en 1
+    return f"\033[{fila};{columna}H"
+
+
+class RenderizadorVivo(ColoresAnsi):
+    """
+    Dibuja el tablero en la consola "en vivo", ronda tras ronda, sin borrar
+    la pantalla: guarda el cuadro anterior y solo reescribe (con movimientos
+    de cursor ANSI) las celdas que cambiaron, más la línea de estado. Cada
+    cuadro sale en una sola escritura. Redibuja todo solo la primera vez o si
+    cambia el tamaño de la terminal o del tablero.
+    """
+
+    def __init__(self, salida: Optional[TextIO] = None, usar_color: bool = True) -> None:
+        self.salida: TextIO = salida if salida is not None else sys.stdout
+        self.usar_color: bool = usar_color
+        self._anterior: Dict[Tuple[int, int], str] = {}
+        self._terminal: Tuple[int, int] = (0, 0)
+        self._tamano: int = -1
+        self._columnas_visibles: int = 0
+        self._filas_visibles: int = 0
+
+    # ---------- Público ----------
+    def dibujar(self, sim: Simulador, estado: str = "") -> None:
+        n = sim.get_matriz().get_tamano()
+        terminal = tuple(shutil.get_terminal_size((80, 24)))
+        actuales = self._celdas(sim)
+
+        partes: List[str] = []
+        if terminal != self._terminal or n != self._tamano:
+            self._terminal = terminal
+            self._tamano = n
+            self._redibujar_todo(partes, actuales)
+        else:
+            self._dibujar_cambios(partes, actuales)
+
+        # línea de estado (siempre cambia)
+        partes.append(_mover_cursor(1, 1))
+        partes.append(estado[:self._terminal[0] - 1])
+        partes.append(BORRAR_LINEA)
+        # el cursor queda debajo del tablero
+        partes.append(_mover_cursor(FILAS_ARRIBA + self._filas_visibles + 1, 1))
+
+        self._anterior = actuales
+        self.salida.write("".join(partes))
+        self.salida.flush()
+
+    def cerrar(self) -> None:
+        """Deja el cursor visible y debajo del tablero."""
+        self.salida.write(_mover_cursor(FILAS_ARRIBA + self._filas_visibles + 1, 1) + MOSTRAR_CURSOR + "\n")
+        self.salida.flush()
+        self._anterior = {}
+        self._terminal = (0, 0)
+        self._tamano = -1
+
+    # ---------- Internos ----------
+    def _redibujar_todo(self, partes: List[str], actuales: Dict[Tuple[int, int], str]) -> None:
+        columnas, filas = self._terminal
+        n = self._tamano
+        # sin llegar a la última columna de la terminal (algunas saltan de línea ahí)
+        self._columnas_visibles = max(0, min(n, (columnas - ANCHO_ETIQUETA) // ANCHO_CELDA))
+        self._filas_visibles = max(0, min(n, filas - FILAS_ARRIBA - 1))
+
+        vacia = self._gris(" . ")
+        partes.append(OCULTAR_CURSOR + BORRAR_PANTALLA)
+        partes.append(_mover_cursor(2, 1))
+        partes.append(" " * ANCHO_ETIQUETA + " ".join(f"{i:>3}" for i in range(self._columnas_visibles)))
+
+        for y in range(self._filas_visibles):
+            celdas = [actuales.get((x, y), vacia) for x in range(self._columnas_visibles)]
+            partes.append(_mover_cursor(FILAS_ARRIBA + 1 + y, 1))
+            partes.append(f"{y:>2} " + " ".join(celdas))
+
+    def _dibujar_cambios(self, partes: List[str], actuales: Dict[Tuple[int, int], str]) -> None:
+        anterior = self._anterior
+        vacia = self._gris(" . ")
+
+        cambiadas = [clave for clave, texto in actuales.items() if anterior.get(clave) != texto]
+        cambiadas.extend(clave for clave in anterior if clave not in actuales)
+        cambiadas.sort(key=lambda clave: (clave[1], clave[0]))
+
+        for x, y in cambiadas:
+            if x >= self._columnas_visibles or y >= self._filas_visibles:
+                continue
+            partes.append(_mover_cursor(FILAS_ARRIBA + 1 + y, ANCHO_ETIQUETA + 1 + ANCHO_CELDA * x))
+            partes.append(actuales.get((x, y), vacia))
+
+    def _celdas(self, sim: Simulador) -> Dict[Tuple[int, int], str]:
+        # solo las celdas ocupadas, en una pasada sobre la población
+        ocupadas: Dict[Tuple[int, int], list] = {}
+        for p in sim.get_personas():
+            clave = (p.x, p.y)
+            datos = ocupadas.get(clave)
+            if datos is None:
+                ocupadas[clave] = [1, p.infectada, p]
+            else:
+                datos[0] = datos[0] + 1
+                datos[1] = datos[1] or p.infectada
+
+        textos: Dict[Tuple[int, int], str] = {}
+        for clave, (cantidad, hay_infectada, persona) in ocupadas.items():
+            if cantidad > 1:
+                base = f"{f'[{cantidad}]':>3}"[-3:]
+            else:
+                base = f"{persona.id:>3}"[-3:]
+            textos[clave] = self._rojo(base) if hay_infectada else self._verde(base)
+        return textos
+
+
+# Demo: python ui/render_vivo.py
+if __name__ == "__main__":
+    import time
+    sim = Simulador(tamano_matriz=15, cantidad_personas=40, defensa_inicial=2, semilla_aleatoria=7)
+    sim.inicializar()
+    render = RenderizadorVivo()
+    try:
+        for resumen in sim.iter_rondas(60):
+            render.dibujar(sim, f"Ronda {resumen.ronda}: sanas={resumen.sanas} infectadas={resumen.infectadas}")
+            time.sleep(0.1)
+    finally:
+        render.cerrar()
@@ -13,9 +13,10 @@ import sys
 
 from core.simulador import Simulador
 from models.persona import Persona
+from ui.ansi import BORRAR_PANTALLA, ColoresAnsi, consola_con_ansi
 
 
-class Visualizador:
+class Visualizador(ColoresAnsi):
     """
     Visualización en consola de:
       - Matriz con celdas coloreadas (verde: sanas, rojo: infectadas)
@@ -32,9 +33,12 @@ class Visualizador:
         print("\n--- MATRIZ ---")
         print(self._render_matriz(sim))
 
-    def mostrar_arbol(self, sim: Simulador) -> None:
+    def mostrar_arbol(self, sim: Simulador, max_profundidad: Optional[int] = None,
+                      max_hijos: Optional[int] = None, desde: Optional[str] = None) -> None:
         print("\n--- ÁRBOL DE CONTAGIO ---")
-        print(sim.get_arbol().visualizar())
+        # se escribe por tandas: no arma todo el texto si el árbol es grande
+        sim.get_arbol().escribir_visualizacion(sys.stdout, max_profundidad, max_hijos, desde)
+        print()
 
     def mostrar_tabla_personas(self, sim: Simulador) -> None:
         print("\n--- PERSONAS (vida/estado) ---")
@@ -48,7 +52,15 @@ class Visualizador:
         self.mostrar_tabla_personas(sim)
 
     def limpiar_pantalla(self) -> None:
-        os.system("cls" if os.name == "nt" else "clear")
+        # secuencia ANSI en vez de lanzar un proceso "clear" (con o sin color);
+        # "cls" solo en consolas de Windows que no entienden ANSI
+        if not sys.stdout.isatty():
+            return
+        if consola_con_ansi():
+            sys.stdout.write(BORRAR_PANTALLA)
+            sys.stdout.flush()
+        else:
+            os.system("cls")
 
     # ---------- Render internos ----------
     def _render_matriz(self, sim: Simulador) -> str:
@@ -104,19 +116,10 @@ class Visualizador:
         etiqueta = f"{p.id:>3}"[-3:]  # usa id en 3 chars
         return self._rojo(etiqueta) if p.esta_infectada() else self._verde(etiqueta)
 
-    # Colores ANSI simples
+    # Colores ANSI simples (_verde, _rojo y _gris vienen de ColoresAnsi)
     def _soporta_color(self) -> bool:
         return sys.stdout.isatty() and os.name != "nt" or "ANSICON" in os.environ
 
-    def _color(self, s: str, code: str) -> str:
-        if not self.usar_color:
-            return s
-        return f"{code}{s}\033[0m"
-
-    def _verde(self, s: str) -> str: return self._color(s, "\033[32m")
-    def _rojo(self, s: str) -> str:  return self._color(s, "\033[31m")
-    def _gris(self, s: str) -> str:  return self._color(s, "\033[90m")
-
 
 # Prueba rápida independiente
 if __name__ == "__main__":